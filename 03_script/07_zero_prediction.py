@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import fsolve
+
+from zero_engine import inverse_N
 
 # --- 1. Data Preparation (Actual Riemann Zeta Zeros, Odlyzhko Table) ---
 # First 30 zeros (imaginary part t values)
@@ -20,15 +21,10 @@ print(f"Target (Actual 30th Zero): {target_zero}")
 # --- 2. Macroscopic Prediction ---
 # Estimate approximate location of nth zero through inverse function of Riemann-von Mangoldt formula
 # N(T) = n  =>  Solve for T
-
-def riemann_n_formula(t, n):
-    # N(t) = (t / 2pi) * log(t / 2pi) - (t / 2pi) + 7/8 (correction term)
-    # Find t such that this value equals n
-    val = (t / (2 * np.pi)) * np.log(t / (2 * np.pi)) - (t / (2 * np.pi)) + 0.875
-    return val - n
+# N(t) = (t / 2pi) * log(t / 2pi) - (t / 2pi) + 7/8 (correction term)
 
 # Calculate "average expected location" of 30th zero
-macro_prediction = fsolve(riemann_n_formula, x0=100, args=(30))[0]
+macro_prediction = float(inverse_N(30))
 print(f"Macroscopic Prediction (Average): {macro_prediction:.4f}")
 
 # --- 3. Microscopic Repulsion Correction ---
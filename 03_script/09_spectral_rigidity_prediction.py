@@ -1,5 +1,6 @@
 import numpy as np
-from scipy.optimize import fsolve
+
+from zero_engine import inverse_N
 
 # --- 1. Data Preparation ---
 true_zeros = np.array([
@@ -15,16 +16,11 @@ last_zero_actual = train_zeros[-1] # 29th actual value (98.8312)
 
 # --- 2. Improved Macroscopic Model: Riemann-von Mangoldt Inverse Function (Global Trend) ---
 # Calculate "ideal location" of nth zero using N(T) formula
-def riemann_n_formula(t, n):
-    # N(t) approx (t/2pi)log(t/2pi) - (t/2pi) + 7/8
-    # Find location for n - 1 (index correction)
-    val = (t / (2 * np.pi)) * np.log(t / (2 * np.pi)) - (t / (2 * np.pi)) + 0.875
-    return val - n
+# N(t) approx (t/2pi)log(t/2pi) - (t/2pi) + 7/8
 
 # Calculate "theoretical location" of 29th and 30th
 # Find exact t values corresponding to n=29, n=30 (reflecting log squeeze)
-theory_29 = fsolve(riemann_n_formula, x0=90, args=(29))[0]
-theory_30 = fsolve(riemann_n_formula, x0=100, args=(30))[0]
+theory_29, theory_30 = inverse_N(np.array([29, 30])).tolist()
 
 print(f"Theory 29th: {theory_29:.4f}")
 print(f"Theory 30th: {theory_30:.4f}")
@@ -1,6 +1,8 @@
 import numpy as np
 from scipy.optimize import brentq
 
+from zero_engine import Z
+
 # --- 1. Setup ---
 target_zero = 101.3178
 previous_prediction = 101.2945 # Value obtained from step 2 (approximately)
@@ -9,26 +11,11 @@ previous_prediction = 101.2945 # Value obtained from step 2 (approximately)
 # This is the physics engine that calculates 'interference of primes'
 # Where Z(t) becomes 0 is exactly the zero of the zeta function
 
-def riemann_siegel_theta(t):
-    # Phase correction function (macroscopic rotation of system)
-    # theta(t) ~ (t/2) * log(t/2pi) - t/2 - pi/8
-    return (t / 2.0) * np.log(t / (2.0 * np.pi)) - (t / 2.0) - (np.pi / 8.0)
-
-def chaos_wave_function(t, n_cutoff=20):
-    # Wave synthesis of primes (and integers)
-    # Z(t) approx 2 * sum( cos(theta(t) - t*log(n)) / sqrt(n) )
-    # n_cutoff: How many 'butterfly (prime)' wingbeats to consider?
-    # These terms interfere with each other to fill the 0.02 error
-    
-    theta = riemann_siegel_theta(t)
-    val = 0.0
-    
-    # Sum integer waves from 1 to N (including influence of major primes)
-    for n in range(1, n_cutoff + 1):
-        term = np.cos(theta - t * np.log(n)) / np.sqrt(n)
-        val += term
-        
-    return 2.0 * val
+# Z(t) approx 2 * sum( cos(theta(t) - t*log(n)) / sqrt(n) )
+# with theta(t) ~ (t/2) * log(t/2pi) - t/2 - pi/8 (phase correction, macroscopic rotation of system)
+# n_cutoff: How many 'butterfly (prime)' wingbeats to consider?
+# These terms interfere with each other to fill the 0.02 error
+chaos_wave_function = Z
 
 # --- 3. Precise Strike (Root Finding) ---
 # Scan a very narrow region around step 2 prediction (101.29)
@@ -69,7 +56,7 @@ else:
 # --- 5. Visualization (Appearance of Wave) ---
 import matplotlib.pyplot as plt
 t_vals = np.linspace(target_zero - 0.5, target_zero + 0.5, 100)
-z_vals = [chaos_wave_function(t) for t in t_vals]
+z_vals = chaos_wave_function(t_vals)
 
 plt.figure(figsize=(10, 4))
 plt.plot(t_vals, z_vals, label='Chaos Wave (Sum of Primes)', color='purple')
@@ -4,66 +4,17 @@ Scalability Test for Zero Prediction Algorithm
 Tests algorithm performance on zeros 1,000-10,000
 """
 
-import numpy as np
+import argparse
 import time
-from scipy.optimize import fsolve, brentq
 
-def riemann_n_formula(t, n):
-    """Riemann-von Mangoldt formula inverse."""
-    val = (t / (2 * np.pi)) * np.log(t / (2 * np.pi)) - (t / (2 * np.pi)) + 0.875
-    return val - n
+import numpy as np
 
-def riemann_siegel_theta(t):
-    """Riemann-Siegel theta function."""
-    return (t / 2.0) * np.log(t / (2.0 * np.pi)) - (t / 2.0) - (np.pi / 8.0)
+from zero_engine import NpySink, inverse_N, iter_zeros, predict_zero_three_step, predict_zeros_chained, result_rows
 
-def chaos_wave_function(t, n_cutoff=20):
-    """Riemann-Siegel Z-function approximation."""
-    theta = riemann_siegel_theta(t)
-    val = 0.0
-    for n in range(1, n_cutoff + 1):
-        term = np.cos(theta - t * np.log(n)) / np.sqrt(n)
-        val += term
-    return 2.0 * val
+# Rows per sink append (the scalar loop hands the sink blocks of this size).
+SINK_BLOCK = 1000
 
-def predict_zero_three_step(n, previous_zero=None, stiffness=0.95):
-    """
-    Three-step prediction algorithm.
-    
-    Args:
-        n: Zero index (1-indexed)
-        previous_zero: Previous zero value (for spectral rigidity correction)
-        stiffness: Spectral rigidity stiffness factor
-    
-    Returns:
-        tuple: (prediction, errors_by_step)
-    """
-    # Step 1: Macroscopic prediction
-    t0 = 2 * np.pi * n / np.log(n) if n > 1 else 14.0
-    t_macro = fsolve(riemann_n_formula, x0=t0, args=(n))[0]
-    
-    # Step 2: Microscopic correction (if previous zero available)
-    if previous_zero is not None and n > 1:
-        t_prev_theory = fsolve(riemann_n_formula, x0=t0-10, args=(n-1))[0]
-        displacement_prev = previous_zero - t_prev_theory
-        correction = displacement_prev * stiffness
-        t_micro = t_macro + correction
-    else:
-        t_micro = t_macro
-    
-    # Step 3: Chaos engine refinement
-    search_window = 0.5
-    t_min = t_micro - search_window
-    t_max = t_micro + search_window
-    
-    try:
-        t_final = brentq(chaos_wave_function, t_min, t_max)
-    except ValueError:
-        t_final = t_micro
-    
-    return t_final
-
-def test_scalability(start_n=1000, end_n=10000, step=100):
+def test_scalability(start_n=1000, end_n=10000, step=100, sink=None, compare_batched=False):
     """
     Test algorithm scalability on zeros from start_n to end_n.
     
@@ -71,53 +22,82 @@ def test_scalability(start_n=1000, end_n=10000, step=100):
         start_n: Starting zero index
         end_n: Ending zero index
         step: Step size between tests
+        sink: Optional NpySink; rows are streamed to it every SINK_BLOCK zeros
+        compare_batched: Also run the same range through predict_zeros_chained and
+            the streamed batched predictor (iter_zeros) and report both (extra time)
+    
+    Returns:
+        Structured array (RESULT_DTYPE): n, prediction, time_ms, estimated_error
     """
     print(f"Testing scalability: zeros {start_n} to {end_n} (step={step})")
     print("=" * 60)
     
-    results = []
     total_time = 0
+    isolation_stats = {}
     
     # Use known zeros for validation (if available)
     # For demonstration, we'll use theoretical values as "ground truth"
     known_zeros = {}  # Would be populated with actual zero values
     
-    for n in range(start_n, end_n + 1, step):
+    # Theoretical locations for error estimation, solved in one batch
+    n_range = np.arange(start_n, end_n + 1, step)
+    t_theory_all = inverse_N(n_range)
+    
+    # Per-zero columns, preallocated (no per-zero Python objects)
+    predictions = np.empty(n_range.size)
+    times = np.empty(n_range.size)
+    flushed = 0
+    
+    for i, n in enumerate(n_range.tolist()):
         start_time = time.time()
         
         # Predict current zero (using previous prediction as reference)
         if n > start_n:
-            prev_pred = results[-1]['prediction']
+            prev_pred = predictions[i - 1]
         else:
             prev_pred = None
         
-        prediction = predict_zero_three_step(n, previous_zero=prev_pred)
+        prediction = predict_zero_three_step(n, previous_zero=prev_pred, stats=isolation_stats)
         
         elapsed = time.time() - start_time
         total_time += elapsed
         
-        # Calculate theoretical location for error estimation
-        t_theory = fsolve(riemann_n_formula, x0=2*np.pi*n/np.log(n), args=(n))[0]
-        estimated_error = abs(prediction - t_theory) / t_theory  # Relative error
+        predictions[i] = prediction
+        times[i] = elapsed * 1000  # Convert to milliseconds
         
-        results.append({
-            'n': n,
-            'prediction': prediction,
-            'time': elapsed * 1000,  # Convert to milliseconds
-            'estimated_error': estimated_error
-        })
+        if sink is not None and (i + 1 - flushed >= SINK_BLOCK or i + 1 == n_range.size):
+            block = slice(flushed, i + 1)
+            sink.append_rows(result_rows(n_range[block], predictions[block], t_theory_all[block], times[block]))
+            flushed = i + 1
+        
+        if (i + 1) % 10 == 0:
+            print(f"Completed {i + 1} tests...")
+    
+    if compare_batched:
+        # Same recurrence, solved in batches (speculate/repair + prefix scan)
+        batch_start = time.time()
+        batched = predict_zeros_chained(n_range, xp=np)
+        batch_time = time.time() - batch_start
         
-        if len(results) % 10 == 0:
-            print(f"Completed {len(results)} tests...")
+        # Batched predictor streamed chunk by chunk (iter_zeros), errors accumulated on the fly
+        stream_start = time.time()
+        stream_zeros = 0
+        stream_error = 0.0
+        stream_stats = {}
+        for n_chunk, t_chunk in iter_zeros(start_n, end_n + 1, step=step, stats=stream_stats):
+            t_ref = t_theory_all[(n_chunk - start_n) // step]
+            stream_error += float(np.sum(np.abs(t_chunk - t_ref) / np.abs(t_ref)))
+            stream_zeros += n_chunk.size
+        stream_time = time.time() - stream_start
     
-    # Summary statistics
-    times = [r['time'] for r in results]
-    errors = [r['estimated_error'] for r in results]
+    # Relative errors for all zeros in one vectorized expression
+    results = result_rows(n_range, predictions, t_theory_all, times)
+    errors = results["estimated_error"]
     
     print("\n" + "=" * 60)
     print("SCALABILITY TEST RESULTS")
     print("=" * 60)
-    print(f"Total zeros tested: {len(results)}")
+    print(f"Total zeros tested: {n_range.size}")
     print(f"Range: {start_n} to {end_n}")
     print(f"\nTiming Statistics (per zero):")
     print(f"  Mean: {np.mean(times):.2f} ms")
@@ -129,11 +109,23 @@ def test_scalability(start_n=1000, end_n=10000, step=100):
     print(f"  Mean: {np.mean(errors)*100:.4f}%")
     print(f"  Median: {np.median(errors)*100:.4f}%")
     print(f"  Max: {np.max(errors)*100:.4f}%")
+    print(f"\nZero isolation (Gram blocks):")
+    print(f"  Unbracketed: {isolation_stats.get('unbracketed', 0)}")
+    print(f"  No sign change (returned micro prediction): {isolation_stats.get('no_sign_change', 0)}")
+    if compare_batched:
+        print(f"\nBatched chained recurrence (predict_zeros_chained):")
+        print(f"  Total time: {batch_time:.3f} seconds ({total_time / max(batch_time, 1e-9):.1f}x)")
+        print(f"  Max |batched - sequential|: {np.max(np.abs(batched - predictions)):.3e}")
+        print(f"\nStreamed batched predictor (iter_zeros):")
+        print(f"  {stream_zeros} zeros in {stream_time:.3f} seconds")
+        print(f"  Mean error (relative): {stream_error / max(stream_zeros, 1) * 100:.4f}%")
+        print(f"  Clamped at search window: {stream_stats.get('newton_clamped', 0)}")
+        if "unbracketed" in stream_stats:
+            print(f"  Unbracketed by Gram isolation: {stream_stats['unbracketed']}")
     
     # Verify scalability (linear time complexity)
-    if len(results) > 1:
-        n_values = [r['n'] for r in results]
-        time_vs_n = np.polyfit(n_values, times, 1)
+    if n_range.size > 1:
+        time_vs_n = np.polyfit(n_range, times, 1)
         print(f"\nScalability Analysis:")
         print(f"  Time vs. n slope: {time_vs_n[0]:.6f} ms/n")
         print(f"  (Close to 0 indicates good scalability)")
@@ -141,8 +133,25 @@ def test_scalability(start_n=1000, end_n=10000, step=100):
     return results
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scalability test of the sequential zero predictor.")
+    parser.add_argument(
+        "--compare-batched",
+        action="store_true",
+        help="Also run predict_zeros_chained and iter_zeros over the range (see 14 for their timings).",
+    )
+    parser.add_argument(
+        "--sink",
+        type=str,
+        default="",
+        help="Stream per-zero rows into memory-mapped .npy columns in this directory (read with zero_engine.read_sink).",
+    )
+    args = parser.parse_args()
+    sink = NpySink(args.sink) if args.sink else None
     # Test on zeros 1,000-10,000
-    results = test_scalability(start_n=1000, end_n=10000, step=100)
+    results = test_scalability(start_n=1000, end_n=10000, step=100, sink=sink, compare_batched=args.compare_batched)
+    if sink is not None:
+        sink.close()
+        print(f"Per-zero rows ({sink.rows}) written to {args.sink}/*.npy")
     
     print("\n" + "=" * 60)
     print("Scalability test completed successfully!")
@@ -1,182 +1,173 @@
 #!/usr/bin/env python3
 """
-Benchmark Comparison: Our algorithm vs. mpmath and Arb libraries
+Benchmark suite: our predictor vs. mpmath (and Arb), with reproducible results.
+
+Cases (zero_engine.bench times each after warmup calls, over repeated trials):
+  scalar[n=N]            predict_zero_three_step(N), the sequential predictor of 13
+  scalar_seq[n=N]        COUNT consecutive zeros from N with the previous-zero chain
+  batched[n=N]           predict_zero_three_step_batched on BATCH zeros from N (16, NumPy)
+  stream[n=N]            iter_zeros over STREAM_CHUNKS chunks of BATCH zeros from N (prefetched)
+  theta / Z[method] / inverse_N[points=P]   primitives on P heights near t(N_max)
+  mpmath[n=N]            mpmath.zetazero(N) at 15 digits (if mpmath is installed)
+  arb[n=N]               flint.acb.zeta_zero(N) (if python-flint provides it)
+
+  python 03_script/14_benchmark_comparison.py run [--output 06_docs/benchmark_results.json]
+  python 03_script/14_benchmark_comparison.py compare BASE.json NEW.json
+
+run writes the samples, summary statistics and host metadata as JSON (15 draws
+figure 10 from that file). compare prints every common case and flags medians
+that moved by more than --min-change with a Mann-Whitney p-value below --alpha;
+it exits with status 1 when a case regressed.
 """
 
+import argparse
+import sys
+
 import numpy as np
-import time
-from scipy.optimize import fsolve, brentq
 
-# Try to import mpmath (optional)
-try:
+from zero_engine import (
+    BENCH_ALPHA,
+    BENCH_MIN_CHANGE,
+    BENCH_REPEATS,
+    BENCH_WARMUP,
+    MPMATH_AVAILABLE,
+    Z,
+    compare_results,
+    inverse_N,
+    iter_zeros,
+    load_results,
+    predict_zero_three_step,
+    predict_zero_three_step_batched,
+    run_suite,
+    save_results,
+    theta,
+)
+
+if MPMATH_AVAILABLE:
     import mpmath
-    MPMATH_AVAILABLE = True
-except ImportError:
-    MPMATH_AVAILABLE = False
-    print("Warning: mpmath not available. Install with: pip install mpmath")
 
-# Arb is typically accessed via Python bindings (not always available)
-ARB_AVAILABLE = False
+# Arb via python-flint (optional; zeta_zero only exists in recent versions)
 try:
     import flint
-    ARB_AVAILABLE = True
+    ARB_AVAILABLE = hasattr(flint.acb, "zeta_zero")
 except ImportError:
-    pass
-
-def riemann_n_formula(t, n):
-    """Riemann-von Mangoldt formula inverse."""
-    val = (t / (2 * np.pi)) * np.log(t / (2 * np.pi)) - (t / (2 * np.pi)) + 0.875
-    return val - n
-
-def riemann_siegel_theta(t):
-    """Riemann-Siegel theta function."""
-    return (t / 2.0) * np.log(t / (2.0 * np.pi)) - (t / 2.0) - (np.pi / 8.0)
-
-def chaos_wave_function(t, n_cutoff=20):
-    """Riemann-Siegel Z-function approximation."""
-    theta = riemann_siegel_theta(t)
-    val = 0.0
-    for n in range(1, n_cutoff + 1):
-        term = np.cos(theta - t * np.log(n)) / np.sqrt(n)
-        val += term
-    return 2.0 * val
-
-def our_algorithm(n, previous_zero=None, stiffness=0.95):
-    """Our three-step prediction algorithm."""
-    # Step 1: Macroscopic
-    t0 = 2 * np.pi * n / np.log(n) if n > 1 else 14.0
-    t_macro = fsolve(riemann_n_formula, x0=t0, args=(n))[0]
-    
-    # Step 2: Microscopic
-    if previous_zero is not None and n > 1:
-        t_prev_theory = fsolve(riemann_n_formula, x0=t0-10, args=(n-1))[0]
-        displacement_prev = previous_zero - t_prev_theory
-        correction = displacement_prev * stiffness
-        t_micro = t_macro + correction
-    else:
-        t_micro = t_macro
-    
-    # Step 3: Chaos engine
-    search_window = 0.5
-    t_min = t_micro - search_window
-    t_max = t_micro + search_window
-    
-    try:
-        t_final = brentq(chaos_wave_function, t_min, t_max)
-    except ValueError:
-        t_final = t_micro
-    
-    return t_final
-
-def benchmark_mpmath(n, iterations=10):
-    """Benchmark mpmath zetazero function."""
-    if not MPMATH_AVAILABLE:
-        return None
-    
-    times = []
-    for _ in range(iterations):
-        start = time.time()
-        mpmath.mp.dps = 15  # Set precision
-        zero = mpmath.zetazero(n)
-        elapsed = (time.time() - start) * 1000  # Convert to ms
-        times.append(elapsed)
-    
-    return np.mean(times), np.std(times)
-
-def benchmark_our_algorithm(n, iterations=10):
-    """Benchmark our three-step algorithm."""
-    times = []
-    for _ in range(iterations):
-        start = time.time()
-        result = our_algorithm(n)
-        elapsed = (time.time() - start) * 1000  # Convert to ms
-        times.append(elapsed)
-    
-    return np.mean(times), np.std(times)
-
-def run_benchmarks(test_indices=[30, 100, 500, 1000, 5000, 10000]):
-    """
-    Run benchmarks comparing our algorithm with mpmath.
-    
-    Args:
-        test_indices: List of zero indices to test
-    """
-    print("=" * 70)
-    print("RUNTIME BENCHMARK COMPARISON")
-    print("=" * 70)
-    print(f"{'Zero Index':<12} {'Our Algorithm':<20} {'mpmath':<20} {'Speedup':<15}")
-    print("-" * 70)
-    
-    results = []
-    
-    for n in test_indices:
-        # Benchmark our algorithm
-        our_mean, our_std = benchmark_our_algorithm(n, iterations=5)
-        
-        # Benchmark mpmath (if available)
-        if MPMATH_AVAILABLE:
-            mpmath_mean, mpmath_std = benchmark_mpmath(n, iterations=5)
-            speedup = mpmath_mean / our_mean if our_mean > 0 else 0
-            print(f"{n:<12} {our_mean:>6.2f}±{our_std:>5.2f} ms    "
-                  f"{mpmath_mean:>6.2f}±{mpmath_std:>5.2f} ms    "
-                  f"{speedup:>5.2f}x")
-            results.append({
-                'n': n,
-                'our_time': our_mean,
-                'mpmath_time': mpmath_mean,
-                'speedup': speedup
-            })
-        else:
-            print(f"{n:<12} {our_mean:>6.2f}±{our_std:>5.2f} ms    "
-                  f"{'N/A':<20} {'N/A':<15}")
-            results.append({
-                'n': n,
-                'our_time': our_mean,
-                'mpmath_time': None,
-                'speedup': None
-            })
-    
-    # Batch computation benchmark
-    print("\n" + "=" * 70)
-    print("BATCH COMPUTATION BENCHMARK (1,000 zeros)")
-    print("=" * 70)
-    
-    batch_size = 1000
-    start_n = 1000
-    
-    # Our algorithm batch
-    start_time = time.time()
-    prev_zero = None
-    for i in range(batch_size):
-        n = start_n + i
-        prev_zero = our_algorithm(n, previous_zero=prev_zero)
-    our_batch_time = time.time() - start_time
-    
-    print(f"Our algorithm (1,000 zeros): {our_batch_time:.2f} seconds")
-    print(f"  Average per zero: {our_batch_time*1000/batch_size:.2f} ms")
-    
-    if MPMATH_AVAILABLE:
-        # mpmath batch
-        start_time = time.time()
-        for i in range(batch_size):
-            n = start_n + i
+    flint = None
+    ARB_AVAILABLE = False
+
+DEFAULT_INDICES = (30, 100, 500, 1000, 5000, 10000)
+DEFAULT_OUTPUT = "06_docs/benchmark_results.json"
+# Chunks consumed per stream[n=N] call.
+STREAM_CHUNKS = 4
+
+
+def _scalar_sequence(n0, count):
+    prev = None
+    for n in range(n0, n0 + count):
+        prev = predict_zero_three_step(n, previous_zero=prev)
+    return prev
+
+
+def _stream(n0, count, chunk):
+    zeros = 0
+    for n, _ in iter_zeros(n0, n0 + count, chunk=chunk):
+        zeros += n.size
+    return zeros
+
+
+def build_cases(indices=DEFAULT_INDICES, batch_size=4096, sequence=100, points=4096, baselines=True):
+    """(name, fn, units, unit, params) tuples for zero_engine.run_suite."""
+    cases = []
+    for n in indices:
+        cases.append((f"scalar[n={n}]", lambda n=n: predict_zero_three_step(n), 1, "ms/zero", {"n": n, "kind": "scalar"}))
+    for n in indices:
+        cases.append((
+            f"scalar_seq[n={n}]", lambda n=n: _scalar_sequence(n, sequence), sequence, "ms/zero",
+            {"n": n, "count": sequence, "kind": "scalar_seq"},
+        ))
+    for n in indices:
+        n_arr = np.arange(n, n + batch_size, dtype=float)
+        cases.append((
+            f"batched[n={n}]", lambda n_arr=n_arr: predict_zero_three_step_batched(n_arr, xp=np), batch_size, "ms/zero",
+            {"n": n, "batch_size": batch_size, "kind": "batched"},
+        ))
+    count = STREAM_CHUNKS * batch_size
+    for n in indices:
+        cases.append((
+            f"stream[n={n}]", lambda n=n: _stream(n, count, batch_size), count, "ms/zero",
+            {"n": n, "batch_size": batch_size, "chunks": STREAM_CHUNKS, "kind": "stream"},
+        ))
+    t = inverse_N(np.arange(max(indices), max(indices) + points, dtype=float), xp=np)
+    n_pts = np.arange(max(indices), max(indices) + points, dtype=float)
+    primitives = (
+        ("theta", lambda: theta(t, xp=np)),
+        ("Z[chaos]", lambda: Z(t, xp=np, method="chaos")),
+        ("Z[riemann_siegel]", lambda: Z(t, xp=np, method="riemann_siegel")),
+        ("inverse_N", lambda: inverse_N(n_pts, xp=np)),
+    )
+    for name, fn in primitives:
+        cases.append((f"{name}[points={points}]", fn, points, "ms/point", {"points": points, "kind": "primitive"}))
+    if baselines and MPMATH_AVAILABLE:
+        def zetazero(n):
             mpmath.mp.dps = 15
-            mpmath.zetazero(n)
-        mpmath_batch_time = time.time() - start_time
-        
-        print(f"mpmath (1,000 zeros): {mpmath_batch_time:.2f} seconds")
-        print(f"  Average per zero: {mpmath_batch_time*1000/batch_size:.2f} ms")
-        print(f"  Speedup: {mpmath_batch_time/our_batch_time:.2f}x")
-    
-    print("\n" + "=" * 70)
-    print("Benchmark completed!")
-    
-    return results
+            return mpmath.zetazero(n)
+        for n in indices:
+            cases.append((f"mpmath[n={n}]", lambda n=n: zetazero(n), 1, "ms/zero", {"n": n, "kind": "mpmath"}))
+    if baselines and ARB_AVAILABLE:
+        for n in indices:
+            cases.append((f"arb[n={n}]", lambda n=n: flint.acb.zeta_zero(n), 1, "ms/zero", {"n": n, "kind": "arb"}))
+    return cases
+
+
+def print_comparison(rows, alpha, min_change):
+    print(f"{'Case':<34} {'Base':>12} {'New':>12} {'Change':>9} {'p':>9}  Status")
+    print("-" * 88)
+    for r in rows:
+        flag = r["status"].upper() if r["status"] != "same" else ""
+        print(f"{r['case']:<34} {r['base']:>12.6f} {r['new']:>12.6f} {r['change'] * 100:>+8.1f}% {r['p']:>9.1e}  {flag}")
+    regressions = sum(r["status"] == "regression" for r in rows)
+    print("-" * 88)
+    print(f"{len(rows)} cases, {regressions} regression(s) (p < {alpha}, median change > {min_change * 100:.0f}%)")
+    return regressions
+
 
 if __name__ == "__main__":
-    # Run benchmarks
-    results = run_benchmarks(test_indices=[30, 100, 500, 1000, 5000, 10000])
-    
-    if not MPMATH_AVAILABLE:
-        print("\nNote: Install mpmath for full benchmark comparison:")
-        print("  pip install mpmath")
+    parser = argparse.ArgumentParser(description="Reproducible benchmark suite of the zero predictor.")
+    sub = parser.add_subparsers(dest="command")
+    run = sub.add_parser("run", help="Run the suite and write a JSON result file.")
+    run.add_argument("--output", type=str, default=DEFAULT_OUTPUT, help=f"Result file (default {DEFAULT_OUTPUT}).")
+    run.add_argument("--indices", type=int, nargs="+", default=list(DEFAULT_INDICES), help="Zero indices of the per-index cases.")
+    run.add_argument("--batch-size", type=int, default=4096, help="Zeros per batched call (default 4096).")
+    run.add_argument("--sequence", type=int, default=100, help="Consecutive zeros per scalar_seq call (default 100).")
+    run.add_argument("--points", type=int, default=4096, help="Heights per primitive call (default 4096).")
+    run.add_argument("--warmup", type=int, default=BENCH_WARMUP, help=f"Untimed calls per case (default {BENCH_WARMUP}).")
+    run.add_argument("--repeats", type=int, default=BENCH_REPEATS, help=f"Timed trials per case (default {BENCH_REPEATS}).")
+    run.add_argument("--no-baselines", action="store_true", help="Skip the mpmath / Arb cases.")
+    cmp_ = sub.add_parser("compare", help="Compare two result files and flag significant regressions.")
+    cmp_.add_argument("base", help="Baseline result file.")
+    cmp_.add_argument("new", help="New result file.")
+    cmp_.add_argument("--alpha", type=float, default=BENCH_ALPHA, help=f"Significance level (default {BENCH_ALPHA}).")
+    cmp_.add_argument("--min-change", type=float, default=BENCH_MIN_CHANGE, help=f"Smallest relative median change flagged (default {BENCH_MIN_CHANGE}).")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        base, new = load_results(args.base), load_results(args.new)
+        for label, doc in (("base", base), ("new", new)):
+            h = doc["host"]
+            print(f"{label}: {doc['created']}  {h['host']} ({h['cpus']} cpus, numpy {h['numpy']}, commit {h['git_commit']})")
+        if base["host"]["host"] != new["host"]["host"]:
+            print("Warning: results come from different hosts.")
+        rows = compare_results(base, new, args.alpha, args.min_change)
+        sys.exit(1 if print_comparison(rows, args.alpha, args.min_change) else 0)
+    if args.command is None:
+        args = parser.parse_args(["run"])
+
+    if not MPMATH_AVAILABLE and not args.no_baselines:
+        print("Note: mpmath not installed; the mpmath baseline is skipped (pip install mpmath).")
+    cases = build_cases(args.indices, args.batch_size, args.sequence, args.points, baselines=not args.no_baselines)
+    print("=" * 70)
+    print(f"BENCHMARK SUITE ({len(cases)} cases, warmup {args.warmup}, {args.repeats} trials each)")
+    print("=" * 70)
+    config = {"indices": args.indices, "batch_size": args.batch_size, "sequence": args.sequence, "points": args.points}
+    doc = run_suite(cases, args.warmup, args.repeats, config=config, log=print)
+    save_results(doc, args.output)
+    print(f"\nResults written to {args.output}")
@@ -6,13 +6,17 @@ Creates PNG images in 06_docs folder
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import fsolve, brentq
+from scipy.optimize import brentq
 import os
 from pathlib import Path
 
+from zero_engine import Z, inverse_N, load_results
+
 # Set output directory
 OUTPUT_DIR = Path('06_docs')
 OUTPUT_DIR.mkdir(exist_ok=True)
+# Measured benchmark results for Figure 10 (written by 14_benchmark_comparison.py run)
+BENCHMARK_RESULTS = Path(os.environ.get('BENCHMARK_RESULTS', OUTPUT_DIR / 'benchmark_results.json'))
 
 print("Generating all figures for documentation...")
 print(f"Output directory: {OUTPUT_DIR}")
@@ -216,11 +220,7 @@ true_zeros = np.array([14.1347, 21.0220, 25.0109, 30.4249, 32.9351, 37.5862, 40.
 train_zeros = true_zeros[:-1]
 target_zero = true_zeros[-1]
 
-def riemann_n_formula(t, n):
-    val = (t / (2 * np.pi)) * np.log(t / (2 * np.pi)) - (t / (2 * np.pi)) + 0.875
-    return val - n
-
-macro_prediction = fsolve(riemann_n_formula, x0=100, args=(30))[0]
+macro_prediction = float(inverse_N(30))
 recent_gaps = np.diff(train_zeros)[-5:]
 avg_local_gap = np.mean(recent_gaps)
 last_zero = train_zeros[-1]
@@ -251,8 +251,7 @@ plt.close()
 # ============================================================================
 print("7. Generating Figure 7: Spectral Rigidity Prediction...")
 
-theory_29 = fsolve(riemann_n_formula, x0=90, args=(29))[0]
-theory_30 = fsolve(riemann_n_formula, x0=100, args=(30))[0]
+theory_29, theory_30 = inverse_N(np.array([29, 30])).tolist()
 last_zero_actual = train_zeros[-1]
 displacement_29 = last_zero_actual - theory_29
 stiffness = 0.95
@@ -279,21 +278,10 @@ plt.close()
 # ============================================================================
 print("8. Generating Figure 8: Chaos Wave Prediction...")
 
-def riemann_siegel_theta(t):
-    return (t / 2.0) * np.log(t / (2.0 * np.pi)) - (t / 2.0) - (np.pi / 8.0)
-
-def chaos_wave_function(t, n_cutoff=20):
-    theta = riemann_siegel_theta(t)
-    val = 0.0
-    for n in range(1, n_cutoff + 1):
-        term = np.cos(theta - t * np.log(n)) / np.sqrt(n)
-        val += term
-    return 2.0 * val
-
 previous_prediction = 101.2945
 t_vals = np.linspace(target_zero - 0.5, target_zero + 0.5, 100)
-z_vals = [chaos_wave_function(t) for t in t_vals]
-final_chaos_prediction = brentq(chaos_wave_function, previous_prediction - 0.5, previous_prediction + 0.5)
+z_vals = Z(t_vals)
+final_chaos_prediction = brentq(Z, previous_prediction - 0.5, previous_prediction + 0.5)
 
 plt.figure(figsize=(10, 4))
 plt.plot(t_vals, z_vals, label='Chaos Wave (Sum of Primes)', color='purple')
@@ -348,38 +336,58 @@ plt.close()
 
 # ============================================================================
 # Figure 10: Benchmark Comparison
+# (measured: 03_script/14_benchmark_comparison.py run -> BENCHMARK_RESULTS)
 # ============================================================================
 print("10. Generating Figure 10: Benchmark Comparison...")
 
-benchmark_indices = [30, 100, 500, 1000, 5000, 10000]
-our_times = [2.1, 2.3, 2.8, 3.2, 4.1, 5.0]
-mpmath_times = [8.5, 9.2, 11.5, 13.8, 16.2, 18.5]
-arb_times = [4.2, 4.8, 5.5, 6.2, 7.1, 8.0]
-
-x = np.arange(len(benchmark_indices))
-width = 0.25
-
-fig, ax = plt.subplots(figsize=(12, 6))
-bars1 = ax.bar(x - width, our_times, width, label='Our Algorithm', color='blue', alpha=0.8)
-bars2 = ax.bar(x, mpmath_times, width, label='mpmath', color='orange', alpha=0.8)
-bars3 = ax.bar(x + width, arb_times, width, label='Arb', color='green', alpha=0.8)
-
-ax.set_xlabel('Zero Index', fontsize=12)
-ax.set_ylabel('Time per Zero (ms)', fontsize=12)
-ax.set_title('Runtime Benchmark Comparison', fontsize=14)
-ax.set_xticks(x)
-ax.set_xticklabels(benchmark_indices)
-ax.legend()
-ax.grid(True, alpha=0.3, axis='y')
-
-# Add speedup annotations
-for i, (our, mp, arb) in enumerate(zip(our_times, mpmath_times, arb_times)):
-    ax.text(i - width, our + 1, f'{mp/our:.1f}x', ha='center', fontsize=9, color='blue')
-    ax.text(i + width, arb + 1, f'{arb/our:.1f}x', ha='center', fontsize=9, color='green')
-
-plt.tight_layout()
-plt.savefig(OUTPUT_DIR / 'figure10_benchmark_comparison.png', dpi=300, bbox_inches='tight')
-plt.close()
+if not BENCHMARK_RESULTS.exists():
+    print(f"   Skipped: {BENCHMARK_RESULTS} not found (run 03_script/14_benchmark_comparison.py run first).")
+else:
+    bench = load_results(str(BENCHMARK_RESULTS))
+    series = {}
+    for case in bench["cases"].values():
+        params = case["params"]
+        if "n" in params:
+            series.setdefault(params["kind"], {})[params["n"]] = case
+    benchmark_indices = sorted(series.get("scalar", {}))
+    labels = {
+        "scalar": ("Our Algorithm (sequential)", "blue"),
+        "batched": ("Our Algorithm (batched NumPy)", "purple"),
+        "mpmath": ("mpmath", "orange"),
+        "arb": ("Arb", "green"),
+    }
+    kinds = [k for k in labels if k in series]
+
+    x = np.arange(len(benchmark_indices))
+    width = 0.8 / len(kinds)
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for i, kind in enumerate(kinds):
+        cases = [series[kind].get(n) for n in benchmark_indices]
+        med = np.array([c["median"] if c else np.nan for c in cases])
+        # IQR as the error bar
+        iqr = np.array([c["iqr"] / 2 if c else 0.0 for c in cases])
+        ax.bar(x + (i - (len(kinds) - 1) / 2) * width, med, width, yerr=iqr, capsize=2,
+               label=labels[kind][0], color=labels[kind][1], alpha=0.8)
+    if "mpmath" in series:
+        for i, n in enumerate(benchmark_indices):
+            mp, our = series["mpmath"].get(n), series["scalar"].get(n)
+            if mp and our:
+                ax.text(i, mp["median"] * 1.3, f'{mp["median"] / our["median"]:.0f}x', ha='center', fontsize=9, color='orange')
+
+    host = bench["host"]
+    ax.set_yscale('log')
+    ax.set_xlabel('Zero Index', fontsize=12)
+    ax.set_ylabel('Time per Zero (ms, median)', fontsize=12)
+    ax.set_title(f'Runtime Benchmark Comparison ({host["host"]}, {host["cpus"]} CPUs, {bench["created"]})', fontsize=14)
+    ax.set_xticks(x)
+    ax.set_xticklabels(benchmark_indices)
+    ax.legend()
+    ax.grid(True, alpha=0.3, axis='y')
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'figure10_benchmark_comparison.png', dpi=300, bbox_inches='tight')
+    plt.close()
 
 print("\n" + "="*60)
 print("All figures generated successfully!")
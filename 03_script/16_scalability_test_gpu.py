@@ -5,9 +5,11 @@ Tests algorithm performance on zeros 1,000-10,000 using batched GPU computation.
 
 Requires: pip install cupy-cuda12x  (for CUDA 12.x)
 Falls back to NumPy (CPU) if CuPy is not available.
+The predictor itself lives in the zero_engine package (03_script/zero_engine/).
 
 CLI: --duration SECONDS  Run until SECONDS elapsed (e.g. 10800 for 3 hours).
      --output PATH       Write all output to PATH (used with --duration).
+     --resume            Continue a duration run from its checkpoint (PATH.ckpt.json).
 
 For higher GPU utilization use larger workload and batch size, e.g.:
   --start-n 1000 --end-n 100000 --step 100 --batch-size 10000
@@ -15,10 +17,12 @@ See 06_docs/gpu_scalability_low_utilization_analysis.md for details.
 """
 
 import argparse
+import json
 import os
 import subprocess
 import sys
 import time
+import tracemalloc
 from datetime import datetime, timezone
 
 import numpy as np
@@ -30,12 +34,29 @@ except ImportError:
     _CUPY_AVAILABLE = False
     cp = None
 
-
-def _get_array_module(use_gpu=True):
-    """Return CuPy or NumPy depending on availability and flag."""
-    if use_gpu and _CUPY_AVAILABLE:
-        return cp
-    return np
+from zero_engine import (
+    CPU_KERNEL_ENABLED,
+    EVALUATORS,
+    MPMATH_AVAILABLE,
+    PRECISIONS,
+    RESULT_DTYPE,
+    STAGES,
+    CertificationSampler,
+    NpySink,
+    ShardPool,
+    ThroughputMonitor,
+    autotune,
+    batched_macro,
+    certify_workers,
+    default_isolation,
+    default_workers,
+    get_array_module as _get_array_module,
+    merge_refine_stats,
+    predict_zero_three_step_batched,
+    result_rows,
+    stage_metrics,
+    to_numpy,
+)
 
 
 def get_gpu_safe_batch_size(n_cutoff=20, reserve_ratio=0.2, max_batch=10_000_000):
@@ -61,70 +82,6 @@ def get_gpu_safe_batch_size(n_cutoff=20, reserve_ratio=0.2, max_batch=10_000_000
         return None, 0, 0
 
 
-_CHAOS_KERNEL_CACHE = {}
-
-
-def _get_chaos_tables_cupy(n_cutoff, dtype):
-    """Precompute log(n) and 1/sqrt(n) for chaos kernel (CuPy only)."""
-    n_vec = cp.arange(1, n_cutoff + 1, dtype=dtype)
-    log_n = cp.log(n_vec)
-    inv_sqrt_n = 1.0 / cp.sqrt(n_vec)
-    return log_n, inv_sqrt_n
-
-
-def _get_chaos_kernel_and_tables(n_cutoff, dtype):
-    """
-    Return (raw_kernel, log_n, inv_sqrt_n) for given n_cutoff and dtype.
-    Kernel computes both chaos wave value and derivative in one launch:
-      out_f[i]  = 2 * sum cos(theta - t*log(n))/sqrt(n)
-      out_fp[i] = 2 * sum -sin(arg)*(d_theta - log(n))/sqrt(n)
-    """
-    if not _CUPY_AVAILABLE:
-        return None, None, None
-    dev = int(cp.cuda.runtime.getDevice())
-    key = (dev, int(n_cutoff), str(np.dtype(dtype)))
-    cached = _CHAOS_KERNEL_CACHE.get(key)
-    if cached is not None:
-        return cached
-
-    # Note: we pass log_n and inv_sqrt_n arrays to avoid recomputing log/sqrt in-kernel.
-    code = r"""
-    extern "C" __global__
-    void chaos_eval(const double* t, const double* log_n, const double* inv_sqrt_n,
-                    const int n_cutoff, double* out_f, double* out_fp, const int n) {
-        int i = (int)(blockDim.x * blockIdx.x + threadIdx.x);
-        if (i >= n) return;
-        double ti = t[i];
-        // theta(t) = (t/2) * log(t/(2*pi)) - (t/2) - pi/8
-        // dtheta/dt = 0.5 * log(t/(2*pi))
-        const double two_pi = 6.283185307179586476925286766559;
-        double log_term = log(ti / two_pi);
-        double theta = 0.5 * ti * log_term - 0.5 * ti - 0.39269908169872415480783042290993786; // pi/8
-        double d_theta = 0.5 * log_term;
-
-        double acc_f = 0.0;
-        double acc_fp = 0.0;
-        #pragma unroll
-        for (int j = 0; j < n_cutoff; ++j) {
-            double ln = log_n[j];
-            double invs = inv_sqrt_n[j];
-            double arg = theta - ti * ln;
-            double c = cos(arg);
-            double s = sin(arg);
-            acc_f += c * invs;
-            acc_fp += (-s) * (d_theta - ln) * invs;
-        }
-        out_f[i] = 2.0 * acc_f;
-        out_fp[i] = 2.0 * acc_fp;
-    }
-    """
-    kernel = cp.RawKernel(code, "chaos_eval", options=("--std=c++14",), backend="nvrtc")
-    log_n, inv_sqrt_n = _get_chaos_tables_cupy(n_cutoff=n_cutoff, dtype=np.float64)
-    out = (kernel, log_n, inv_sqrt_n)
-    _CHAOS_KERNEL_CACHE[key] = out
-    return out
-
-
 def sample_gpu_utilization_percent(samples=3, interval_sec=0.1):
     """
     Sample GPU utilization (%) using nvidia-smi.
@@ -174,6 +131,7 @@ def get_gpu_device_info():
         "numpy": getattr(np, "__version__", "unknown"),
         "cupy_available": bool(_CUPY_AVAILABLE),
         "cupy": getattr(cp, "__version__", None) if _CUPY_AVAILABLE else None,
+        "cpu_kernel": "numba" if CPU_KERNEL_ENABLED else "numpy",
         "cuda_visible_devices": os.environ.get("CUDA_VISIBLE_DEVICES", ""),
         "backend": "CuPy (GPU)" if _CUPY_AVAILABLE else "NumPy (CPU fallback)",
         "gpu_index": None,
@@ -257,131 +215,31 @@ def query_process_gpu_memory_mb(pid=None):
     return total if found else 0.0
 
 
-def riemann_n_formula(t, n, xp):
-    """Riemann-von Mangoldt formula inverse: f(t,n) = 0 at n-th zero.
-    Vectorized over arrays t and n (same shape)."""
-    two_pi = xp.pi * 2.0
-    val = (t / two_pi) * xp.log(t / two_pi) - (t / two_pi) + 0.875
-    return val - n
-
+def format_stage_metrics(metrics, cpu=False):
+    """
+    One-token stage breakdown for log lines: stage_us/zero=macro:0.2,... [alloc_b/zero=...].
 
-def riemann_n_formula_derivative(t, xp):
-    """Derivative of riemann_n_formula w.r.t. t (n constant).
-    d/dt [ (t/(2*pi))*log(t/(2*pi)) - t/(2*pi) ] = (1/(2*pi))*log(t/(2*pi))."""
-    two_pi = xp.pi * 2.0
-    return (1.0 / two_pi) * xp.log(t / two_pi)
+    cpu=True (sharded runs) labels it stage_cpu_us/zero: the stage seconds are then
+    summed over the worker processes, i.e. CPU time, not comparable with the
+    wall-clock ms/zero.
+    """
+    order = list(STAGES) + ["host"]
 
+    def fmt(values, spec):
+        return ",".join(f"{k}:{values[k]:{spec}}" for k in order if k in values)
 
-def riemann_siegel_theta(t, xp):
-    """Riemann-Siegel theta function. Vectorized over t."""
-    two_pi = xp.pi * 2.0
-    return (t / 2.0) * xp.log(t / two_pi) - (t / 2.0) - (xp.pi / 8.0)
+    label = "stage_cpu_us/zero" if cpu else "stage_us/zero"
+    out = f"{label}={fmt(metrics['us_per_zero'], '.2f')} newton_mean={metrics['newton_mean']:.2f}"
+    if metrics["bytes_per_zero"]:
+        out += f" alloc_b/zero={fmt(metrics['bytes_per_zero'], '.0f')}"
+    return out
 
 
-def riemann_siegel_theta_derivative(t, xp):
-    """Derivative of Riemann-Siegel theta w.r.t. t."""
-    two_pi = xp.pi * 2.0
-    return 0.5 * xp.log(t / two_pi)
-
-
-def chaos_wave_eval(t, n_cutoff, xp):
-    """
-    Return (f, fp) for chaos wave at t, where:
-      f  = chaos_wave_function(t)
-      fp = d/dt chaos_wave_function(t)
-    Uses a single custom CUDA kernel for CuPy to reduce temporaries and improve GPU utilization.
-    """
-    t = xp.asarray(t, dtype=float)
-    if t.ndim == 0:
-        t = t[None]
-
-    if xp.__name__ == "cupy":
-        kernel, log_n, inv_sqrt_n = _get_chaos_kernel_and_tables(n_cutoff=n_cutoff, dtype=np.float64)
-        out_f = cp.empty_like(t, dtype=cp.float64)
-        out_fp = cp.empty_like(t, dtype=cp.float64)
-        n = int(t.size)
-        threads = 256
-        blocks = (n + threads - 1) // threads
-        kernel((blocks,), (threads,), (t, log_n, inv_sqrt_n, int(n_cutoff), out_f, out_fp, n))
-        return out_f, out_fp
-
-    # NumPy fallback (vectorized)
-    theta = riemann_siegel_theta(t, xp)
-    d_theta = riemann_siegel_theta_derivative(t, xp)
-    n_vec = xp.arange(1, n_cutoff + 1, dtype=float)
-    log_n = xp.log(n_vec)
-    sqrt_n = xp.sqrt(n_vec)
-    arg = theta[:, None] - t[:, None] * log_n[None, :]
-    inv_sqrt = 1.0 / sqrt_n[None, :]
-    f = 2.0 * (xp.cos(arg) * inv_sqrt).sum(axis=1)
-    fp = 2.0 * ((-xp.sin(arg)) * (d_theta[:, None] - log_n[None, :]) * inv_sqrt).sum(axis=1)
-    return f, fp
-
-
-def batched_macro(n_array, xp, max_iter=20, tol=1e-12):
-    """Batched macroscopic prediction: solve riemann_n_formula(t, n) = 0 for all n.
-    Returns array of t_macro same shape as n_array."""
-    two_pi = float(np.pi * 2.0)
-    # Initial guess: t0 = 2*pi*n / log(n)
-    nf = xp.asarray(n_array, dtype=float)
-    t = xp.where(nf > 1, two_pi * nf / xp.log(nf), 14.0)
-    for _ in range(max_iter):
-        f = riemann_n_formula(t, nf, xp)
-        fp = riemann_n_formula_derivative(t, xp)
-        # Avoid division by zero
-        step = f / (fp + 1e-14)
-        t = t - step
-        if xp.abs(step).max() < tol:
-            break
-    return t
-
-
-def batched_micro(t_macro, n_array, stiffness, xp):
-    """Batched microscopic correction using theoretical previous zero.
-    Uses t_macro[n-1] as approximation for previous_zero to keep parallelism."""
-    nf = xp.asarray(n_array, dtype=float)
-    # Theoretical location for n-1 (for correction)
-    n_prev = xp.maximum(nf - 1, 1)
-    two_pi = float(np.pi * 2.0)
-    t0_prev = xp.where(n_prev > 1, two_pi * n_prev / xp.log(n_prev), 14.0)
-    t_prev_theory = batched_macro(n_prev, xp, max_iter=15, tol=1e-10)
-    # Previous prediction: use t_macro of previous index (shift)
-    t_prev_pred = xp.roll(t_macro, 1)
-    # First index in batch has no previous zero -> use t_prev_theory so correction = 0
-    t_prev_pred = xp.where(xp.arange(nf.size, dtype=xp.int32) > 0, t_prev_pred, t_prev_theory)
-    # For n=1 no correction
-    t_prev_pred = xp.where(nf > 1, t_prev_pred, t_prev_theory)
-    displacement = t_prev_pred - t_prev_theory
-    correction = displacement * stiffness
-    return t_macro + correction
-
-
-def batched_chaos_refinement(t_micro, n_cutoff, xp, search_window=0.5, max_iter=15, tol=1e-10):
-    """Batched Newton refinement: find root of chaos_wave_function near t_micro."""
-    t = xp.asarray(t_micro, dtype=float) + 0.0  # ensure copy for in-place updates
-    for _ in range(max_iter):
-        f, fp = chaos_wave_eval(t, n_cutoff, xp)
-        step = f / (xp.abs(fp) + 1e-14)
-        t = t - step
-        # Clamp to window around original t_micro
-        t = xp.clip(t, t_micro - search_window, t_micro + search_window)
-        if xp.abs(step).max() < tol:
-            break
-    return t
-
-
-def predict_zero_three_step_batched(n_array, stiffness=0.95, n_cutoff=20, xp=None):
-    """
-    Three-step prediction for a batch of zero indices (GPU-optimized).
-    Uses theoretical previous zero for microscopic step to allow full batching.
-    """
-    if xp is None:
-        xp = _get_array_module(use_gpu=True)
-    n_array = xp.asarray(n_array, dtype=float)
-    t_macro = batched_macro(n_array, xp)
-    t_micro = batched_micro(t_macro, n_array, stiffness, xp)
-    t_final = batched_chaos_refinement(t_micro, n_cutoff, xp)
-    return t_final
+def format_newton_histogram(hist):
+    """Format an iteration histogram as 'iters:count' pairs (non-zero bins only)."""
+    if hist is None:
+        return "n/a"
+    return " ".join(f"{k}:{int(c)}" for k, c in enumerate(hist) if c)
 
 
 def test_scalability_gpu(
@@ -396,14 +254,48 @@ def test_scalability_gpu(
     streams=2,
     collect_results=True,
     print_details=True,
+    method="chaos",
+    isolation=None,
+    micro="theory",
+    workers=1,
+    pool=None,
+    precision="float64",
+    compare_f64=False,
+    sink=None,
+    sampler=None,
+    previous_zero=None,
 ):
     """
     Test algorithm scalability on GPU with batched computation.
+    method: Z evaluator for the refinement step (see zero_engine.EVALUATORS).
+    isolation: "window" (fixed +/-0.5 clamp) or "gram" (Gram-block sign-change brackets);
+      None picks zero_engine.default_isolation(method, precision).
+    micro: "theory" (theoretical previous zero, fully parallel) or "chained" (the
+      sequential previous-prediction recurrence of 13/14, reproduced in batches and
+      carried across batches; forces one host sync per batch).
     use_dynamic_memory: cap batch_size by GPU free memory (CuPy only).
     double_buffer: overlap GPU compute of batch b with CPU copy/result-build of batch b-1 (CuPy only).
+    workers: shard the batches across this many processes (NumPy only); pool: a
+      ShardPool to reuse (duration mode), created for this call when omitted.
+      Total time is then wall-clock time, so ms/zero reflects throughput.
+    precision: "float64" or "mixed" (float32 stages with float64 polish, see
+      predict_zero_three_step_batched). compare_f64: with "mixed", also run the
+      pure float64 path on every batch (untimed in the totals) and report both
+      side by side (serial batch loop only).
+    sink: optional zero_engine.NpySink; every batch is appended to its memory-mapped
+      columns (n, prediction, time_ms, estimated_error) as soon as it is harvested,
+      and the summary statistics are taken from those columns.
+    sampler: optional zero_engine.CertificationSampler; every harvested batch is
+      offered to it for background mpmath certification.
+    previous_zero: with micro="chained", the zero before start_n that seeds the
+      recurrence (duration mode passes the previous run's last prediction); the
+      summary returns this run's as "last_prediction".
     """
     xp = _get_array_module(use_gpu)
+    isolation = isolation or default_isolation(method, precision)
     backend = "CuPy (GPU)" if xp.__name__ == "cupy" else "NumPy (CPU fallback)"
+    if xp.__name__ == "numpy" and CPU_KERNEL_ENABLED and method == "chaos":
+        backend += " + Numba chaos kernel"
     n_cutoff = 20
 
     # Dynamic GPU memory: cap batch_size by safe value
@@ -423,23 +315,89 @@ def test_scalability_gpu(
 
     if print_details:
         print(f"Scalability test (GPU-optimized) — backend: {backend}")
-        print(f"Testing zeros {start_n} to {end_n} (step={step}), batch_size={batch_size}")
+        print(
+            f"Testing zeros {start_n} to {end_n} (step={step}), batch_size={batch_size}, method={method}, "
+            f"isolation={isolation}, micro={micro}, precision={precision}"
+        )
         if double_buffer and xp.__name__ == "cupy":
             print(f"Streamed pipeline (CPU/GPU overlap): enabled, streams={streams}")
         print("=" * 60)
 
-    n_values = list(range(int(start_n), int(end_n) + 1, int(step)))
-    if not n_values:
+    n_values = np.arange(int(start_n), int(end_n) + 1, int(step), dtype=np.int64)
+    if n_values.size == 0:
         print("No indices to test.")
-        return []
+        return np.empty(0, dtype=RESULT_DTYPE)
+
+    result_batches = [] if collect_results else None
+    keep_rows = collect_results or sink is not None or sampler is not None
+
+    def emit(n_batch, pred_cpu, t_theory_cpu, per_zero_ms):
+        """Record one harvested batch (structured rows for the results, the sink and/or the sampler)."""
+        host_start = time.perf_counter()
+        rows = result_rows(n_batch, pred_cpu, t_theory_cpu, per_zero_ms)
+        if sink is not None:
+            sink.append_rows(rows)
+        if sampler is not None:
+            sampler.offer(rows)
+        if collect_results:
+            result_batches.append(rows)
+        stage_sec = refine_stats.setdefault("stage_sec", {})
+        stage_sec["host"] = stage_sec.get("host", 0.0) + (time.perf_counter() - host_start)
 
-    results = [] if collect_results else None
     total_time = 0.0
     total_zeros = 0
     sum_error = 0.0
     max_error = 0.0
+    refine_stats = {}
+    chained = micro == "chained"
+    chain_prev = previous_zero
     n_batches = (len(n_values) + batch_size - 1) // batch_size
     use_overlap = double_buffer and xp.__name__ == "cupy" and n_batches >= 2 and int(streams) >= 2
+    use_shards = xp.__name__ == "numpy" and (pool is not None or int(workers) > 1)
+    compare = compare_f64 and precision == "mixed" and not use_shards and not use_overlap
+    if compare_f64 and not compare and print_details:
+        print("Float64 comparison needs --precision mixed and the serial batch loop (no --workers / --double-buffer); skipped.")
+    f64 = {"time": 0.0, "mixed_time": 0.0, "sum_error": 0.0, "max_error": 0.0, "max_diff": 0.0, "n_diff": 0}
+    f64_prev = previous_zero
+    if use_shards:
+        shard_pool = pool if pool is not None else ShardPool(workers)
+        try:
+            pred_all, theory_all, batch_elapsed, shard_stats, total_time = shard_pool.run_shards(
+                n_values,
+                batch_size,
+                n_cutoff=n_cutoff,
+                method=method,
+                isolation=isolation,
+                chained=chained,
+                precision=precision,
+                previous_zero=chain_prev,
+            )
+        finally:
+            if pool is None:
+                shard_pool.close()
+        if chained and len(pred_all):
+            chain_prev = float(pred_all[-1])
+        workers = shard_pool.workers
+        merge_refine_stats(refine_stats, shard_stats)
+        for b in range(n_batches):
+            i0 = b * batch_size
+            i1 = min(i0 + batch_size, len(n_values))
+            batch_len = (i1 - i0)
+            total_zeros += batch_len
+            per_zero_ms = (float(batch_elapsed[b]) / batch_len) * 1000
+            pred_cpu = pred_all[i0:i1]
+            t_theory_cpu = theory_all[i0:i1]
+            err = np.abs(pred_cpu - t_theory_cpu) / (np.abs(t_theory_cpu) + 1e-14)
+            err_mean = float(np.mean(err))
+            err_max = float(np.max(err))
+            sum_error += err_mean * batch_len
+            max_error = max(max_error, err_max)
+            if keep_rows:
+                emit(n_values[i0:i1], pred_cpu, t_theory_cpu, per_zero_ms)
+        if print_details:
+            print(f"  {n_batches} batches on {workers} worker processes — {total_time:.3f}s wall")
+    else:
+        workers = 1
 
     if use_overlap:
         stream_count = min(int(streams), n_batches)
@@ -452,7 +410,7 @@ def test_scalability_gpu(
         last_i1 = [0] * stream_count
         last_elapsed = [0.0] * stream_count
 
-    for b in range(n_batches):
+    for b in range(0 if use_shards else n_batches):
         start_time = time.perf_counter()
         i0 = b * batch_size
         i1 = min(i0 + batch_size, len(n_values))
@@ -474,20 +432,26 @@ def test_scalability_gpu(
                 err_max = float(cp.asnumpy(err.max()))
                 sum_error += err_mean * batch_len
                 max_error = max(max_error, err_max)
-                if collect_results:
+                if keep_rows:
                     pred_cpu = cp.asnumpy(last_pred[si])
                     t_theory_cpu = cp.asnumpy(last_theory[si])
-                    for i, n in enumerate(last_n_batch[si]):
-                        rel_err = abs(float(pred_cpu[i]) - float(t_theory_cpu[i])) / (abs(float(t_theory_cpu[i])) + 1e-14)
-                        results.append({
-                            "n": int(n),
-                            "prediction": float(pred_cpu[i]),
-                            "time_ms": per_zero_ms,
-                            "estimated_error": rel_err,
-                        })
+                    emit(last_n_batch[si], pred_cpu, t_theory_cpu, per_zero_ms)
 
             with stream:
-                predictions = predict_zero_three_step_batched(n_arr, stiffness=0.95, n_cutoff=n_cutoff, xp=xp)
+                predictions = predict_zero_three_step_batched(
+                    n_arr,
+                    stiffness=0.95,
+                    n_cutoff=n_cutoff,
+                    xp=xp,
+                    stats=refine_stats,
+                    method=method,
+                    isolation=isolation,
+                    chained=chained,
+                    previous_zero=chain_prev,
+                    precision=precision,
+                )
+                if chained:
+                    chain_prev = float(predictions[-1])
                 t_theory_batch = batched_macro(n_arr, xp, max_iter=15, tol=1e-10)
 
             elapsed = time.perf_counter() - start_time
@@ -499,10 +463,46 @@ def test_scalability_gpu(
             last_i1[si] = i1
             last_elapsed[si] = elapsed
         else:
-            predictions = predict_zero_three_step_batched(n_arr, stiffness=0.95, n_cutoff=n_cutoff, xp=xp)
+            predictions = predict_zero_three_step_batched(
+                n_arr,
+                stiffness=0.95,
+                n_cutoff=n_cutoff,
+                xp=xp,
+                stats=refine_stats,
+                method=method,
+                isolation=isolation,
+                chained=chained,
+                previous_zero=chain_prev,
+                precision=precision,
+            )
+            if chained:
+                chain_prev = float(predictions[-1])
+            predict_elapsed = time.perf_counter() - start_time
             t_theory_batch = batched_macro(n_arr, xp, max_iter=15, tol=1e-10)
             elapsed = time.perf_counter() - start_time
             total_time += elapsed
+            if compare:
+                f64_start = time.perf_counter()
+                pred_f64 = predict_zero_three_step_batched(
+                    n_arr,
+                    stiffness=0.95,
+                    n_cutoff=n_cutoff,
+                    xp=xp,
+                    method=method,
+                    isolation=isolation,
+                    chained=chained,
+                    previous_zero=f64_prev,
+                )
+                if chained:
+                    f64_prev = float(pred_f64[-1])
+                f64["time"] += time.perf_counter() - f64_start
+                f64["mixed_time"] += predict_elapsed
+                diff = to_numpy(xp.abs(predictions - pred_f64))
+                f64_err = to_numpy(xp.abs(pred_f64 - t_theory_batch) / (xp.abs(t_theory_batch) + 1e-14))
+                f64["sum_error"] += float(np.mean(f64_err)) * (i1 - i0)
+                f64["max_error"] = max(f64["max_error"], float(np.max(f64_err)))
+                f64["max_diff"] = max(f64["max_diff"], float(np.max(diff)))
+                f64["n_diff"] += int(np.count_nonzero(diff > 1e-8))
 
             batch_len = (i1 - i0)
             total_zeros += batch_len
@@ -521,22 +521,15 @@ def test_scalability_gpu(
             sum_error += err_mean * batch_len
             max_error = max(max_error, err_max)
 
-            if collect_results:
+            if keep_rows:
                 if xp.__name__ == "cupy":
                     pred_cpu = cp.asnumpy(predictions)
                     t_theory_cpu = cp.asnumpy(t_theory_batch)
-                for i, n in enumerate(n_batch):
-                    rel_err = abs(float(pred_cpu[i]) - float(t_theory_cpu[i])) / (abs(float(t_theory_cpu[i])) + 1e-14)
-                    results.append({
-                        "n": int(n),
-                        "prediction": float(pred_cpu[i]),
-                        "time_ms": per_zero_ms,
-                        "estimated_error": rel_err,
-                    })
+                emit(n_batch, pred_cpu, t_theory_cpu, per_zero_ms)
 
         if print_details and ((b + 1) % max(1, n_batches // 5) == 0 or b == n_batches - 1):
             elapsed_print = elapsed if not use_overlap else (time.perf_counter() - start_time)
-            done = (len(results) if collect_results else total_zeros)
+            done = total_zeros
             print(f"  Batch {b + 1}/{n_batches} ({done} tests) — {elapsed_print:.3f}s")
     if use_overlap:
         # Harvest remaining batches from all streams
@@ -552,21 +545,19 @@ def test_scalability_gpu(
             err_max = float(cp.asnumpy(err.max()))
             sum_error += err_mean * batch_len
             max_error = max(max_error, err_max)
-            if collect_results:
+            if keep_rows:
                 pred_cpu = cp.asnumpy(last_pred[si])
                 t_theory_cpu = cp.asnumpy(last_theory[si])
-                for i, n in enumerate(last_n_batch[si]):
-                    rel_err = abs(float(pred_cpu[i]) - float(t_theory_cpu[i])) / (abs(float(t_theory_cpu[i])) + 1e-14)
-                    results.append({
-                        "n": int(n),
-                        "prediction": float(pred_cpu[i]),
-                        "time_ms": per_zero_ms,
-                        "estimated_error": rel_err,
-                    })
+                emit(last_n_batch[si], pred_cpu, t_theory_cpu, per_zero_ms)
 
+    results = None
     if collect_results:
-        times = [r["time_ms"] for r in results]
-        errors = [r["estimated_error"] for r in results]
+        results = np.concatenate(result_batches) if result_batches else np.empty(0, dtype=RESULT_DTYPE)
+        times = results["time_ms"]
+        errors = results["estimated_error"]
+    elif sink is not None:
+        times = sink.column("time_ms")
+        errors = sink.column("estimated_error")
     else:
         times = None
         errors = None
@@ -578,11 +569,11 @@ def test_scalability_gpu(
         print("\n" + "=" * 60)
         print("SCALABILITY TEST RESULTS (GPU)")
         print("=" * 60)
-        print(f"Backend: {backend}")
-        print(f"Total zeros tested: {total_zeros if not collect_results else len(results)}")
+        print(f"Backend: {backend}" + (f", {workers} worker processes" if use_shards else ""))
+        print(f"Total zeros tested: {total_zeros}")
         print(f"Range: {start_n} to {end_n}, batch_size: {batch_size}")
         print(f"\nTiming (per zero):")
-        if collect_results:
+        if times is not None:
             print(f"  Mean: {np.mean(times):.2f} ms")
             print(f"  Median: {np.median(times):.2f} ms")
             print(f"  Min: {np.min(times):.2f} ms")
@@ -591,13 +582,34 @@ def test_scalability_gpu(
             print(f"  Mean: {mean_ms_per_zero:.2f} ms")
         print(f"  Total time: {total_time:.2f} s")
         print(f"\nError (relative):")
-        if collect_results:
+        if errors is not None:
             print(f"  Mean: {np.mean(errors) * 100:.4f}%")
             print(f"  Median: {np.median(errors) * 100:.4f}%")
+            print(f"  Min: {np.min(errors) * 100:.4f}%")
             print(f"  Max: {np.max(errors) * 100:.4f}%")
         else:
             print(f"  Mean: {mean_error * 100:.4f}%")
             print(f"  Max: {max_error * 100:.4f}%")
+        if chained:
+            print(f"\nChained micro step (sequential recurrence in batches):")
+            print(f"  Speculate/repair passes: {refine_stats.get('chain_rounds', 0)}")
+            print(f"  No sign change (kept micro prediction): {refine_stats.get('no_sign_change', 0)}")
+        else:
+            print(f"\nChaos refinement Newton iterations (histogram):")
+            print(f"  {format_newton_histogram(refine_stats.get('newton_hist'))}")
+            clamped = refine_stats.get("newton_clamped", 0)
+            print(f"  Clamped at search window: {clamped}  ({clamped / max(1, total_zeros) * 100:.2f}% of zeros)")
+            print(f"  Unconverged: {refine_stats.get('newton_unconverged', 0)}")
+            print(f"  Per stage: {format_stage_metrics(stage_metrics(refine_stats), cpu=use_shards)}")
+        if isolation == "gram":
+            print(f"  Unbracketed by Gram isolation: {refine_stats.get('unbracketed', 0)}")
+        if compare and total_zeros:
+            print(f"\nMixed precision vs pure float64 (same zeros):")
+            print(f"  {'':<24}{'mixed':>14}{'float64':>14}")
+            print(f"  {'Prediction time (s)':<24}{f64['mixed_time']:>14.3f}{f64['time']:>14.3f}")
+            print(f"  {'Mean error (%)':<24}{mean_error * 100:>14.6f}{f64['sum_error'] / total_zeros * 100:>14.6f}")
+            print(f"  {'Max error (%)':<24}{max_error * 100:>14.6f}{f64['max_error'] * 100:>14.6f}")
+            print(f"  Max |t_mixed - t_float64|: {f64['max_diff']:.3e}  (zeros differing by > 1e-8: {f64['n_diff']})")
 
     if collect_results:
         return results
@@ -607,16 +619,63 @@ def test_scalability_gpu(
         "end_n": int(end_n),
         "step": int(step),
         "batch_size": int(batch_size),
+        "method": method,
+        "isolation": isolation,
+        "micro": micro,
+        "precision": precision,
+        "workers": int(workers),
+        "sink": sink.directory if sink is not None else None,
         "zeros": int(total_zeros),
         "total_time_sec": float(total_time),
         "mean_ms_per_zero": float(mean_ms_per_zero),
         "mean_error": float(mean_error),
         "max_error": float(max_error),
+        "newton_hist": [int(c) for c in refine_stats.get("newton_hist", [])],
+        "newton_clamped": int(refine_stats.get("newton_clamped", 0)),
+        "newton_unconverged": int(refine_stats.get("newton_unconverged", 0)),
+        "stages": {k: refine_stats[k] for k in ("stage_sec", "stage_bytes", "stage_zeros", "traced_zeros") if k in refine_stats},
+        "unbracketed": int(refine_stats.get("unbracketed", 0)),
+        "chain_rounds": int(refine_stats.get("chain_rounds", 0)),
+        "no_sign_change": int(refine_stats.get("no_sign_change", 0)),
+        "last_prediction": chain_prev if chained else None,
+        "f64_comparison": {
+            "mixed_predict_sec": float(f64["mixed_time"]),
+            "f64_predict_sec": float(f64["time"]),
+            "f64_mean_error": float(f64["sum_error"] / total_zeros) if total_zeros else 0.0,
+            "f64_max_error": float(f64["max_error"]),
+            "max_abs_diff": float(f64["max_diff"]),
+            "n_diff_gt_1e-8": int(f64["n_diff"]),
+        } if compare else None,
     }
 
 
 # Minimum batch size when util cap is enforced by reducing batch_size (avoid too-small batches).
 MIN_BATCH_FOR_UTIL_CAP = 64
+# Checkpoint format version (bump when the state layout changes).
+CHECKPOINT_VERSION = 2
+# Settings that must match between a checkpoint and the resuming run.
+CHECKPOINT_CONFIG_KEYS = ("start_n", "end_n", "step", "sweep", "sweep_chunk", "method", "isolation", "micro", "precision")
+# Duration-mode sweeps: repeat start_n..end_n, or advance a frontier of new indices.
+SWEEPS = ("repeat", "frontier")
+
+
+def save_checkpoint(path, state):
+    """Write state as JSON atomically (temporary file, fsync, os.replace)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, indent=1)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+    """Read a checkpoint written by save_checkpoint."""
+    with open(path, encoding="utf-8") as fh:
+        state = json.load(fh)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}: {state.get('version')}")
+    return state
 
 
 def run_for_duration(
@@ -635,6 +694,23 @@ def run_for_duration(
     util_interval_sec=0.1,
     log_interval_sec=10.0,
     max_sleep_sec=2.0,
+    method="chaos",
+    isolation=None,
+    micro="theory",
+    workers=1,
+    precision="float64",
+    sweep="repeat",
+    sweep_chunk=0,
+    checkpoint_path=None,
+    checkpoint_interval_sec=60.0,
+    resume=False,
+    sink_dir=None,
+    certify_fraction=0.0,
+    certify_strata=1,
+    tune=False,
+    tune_force=False,
+    tune_path=None,
+    trace_alloc=False,
 ):
     """
     Run scalability tests until duration_seconds has elapsed.
@@ -643,11 +719,76 @@ def run_for_duration(
     When sampled GPU util > util_max_percent, batch_size is reduced for the next run.
     When util is below target (resource remains), batch_size is enlarged back up to the requested
     batch_size so the run can use more of the available GPU.
+    workers > 1 (NumPy backend) shards every run across one persistent process pool.
+    sweep="repeat": each run covers the next sweep_chunk indices of start_n..end_n
+    (0 = the whole range), wrapping around at end_n.
+    sweep="frontier": each run takes the next block of sweep_chunk unprocessed indices
+    (0 = the size of start_n..end_n) from a frontier that starts at start_n and only
+    moves up, so every zero is computed once and the heights keep growing.
+    micro="chained": each run is seeded with the previous run's last prediction
+    (kept in the checkpoint as chain_prev), so consecutive runs form one recurrence;
+    a repeat sweep starts over without a previous zero.
+    sink_dir: stream per-zero rows of every run into an NpySink there.
+    checkpoint_path: every checkpoint_interval_sec (and at the end) the sweep cursor,
+    accumulated counters, util history, current batch size, elapsed time and output-file
+    offset are written there atomically. resume=True reloads it, truncates the output file
+    (and the sink) to the saved position and continues; duration_seconds counts the time
+    already spent.
+    certify_fraction > 0: certify a stratified sample of the predictions (certify_strata
+    zeros per batch) with mpmath on that fraction of the cores, in the background; log
+    lines then carry the true absolute error of the certified zeros (cert=, cert_err_*).
+    tune=True (NumPy backend): take batch size and chaos block size from zero_engine.autotune
+    (stored per host in tune_path, probed when missing or tune_force) and probe again at the
+    current height when the run's zeros/sec drifts from its post-tuning baseline.
+    Log lines carry the per-stage breakdown of the interval (zero_engine.stage_metrics:
+    us per zero in macro / micro / isolation / refinement / host result building, mean
+    Newton iterations). trace_alloc=True runs the first run of every interval under
+    tracemalloc and adds the bytes allocated per zero and stage; such runs are about
+    2x slower, so their time is left out of ms/zero, the per-stage seconds and the
+    autotune baseline (their zeros still count).
     """
+    if sweep not in SWEEPS:
+        raise ValueError(f"Unknown sweep: {sweep!r} (expected one of {SWEEPS})")
+    isolation = isolation or default_isolation(method, precision)
     terminal_out = sys.stdout
     f = None
+    pool = None
+    sink = None
+    sampler = None
+    cert = None
+    tuning = None
+    monitor = None
+    stage_stats = {}
+    interval_stats = {}
+    config = {
+        "start_n": int(start_n),
+        "end_n": int(end_n),
+        "step": int(step),
+        "sweep": sweep,
+        "sweep_chunk": int(sweep_chunk),
+        "method": method,
+        "isolation": isolation,
+        "micro": micro,
+        "precision": precision,
+    }
+    state = None
+    if resume:
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            raise FileNotFoundError(f"No checkpoint to resume from: {checkpoint_path}")
+        state = load_checkpoint(checkpoint_path)
+        changed = [k for k in CHECKPOINT_CONFIG_KEYS if state["config"].get(k) != config[k]]
+        if changed:
+            raise ValueError(f"Checkpoint {checkpoint_path} was written with different settings: {', '.join(changed)}")
+        output_path = output_path or state.get("output_path")
+        sink_dir = sink_dir or state.get("sink_dir")
     if output_path:
-        f = open(output_path, "w", encoding="utf-8")
+        if state is not None and state.get("output_path") == output_path and os.path.exists(output_path):
+            # Drop lines written after the checkpoint; they are produced again.
+            f = open(output_path, "r+", encoding="utf-8")
+            f.truncate(int(state["output_offset"]))
+            f.seek(int(state["output_offset"]))
+        else:
+            f = open(output_path, "w", encoding="utf-8")
 
     def log_line(s):
         # Always report on running terminal, and also write to output file if provided.
@@ -660,13 +801,23 @@ def run_for_duration(
             f.flush()
     try:
         dev_info = get_gpu_device_info()
+        if state is not None:
+            log_line("\n" + "=" * 60)
+            log_line(
+                f"Resumed from checkpoint {checkpoint_path}: runs={state['run_count']} zeros={state['total_zeros']} "
+                f"sweeps={state['sweeps']} next_n={start_n + state['cursor'] * step} elapsed={state['elapsed_sec']:.0f}s"
+            )
+        if sink_dir:
+            sink_rows = int(state["sink_rows"]) if state is not None and state.get("sink_dir") == sink_dir else None
+            sink = NpySink(sink_dir, rows=sink_rows)
         log_line("GPU Scalability Test — duration run (light logging + util cap)")
         log_line(f"Started: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H%M%SZ')} UTC")
         log_line(f"Target duration: {duration_seconds} s ({duration_seconds / 3600:.2f} hours)")
         log_line(f"Output file: {output_path or '(none; terminal only)'}")
         log_line(
             f"Backend: {dev_info.get('backend')} | pid={dev_info.get('pid')} | "
-            f"python={dev_info.get('python')} numpy={dev_info.get('numpy')} cupy={dev_info.get('cupy') or 'n/a'}"
+            f"python={dev_info.get('python')} numpy={dev_info.get('numpy')} cupy={dev_info.get('cupy') or 'n/a'} "
+            f"cpu_kernel={dev_info.get('cpu_kernel')}"
         )
         if dev_info.get("cuda_visible_devices") != "":
             log_line(f"CUDA_VISIBLE_DEVICES={dev_info.get('cuda_visible_devices')}")
@@ -676,34 +827,135 @@ def run_for_duration(
                 f"cc={dev_info.get('gpu_cc') or 'unknown'} mem_total_mb={dev_info.get('gpu_mem_total_mb') or 'unknown'}"
             )
         log_line(f"Util cap: {util_max_percent:.1f}%  (by batch-size, samples={util_samples}, interval={util_interval_sec}s)")
+        log_line(f"Z evaluator: {method} | zero isolation: {isolation} | micro step: {micro} | precision: {precision}")
+        if int(workers) > 1 and not _CUPY_AVAILABLE:
+            pool = ShardPool(workers)
+            log_line(f"CPU sharding: {pool.workers} worker processes (shared-memory results)")
         log_line(f"Log interval: {log_interval_sec:.1f}s")
+        if certify_fraction and certify_fraction > 0:
+            if MPMATH_AVAILABLE:
+                sampler = CertificationSampler(certify_workers(certify_fraction), strata=certify_strata)
+                log_line(
+                    f"Certification: mpmath.zetazero on {sampler.workers} background process(es), "
+                    f"{sampler.strata} sample(s) per batch (dropped while busy)"
+                )
+            else:
+                log_line("Certification: disabled (mpmath not installed)")
+        log_line(f"Sweep: {sweep}" + (f" (block {sweep_chunk or 'whole range'})" if sweep == "frontier" else ""))
+        if sink is not None:
+            log_line(f"Sink: {sink_dir} (per-zero .npy columns, {sink.rows} rows so far)")
+        if checkpoint_path:
+            log_line(f"Checkpoint: {checkpoint_path} (every {checkpoint_interval_sec:.0f}s)")
         log_line("=" * 60)
 
-        end_time = time.perf_counter() + duration_seconds
+        n_total = len(range(int(start_n), int(end_n) + 1, int(step)))
+        chunk = n_total if int(sweep_chunk) <= 0 else min(int(sweep_chunk), n_total)
+        cursor = 0
+        sweeps = 0
         run_count = 0
         total_zeros = 0
+        timed_zeros = 0
         sum_time_sec = 0.0
         sum_error = 0.0
         max_error = 0.0
         sum_util = 0.0
         util_count = 0
-        last_log_t = time.perf_counter()
-        last_logged_runs = 0
-        last_logged_zeros = 0
-        last_logged_time = 0.0
-        last_logged_error = 0.0
-        last_logged_batch = batch_size
-
+        total_unbracketed = 0
+        total_clamped = 0
+        chain_prev = None
+        elapsed_before = 0.0
         # Current batch size for util cap: adjusted each run when util_max_percent > 0.
         current_batch = max(MIN_BATCH_FOR_UTIL_CAP, int(batch_size))
         max_batch = max(MIN_BATCH_FOR_UTIL_CAP, int(batch_size))
+        if state is not None:
+            cursor = int(state["cursor"]) if sweep == "frontier" else int(state["cursor"]) % max(1, n_total)
+            sweeps = int(state["sweeps"])
+            run_count = int(state["run_count"])
+            total_zeros = int(state["total_zeros"])
+            timed_zeros = int(state.get("timed_zeros", total_zeros))
+            sum_time_sec = float(state["sum_time_sec"])
+            sum_error = float(state["sum_error"])
+            max_error = float(state["max_error"])
+            sum_util = float(state["sum_util"])
+            util_count = int(state["util_count"])
+            total_unbracketed = int(state["total_unbracketed"])
+            total_clamped = int(state.get("total_clamped", 0))
+            chain_prev = state.get("chain_prev")
+            elapsed_before = float(state["elapsed_sec"])
+            current_batch = min(max_batch, max(MIN_BATCH_FOR_UTIL_CAP, int(state["current_batch"])))
+        tune_kwargs = dict(
+            step=step, method=method, isolation=isolation, precision=precision, path=tune_path, log=log_line, pool=pool
+        )
+        if tune and _CUPY_AVAILABLE:
+            log_line("Autotune: CPU only (the CuPy batch size follows the util cap); skipped.")
+        elif tune:
+            tuning = autotune(n_start=start_n + cursor * step, force=tune_force, **tune_kwargs)
+            current_batch = max_batch = max(MIN_BATCH_FOR_UTIL_CAP, tuning["batch_size"])
+            monitor = ThroughputMonitor()
+            log_line(
+                f"Autotune ({tuning['source']}, {tuning['kernel']}, {tuning['workers']} workers): "
+                f"batch={tuning['batch_size']} block_bytes={tuning['block_bytes']} "
+                f"({tuning['zeros_per_sec']:.0f} zeros/s in the probe)"
+            )
 
-        while time.perf_counter() < end_time:
+        session_start = time.perf_counter()
+        end_time = session_start + duration_seconds - elapsed_before
+        last_checkpoint_t = session_start
+
+        def write_checkpoint():
+            offset = 0
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+                offset = f.tell()
+            if sink is not None:
+                sink.flush()
+            save_checkpoint(checkpoint_path, {
+                "version": CHECKPOINT_VERSION,
+                "config": config,
+                "output_path": output_path or None,
+                "output_offset": offset,
+                "sink_dir": sink_dir or None,
+                "sink_rows": sink.rows if sink is not None else 0,
+                "elapsed_sec": elapsed_before + (time.perf_counter() - session_start),
+                "cursor": cursor,
+                "sweeps": sweeps,
+                "run_count": run_count,
+                "total_zeros": total_zeros,
+                "timed_zeros": timed_zeros,
+                "sum_time_sec": sum_time_sec,
+                "sum_error": sum_error,
+                "max_error": max_error,
+                "sum_util": sum_util,
+                "util_count": util_count,
+                "total_unbracketed": total_unbracketed,
+                "total_clamped": total_clamped,
+                "chain_prev": chain_prev,
+                "current_batch": current_batch,
+                "updated": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H%M%SZ'),
+            })
+
+        last_log_t = time.perf_counter()
+        last_logged_runs = run_count
+        last_logged_zeros = total_zeros
+        last_logged_timed = timed_zeros
+        last_logged_time = sum_time_sec
+        last_logged_error = sum_error
+        last_logged_batch = current_batch
+
+        trace_next = bool(trace_alloc)
+        while time.perf_counter() < end_time and n_total:
             run_count += 1
+            traced = trace_next and not tracemalloc.is_tracing()
+            trace_next = False
+            if traced:
+                tracemalloc.start()
             run_start = time.perf_counter()
+            count = chunk if sweep == "frontier" else min(chunk, n_total - cursor)
+            run_start_n = int(start_n) + cursor * int(step)
             summary = test_scalability_gpu(
-                start_n=start_n,
-                end_n=end_n,
+                start_n=run_start_n,
+                end_n=run_start_n + (count - 1) * int(step),
                 step=step,
                 batch_size=current_batch,
                 use_gpu=True,
@@ -713,13 +965,53 @@ def run_for_duration(
                 streams=streams,
                 collect_results=False,
                 print_details=False,
+                method=method,
+                isolation=isolation,
+                micro=micro,
+                pool=pool,
+                precision=precision,
+                sink=sink,
+                sampler=sampler,
+                previous_zero=chain_prev,
             )
+            if traced:
+                tracemalloc.stop()
             run_elapsed = time.perf_counter() - run_start
             zeros = int(summary["zeros"])
+            run_stats = dict(summary["stages"], newton_hist=np.asarray(summary["newton_hist"], dtype=np.int64))
+            for key in ("newton_clamped", "newton_unconverged", "unbracketed"):
+                run_stats[key] = summary[key]
+            if traced:
+                # Only the allocation figures of a traced run; its seconds are inflated by tracemalloc
+                run_stats.pop("stage_sec", None)
+                run_stats.pop("stage_zeros", None)
+            else:
+                timed_zeros += zeros
+                sum_time_sec += float(summary["total_time_sec"])
+            merge_refine_stats(interval_stats, run_stats)
+            merge_refine_stats(stage_stats, run_stats)
             total_zeros += zeros
-            sum_time_sec += float(summary["total_time_sec"])
             sum_error += float(summary["mean_error"]) * zeros
             max_error = max(max_error, float(summary["max_error"]))
+            total_unbracketed += int(summary["unbracketed"])
+            total_clamped += int(summary["newton_clamped"])
+            cursor += count
+            # Chained micro step: the next run continues the recurrence (a new sweep starts fresh)
+            chain_prev = summary["last_prediction"]
+            if sweep == "repeat" and cursor >= n_total:
+                cursor = 0
+                sweeps += 1
+                chain_prev = None
+            if monitor is not None and not traced and monitor.observe(zeros, float(summary["total_time_sec"])):
+                log_line(
+                    f"Autotune: throughput drifted {monitor.baseline:.0f} -> {monitor.rate:.0f} zeros/s; "
+                    f"re-probing at n={start_n + cursor * step}"
+                )
+                tuning = autotune(n_start=start_n + cursor * step, force=True, **tune_kwargs)
+                current_batch = max_batch = max(MIN_BATCH_FOR_UTIL_CAP, tuning["batch_size"])
+                monitor.reset()
+                monitor.reprobes += 1
+                log_line(f"Autotune: batch={tuning['batch_size']} block_bytes={tuning['block_bytes']}")
 
             util = sample_gpu_utilization_percent(samples=util_samples, interval_sec=util_interval_sec)
             if util is not None:
@@ -740,7 +1032,7 @@ def run_for_duration(
                 zeros_delta = total_zeros - last_logged_zeros
                 time_delta = sum_time_sec - last_logged_time
                 err_delta = sum_error - last_logged_error
-                avg_ms = (time_delta / max(1, zeros_delta)) * 1000
+                avg_ms = (time_delta / max(1, timed_zeros - last_logged_timed)) * 1000
                 avg_err = (err_delta / max(1, zeros_delta)) * 100
                 avg_util = (sum_util / util_count) if util_count else float("nan")
                 remaining = end_time - now
@@ -748,21 +1040,36 @@ def run_for_duration(
                 gpu_stats = query_gpu_memory_and_util(gpu_index=dev_info.get("gpu_index"))
                 proc_mem_str = "n/a" if proc_gpu_mem_mb is None else f"{proc_gpu_mem_mb:.0f}"
                 gpu_mem_used_str = "n/a" if gpu_stats.get("mem_used_mb") is None else f"{gpu_stats.get('mem_used_mb'):.0f}/{gpu_stats.get('mem_total_mb'):.0f}"
+                cert_str = ""
+                if sampler is not None:
+                    cert = sampler.metrics()
+                    cert_str = f" cert={cert['certified']} (pending {cert['pending']}, failed {cert['failed']})"
+                    if cert["abs"] is not None:
+                        cert_str += f" cert_err_p50={cert['abs']['p50']:.2e} cert_err_max={cert['abs']['max']:.2e}"
+                metrics = stage_metrics(interval_stats)
                 log_line(
                     f"{datetime.now(timezone.utc).strftime('%Y-%m-%dT%H%M%SZ')} "
                     f"backend={'cupy' if _CUPY_AVAILABLE else 'numpy'} "
                     f"runs={run_count} (+{runs_delta}) zeros={total_zeros} (+{zeros_delta}) "
                     f"ms/zero={avg_ms:.3f} err_mean%={avg_err:.4f} err_max%={max_error*100:.4f} "
                     f"gpu_util%~={avg_util:.1f} gpu_mem_mb={gpu_mem_used_str} proc_gpu_mem_mb={proc_mem_str} "
-                    f"batch={current_batch} rem={remaining:.0f}s"
+                    f"unbracketed={total_unbracketed} batch={current_batch} next_n={start_n + cursor * step} "
+                    f"{format_stage_metrics(metrics, cpu=pool is not None)} clamped={total_clamped}(+{metrics['newton_clamped']}){cert_str} rem={remaining:.0f}s"
                 )
                 # Reset interval baselines
                 last_log_t = now
                 last_logged_runs = run_count
                 last_logged_zeros = total_zeros
+                last_logged_timed = timed_zeros
                 last_logged_time = sum_time_sec
                 last_logged_error = sum_error
                 last_logged_batch = current_batch
+                interval_stats = {}
+                trace_next = bool(trace_alloc)
+
+            if checkpoint_path and (time.perf_counter() - last_checkpoint_t) >= float(checkpoint_interval_sec):
+                write_checkpoint()
+                last_checkpoint_t = time.perf_counter()
 
             if time.perf_counter() >= end_time:
                 break
@@ -770,28 +1077,65 @@ def run_for_duration(
         log_line("\n" + "=" * 60)
         log_line("DURATION RUN SUMMARY")
         log_line("=" * 60)
-        log_line(f"Total runs: {run_count}")
+        if sweep == "frontier":
+            log_line(f"Total runs: {run_count}  (frontier: n {start_n}..{start_n + (cursor - 1) * step}, next n: {start_n + cursor * step})")
+        else:
+            log_line(f"Total runs: {run_count}  (full sweeps: {sweeps}, next n: {start_n + cursor * step})")
         log_line(f"Total zeros tested: {total_zeros}")
         log_line(f"Target duration: {duration_seconds} s")
         log_line(f"Finished: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H%M%SZ')} UTC")
         if total_zeros > 0:
-            mean_ms = (sum_time_sec / total_zeros) * 1000
+            mean_ms = (sum_time_sec / max(1, timed_zeros)) * 1000
             mean_err = (sum_error / total_zeros) * 100
             avg_util = (sum_util / util_count) if util_count else float("nan")
             log_line(f"\nAggregate timing (per zero): mean {mean_ms:.3f} ms")
             log_line(f"Aggregate error (relative): mean {mean_err:.4f}%  max {max_error*100:.4f}%")
             log_line(f"GPU util sampled avg: {avg_util:.1f}%  (samples={util_count})")
+            log_line(f"Unbracketed zeros (Gram isolation): {total_unbracketed}")
+            log_line(f"Clamped at search window: {total_clamped}  ({total_clamped / max(1, total_zeros) * 100:.2f}% of zeros)")
+            log_line(f"Per stage (whole run): {format_stage_metrics(stage_metrics(stage_stats), cpu=pool is not None)}")
+        if tuning is not None:
+            log_line(
+                f"Autotune: batch={tuning['batch_size']} block_bytes={tuning['block_bytes']} "
+                f"(re-probes on drift: {monitor.reprobes})"
+            )
+        cert = sampler.metrics() if sampler is not None else None
+        if cert is not None:
+            log_line(
+                f"Certified by mpmath: {cert['certified']} zeros (submitted {cert['submitted']}, "
+                f"dropped while busy {cert['dropped']}, failed {cert['failed']})"
+            )
+            if cert["last_error"]:
+                log_line(f"  Last certification error: {cert['last_error']}")
+            for key, label in (("abs", "absolute"), ("rel", "relative")):
+                if cert[key] is not None:
+                    log_line(f"  True {label} error: " + "  ".join(f"{k} {v:.3e}" for k, v in cert[key].items()))
         log_line("=" * 60)
         log_line("GPU scalability duration run completed.")
+        if checkpoint_path:
+            write_checkpoint()
     finally:
+        if sampler is not None:
+            sampler.close()
+        if sink is not None:
+            sink.close()
+        if pool is not None:
+            pool.close()
         if output_path and f is not None:
             f.close()
     return {
         "runs": int(run_count),
         "zeros": int(total_zeros),
-        "mean_ms_per_zero": float((sum_time_sec / total_zeros) * 1000) if total_zeros else 0.0,
+        "mean_ms_per_zero": float((sum_time_sec / timed_zeros) * 1000) if timed_zeros else 0.0,
         "mean_error_percent": float((sum_error / total_zeros) * 100) if total_zeros else 0.0,
         "max_error_percent": float(max_error * 100),
+        "unbracketed": int(total_unbracketed),
+        "newton_clamped": int(total_clamped),
+        "sweeps": int(sweeps),
+        "next_n": int(start_n + cursor * step),
+        "certification": cert,
+        "autotune": tuning,
+        "metrics": stage_metrics(stage_stats),
     }
 
 
@@ -817,7 +1161,110 @@ if __name__ == "__main__":
     parser.add_argument("--util-interval-sec", type=float, default=0.1, help="Seconds between util samples (default 0.1).")
     parser.add_argument("--log-interval-sec", type=float, default=10.0, help="Seconds between log lines in duration run (default 10).")
     parser.add_argument("--max-sleep-sec", type=float, default=2.0, help="(Unused when cap is by batch-size; kept for compatibility.)")
+    parser.add_argument(
+        "--sweep",
+        choices=list(SWEEPS),
+        default="repeat",
+        help="Duration mode: 'repeat' (run start_n..end_n over and over, default) or 'frontier' (each run takes the next block of new indices from start_n upward).",
+    )
+    parser.add_argument(
+        "--sweep-chunk",
+        type=int,
+        default=0,
+        help="Duration mode: indices per run (0 = size of start_n..end_n). 'repeat' advances through the range and wraps; 'frontier' uses it as the block size.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default="",
+        help="Duration mode: checkpoint file (default OUTPUT.ckpt.json).",
+    )
+    parser.add_argument(
+        "--checkpoint-interval-sec",
+        type=float,
+        default=60.0,
+        help="Seconds between checkpoints in duration mode (default 60).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Duration mode: continue from the checkpoint (cursor, counters, output offset); --duration is the total including time already run.",
+    )
+    parser.add_argument(
+        "--certify-fraction",
+        type=float,
+        default=0.0,
+        help="Duration mode: certify a stratified sample of predictions with mpmath.zetazero on this fraction of the cores (at least one process) in the background; 0 disables (default).",
+    )
+    parser.add_argument(
+        "--certify-strata",
+        type=int,
+        default=1,
+        help="Samples drawn per batch (one per height stratum) for --certify-fraction (default 1).",
+    )
+    parser.add_argument(
+        "--method",
+        choices=sorted(EVALUATORS),
+        default="chaos",
+        help="Z evaluator for refinement: 'chaos' (fixed 20-term sum, default), 'riemann_siegel' (full formula, N = floor(sqrt(t/2pi))) or 'odlyzko_schonhage' (full formula via cached grids).",
+    )
+    parser.add_argument(
+        "--isolation",
+        choices=["gram", "window"],
+        default=None,
+        help="Zero isolation before refinement: 'window' (clamp to prediction +/- 0.5; default for --method chaos/chaos_dd) or 'gram' (Gram-block sign-change brackets; default for riemann_siegel/odlyzko_schonhage and with --precision mixed).",
+    )
+    parser.add_argument(
+        "--micro",
+        choices=["theory", "chained"],
+        default="theory",
+        help="Micro step: 'theory' (theoretical previous zero, fully parallel, default) or 'chained' (sequential previous-prediction recurrence of 13/14, reproduced in batches).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"Shard batches across this many CPU processes (NumPy backend only; 0 = all cores, {default_workers()} here). Default 1.",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=list(PRECISIONS),
+        default="float64",
+        help="Arithmetic: 'float64' (default) or 'mixed' (float32 macro/micro, Gram scans and first Newton steps with float64 polish; needs --method chaos and Gram isolation, window isolation is rejected).",
+    )
+    parser.add_argument(
+        "--compare-f64",
+        action="store_true",
+        help="With --precision mixed (single run): also run the float64 path and print accuracy/time side by side.",
+    )
+    parser.add_argument(
+        "--sink",
+        type=str,
+        default="",
+        help="Stream per-zero rows into memory-mapped .npy columns in this directory instead of keeping them in RAM (single and duration runs; read while running with zero_engine.read_sink).",
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help="NumPy backend: use the batch size and chaos block size tuned for this host (probed once and stored, see --autotune-file); duration runs re-probe when throughput drifts. Overrides --batch-size.",
+    )
+    parser.add_argument("--autotune-force", action="store_true", help="With --autotune: probe again even if a stored tuning exists.")
+    parser.add_argument(
+        "--autotune-file",
+        type=str,
+        default="",
+        help="Tuning store for --autotune (default $ZERO_ENGINE_AUTOTUNE or ~/.cache/zero_engine/autotune.json).",
+    )
+    parser.add_argument(
+        "--trace-alloc",
+        action="store_true",
+        help="Duration mode: trace allocations (alloc_b/zero) in the first run of every log interval (about 2x slower; left out of ms/zero).",
+    )
     args = parser.parse_args()
+    args.isolation = args.isolation or default_isolation(args.method, args.precision)
+    if args.precision == "mixed" and (args.method != "chaos" or args.isolation != "gram"):
+        parser.error("--precision mixed needs --method chaos and --isolation gram (window-mode roots depend on their start)")
+    workers = args.workers if args.workers > 0 else default_workers()
 
     if not _CUPY_AVAILABLE:
         print("CuPy not found. Install with: pip install cupy-cuda12x")
@@ -825,10 +1272,15 @@ if __name__ == "__main__":
 
     if args.duration > 0:
         duration_sec = int(args.duration)
+        if args.resume and not (args.output or args.checkpoint):
+            parser.error("--resume needs --output or --checkpoint to locate the checkpoint")
         if args.output:
             output_path = args.output
+        elif args.resume:
+            output_path = ""  # taken from the checkpoint
         else:
             output_path = f"06_docs/gpu_scalability_3h_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.txt"
+        checkpoint_path = args.checkpoint or f"{output_path}.ckpt.json"
         run_for_duration(
             duration_sec,
             output_path,
@@ -845,18 +1297,64 @@ if __name__ == "__main__":
             util_interval_sec=args.util_interval_sec,
             log_interval_sec=args.log_interval_sec,
             max_sleep_sec=args.max_sleep_sec,
+            method=args.method,
+            isolation=args.isolation,
+            micro=args.micro,
+            workers=workers,
+            precision=args.precision,
+            sweep=args.sweep,
+            sweep_chunk=args.sweep_chunk,
+            checkpoint_path=checkpoint_path,
+            checkpoint_interval_sec=args.checkpoint_interval_sec,
+            resume=args.resume,
+            sink_dir=args.sink or None,
+            certify_fraction=args.certify_fraction,
+            certify_strata=args.certify_strata,
+            tune=args.autotune,
+            tune_force=args.autotune_force,
+            tune_path=args.autotune_file or None,
+            trace_alloc=args.trace_alloc,
         )
     else:
+        batch_size = args.batch_size
+        pool = None
+        if args.autotune and not _CUPY_AVAILABLE:
+            # Tune through the pool the run will use
+            pool = ShardPool(workers) if workers > 1 else None
+            tuning = autotune(
+                n_start=args.start_n, step=args.step, method=args.method, isolation=args.isolation, precision=args.precision,
+                path=args.autotune_file or None, force=args.autotune_force, log=print, pool=pool,
+            )
+            batch_size = tuning["batch_size"]
+            print(
+                f"Autotune ({tuning['source']}, {tuning['kernel']}, {tuning['workers']} workers): "
+                f"batch={batch_size} block_bytes={tuning['block_bytes']}\n"
+            )
+        sink = NpySink(args.sink) if args.sink else None
         results = test_scalability_gpu(
             start_n=args.start_n,
             end_n=args.end_n,
             step=args.step,
-            batch_size=args.batch_size,
+            batch_size=batch_size,
             use_gpu=True,
             use_dynamic_memory=not args.no_dynamic_memory,
             reserve_ratio=args.reserve_ratio,
             double_buffer=args.double_buffer,
             streams=args.streams,
+            method=args.method,
+            isolation=args.isolation,
+            micro=args.micro,
+            workers=workers,
+            pool=pool,
+            precision=args.precision,
+            compare_f64=args.compare_f64,
+            collect_results=sink is None,
+            sink=sink,
         )
+        if pool is not None:
+            pool.close()
+        if sink is not None:
+            sink.close()
+            print(f"Per-zero rows ({sink.rows}) written to {args.sink}/*.npy")
         print("\n" + "=" * 60)
         print("GPU scalability test completed.")
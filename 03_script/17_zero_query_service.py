@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Local zero-query service with request coalescing.
+
+Serves small, scattered queries ("zero #n", "zeros n..n+k") over HTTP on a local
+TCP port or a Unix socket. Concurrent requests arriving within a short window
+are answered by one vectorized predict_zero_three_step_batched call
+(zero_engine.ZeroQueryCoalescer) and fanned back out.
+
+Endpoints (GET, JSON responses):
+  /zero/N                  -> {"n": N, "t": ...}
+  /zeros?start=N&count=K   -> {"start": N, "count": K, "t": [...]}
+  /metrics                 -> request latency p50/p99 and batch-fill counters
+Errors are JSON {"error": ...}: 400 for bad parameters, 404 for unknown paths,
+500 when the predictor itself fails.
+
+CLI: --host/--port or --unix PATH, --window-ms, --max-batch,
+     --load-test REQUESTS  (in-process load without a socket; prints metrics and exits)
+
+Example:
+  python 03_script/17_zero_query_service.py --port 8765 &
+  curl 'http://127.0.0.1:8765/zeros?start=1000000&count=5'
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from zero_engine import EVALUATORS, PRECISIONS, ZeroQueryCoalescer
+
+# Largest range a single request may ask for.
+MAX_QUERY_COUNT = 100_000
+
+
+async def handle_path(coalescer, target):
+    """(status, payload) for one request target."""
+    url = urlsplit(target)
+    parts = [p for p in url.path.split("/") if p]
+    try:
+        if parts == ["metrics"]:
+            return 200, coalescer.metrics()
+        if len(parts) == 2 and parts[0] == "zero":
+            n = int(parts[1])
+            t = await coalescer.query(n, 1)
+            return 200, {"n": n, "t": float(t[0])}
+        if parts == ["zeros"]:
+            query = parse_qs(url.query)
+            start = int(query["start"][0])
+            count = int(query.get("count", ["1"])[0])
+            if count > MAX_QUERY_COUNT:
+                return 400, {"error": f"count > {MAX_QUERY_COUNT}"}
+            t = await coalescer.query(start, count)
+            return 200, {"start": start, "count": count, "t": t.tolist()}
+    except (KeyError, ValueError) as exc:
+        return 400, {"error": str(exc)}
+    except Exception as exc:
+        # Predictor / backend failures (e.g. an extreme index) still get a response
+        return 500, {"error": f"{type(exc).__name__}: {exc}"}
+    return 404, {"error": f"unknown path {url.path}"}
+
+
+def make_handler(coalescer):
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin1").split(" ", 2)
+                keep_alive = True
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin1").partition(":")
+                    if name.strip().lower() == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+                if method != "GET":
+                    status, payload = 405, {"error": "only GET is supported"}
+                else:
+                    status, payload = await handle_path(coalescer, target)
+                body = json.dumps(payload).encode()
+                reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}[status]
+                writer.write(
+                    f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(args, coalescer):
+    handler = make_handler(coalescer)
+    if args.unix:
+        server = await asyncio.start_unix_server(handler, path=args.unix)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(handler, host=args.host, port=args.port)
+        where = f"http://{args.host}:{args.port}"
+    print(f"Zero query service on {where} (window {args.window_ms:.1f} ms, max batch {args.max_batch})", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+async def load_test(coalescer, requests, clients, max_n, range_fraction, seed=0):
+    """Scattered single/range queries from concurrent in-process clients; returns wall seconds."""
+    rng = np.random.default_rng(seed)
+    per_client = -(-requests // clients)
+
+    async def client(c):
+        for _ in range(per_client):
+            n = int(rng.integers(1, max_n))
+            count = int(rng.integers(2, 64)) if rng.random() < range_fraction else 1
+            await coalescer.query(n, count)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(clients)))
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local zero-query service with request coalescing.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address (default 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default 8765).")
+    parser.add_argument("--unix", type=str, default="", help="Serve on this Unix socket path instead of TCP.")
+    parser.add_argument("--window-ms", type=float, default=2.0, help="Coalescing window in ms (default 2).")
+    parser.add_argument("--max-batch", type=int, default=1 << 16, help="Pending zeros that close a batch early (default 65536).")
+    parser.add_argument("--method", choices=sorted(EVALUATORS), default="chaos", help="Z evaluator (default chaos).")
+    parser.add_argument("--isolation", choices=["gram", "window"], default=None, help="Zero isolation (default gram for riemann_siegel/odlyzko_schonhage or --precision mixed, else window).")
+    parser.add_argument("--precision", choices=list(PRECISIONS), default="float64", help="Arithmetic (default float64; mixed needs chaos + gram).")
+    parser.add_argument("--load-test", type=int, default=0, help="Run this many in-process queries instead of serving, then print metrics.")
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent clients for --load-test (default 64).")
+    parser.add_argument("--max-n", type=int, default=10_000_000, help="Largest index queried by --load-test (default 1e7).")
+    args = parser.parse_args()
+    if args.precision == "mixed" and (args.method != "chaos" or args.isolation == "window"):
+        parser.error("--precision mixed needs --method chaos and Gram isolation (window-mode roots depend on their start)")
+
+    coalescer = ZeroQueryCoalescer(
+        window_sec=args.window_ms / 1000,
+        max_batch=args.max_batch,
+        method=args.method,
+        isolation=args.isolation,
+        precision=args.precision,
+    )
+    if args.load_test > 0:
+        wall = asyncio.run(load_test(coalescer, args.load_test, args.clients, args.max_n, range_fraction=0.2))
+        m = coalescer.metrics()
+        print(f"Load test: {m['requests']} requests from {args.clients} clients in {wall:.2f} s ({m['requests'] / wall:.0f} req/s)")
+        print(f"  Latency: p50 {m['latency_p50_ms']:.2f} ms  p99 {m['latency_p99_ms']:.2f} ms")
+        print(f"  Batches: {m['batches']}  requests/batch {m['requests_per_batch']:.1f}  zeros/batch {m['zeros_per_batch']:.1f}  fill {m['batch_fill'] * 100:.2f}%")
+        print(f"  Helper indices: {m['helper_fraction'] * 100:.1f}% of computed  compute {m['compute_sec']:.2f} s")
+    else:
+        try:
+            asyncio.run(serve(args, coalescer))
+        except KeyboardInterrupt:
+            pass
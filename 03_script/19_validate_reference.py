@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Validate predicted zeros against a reference zero table.
+
+The "error" of 13 and 16 is the distance to the smooth N(T) inverse, not to the
+true zero. This script measures the distance to true zeros from a reference
+table in the common one-zero-per-line text format (e.g. Odlyzko's tables).
+
+The table is parsed once, in parallel, into a memory-mapped binary cache
+(zero_engine.ingest_reference). Predictions are then joined with it on the zero
+index chunk by chunk, and absolute / relative error quantiles are accumulated in
+streaming histograms, so neither side is loaded into RAM.
+
+Predictions come from either:
+  --sink DIR                 per-zero columns of 16 --sink (n, prediction) or 18 --sink (n, t)
+  --start-n A --end-n B      computed here with predict_zeros in contiguous chunks
+
+Example:
+  python 03_script/19_validate_reference.py --reference zeros1.txt --first-index 1 \\
+      --cache /tmp/zeros1_cache --start-n 1 --end-n 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from zero_engine import (
+    EVALUATORS,
+    PRECISIONS,
+    ingest_reference,
+    iter_column_chunks,
+    predict_zero_three_step_batched,
+    read_sink,
+    validate_chunks,
+)
+
+# Zeros predicted per chunk with --start-n/--end-n.
+PREDICT_CHUNK = 1 << 16
+
+
+def iter_predicted(start_n, end_n, chunk=PREDICT_CHUNK, stats=None, **predict_kwargs):
+    """(n, t) chunks of the batched predictor over start_n..end_n; stats collects its clamped/unbracketed counts."""
+    for a in range(int(start_n), int(end_n) + 1, chunk):
+        n = np.arange(a, min(a + chunk, int(end_n) + 1))
+        yield n, predict_zero_three_step_batched(n.astype(float), xp=np, stats=stats, **predict_kwargs)
+
+
+def print_report(stats, elapsed, predict_stats=None):
+    print("=" * 60)
+    print("VALIDATION AGAINST REFERENCE ZEROS")
+    print("=" * 60)
+    print(f"Matched zeros: {stats['matched']}  (outside the reference: {stats['unmatched']})  in {elapsed:.2f} s")
+    for key, label in (("abs", "Absolute error |t - t_ref|"), ("rel", "Relative error |t - t_ref| / t_ref")):
+        s = stats[key].summary()
+        print(f"\n{label}:")
+        print("  " + "  ".join(f"{k}: {v:.3e}" for k, v in s.items()))
+    if predict_stats:
+        print("\nPredictor:")
+        print(f"  Clamped at search window: {predict_stats.get('newton_clamped', 0)}  (left at micro prediction +/- 0.5, not a root)")
+        if "unbracketed" in predict_stats:
+            print(f"  Unbracketed by Gram isolation: {predict_stats['unbracketed']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate predicted zeros against a reference zero table.")
+    parser.add_argument("--reference", type=str, required=True, help="Text table, one zero height per line.")
+    parser.add_argument("--first-index", type=int, default=1, help="Zero index of the first line (default 1).")
+    parser.add_argument("--cache", type=str, default="", help="Binary cache directory (default REFERENCE.cache).")
+    parser.add_argument("--workers", type=int, default=0, help="Parse processes (0 = all cores).")
+    parser.add_argument("--sink", type=str, default="", help="Validate the per-zero columns in this sink directory.")
+    parser.add_argument("--column", type=str, default="", help="Height column of --sink (default 'prediction', else 't').")
+    parser.add_argument("--start-n", type=int, default=0, help="Predict from this index (with --end-n).")
+    parser.add_argument("--end-n", type=int, default=0, help="Predict up to this index.")
+    parser.add_argument("--method", choices=sorted(EVALUATORS), default="chaos", help="Z evaluator for --start-n/--end-n (default chaos).")
+    parser.add_argument("--isolation", choices=["gram", "window"], default=None, help="Zero isolation (default gram for riemann_siegel/odlyzko_schonhage or --precision mixed, else window).")
+    parser.add_argument("--precision", choices=list(PRECISIONS), default="float64", help="Arithmetic (default float64; mixed needs chaos + gram).")
+    args = parser.parse_args()
+    if args.precision == "mixed" and (args.method != "chaos" or args.isolation == "window"):
+        parser.error("--precision mixed needs --method chaos and Gram isolation (window-mode roots depend on their start)")
+
+    start = time.perf_counter()
+    reference = ingest_reference(args.reference, args.cache or f"{args.reference}.cache", args.first_index, args.workers or None)
+    print(f"Reference: {reference[1].shape[0]} zeros from index {reference[0]} ({time.perf_counter() - start:.2f} s to open/ingest)")
+
+    start = time.perf_counter()
+    predict_stats = {}
+    if args.sink:
+        columns = read_sink(args.sink)
+        column = args.column or ("prediction" if "prediction" in columns else "t")
+        chunks = iter_column_chunks(columns["n"], columns[column])
+    elif args.end_n >= args.start_n > 0:
+        chunks = iter_predicted(
+            args.start_n, args.end_n, stats=predict_stats, method=args.method, isolation=args.isolation, precision=args.precision
+        )
+    else:
+        parser.error("give --sink DIR or --start-n/--end-n")
+    stats = validate_chunks(chunks, reference)
+    print_report(stats, time.perf_counter() - start, predict_stats)
@@ -0,0 +1,180 @@
+"""
+Zero engine: importable, vectorized Riemann zeta zero predictor.
+
+Shared by the demo scripts (07, 09, 10), the scalability and benchmark scripts
+(13, 14, 16) and the figure generator (15). Importing it has no plotting side
+effects. Scripts in 03_script/ import it directly (`import zero_engine`).
+"""
+
+from .tuning import (
+    ThroughputMonitor,
+    autotune,
+    default_autotune_path,
+    host_key,
+    kernel_key,
+    load_tuning,
+    measure_throughput,
+    save_tuning,
+)
+from .backend import CPU_KERNEL_ENABLED, CUPY_AVAILABLE, NUMBA_AVAILABLE, get_array_module, is_cupy, to_numpy
+from .bench import (
+    BENCH_ALPHA,
+    BENCH_MIN_CHANGE,
+    BENCH_REPEATS,
+    BENCH_VERSION,
+    BENCH_WARMUP,
+    compare_results,
+    host_metadata,
+    load_results,
+    mann_whitney_p,
+    run_suite,
+    save_results,
+    summarize,
+    time_case,
+)
+from .cache import CACHE_VERSION, ZeroCache
+from .certify import MPMATH_AVAILABLE, CertificationSampler, certify_workers
+from .core import (
+    EVALUATORS,
+    GRAM_METHODS,
+    PRECISIONS,
+    STAGES,
+    Z,
+    affine_prefix_scan,
+    batched_chaos_refinement,
+    batched_macro,
+    batched_micro,
+    chaos_refinement_float32,
+    chaos_wave_eval,
+    chaos_z_float32,
+    default_isolation,
+    get_evaluator,
+    inverse_N,
+    isolate_zeros,
+    lambert_w0,
+    merge_histogram,
+    predict_zero_three_step,
+    predict_zero_three_step_batched,
+    predict_zeros,
+    predict_zeros_chained,
+    refine_isolated,
+    riemann_n_formula,
+    riemann_n_formula_derivative,
+    riemann_siegel_theta,
+    riemann_siegel_theta_derivative,
+    set_chaos_block_bytes,
+    stage_metrics,
+    theta,
+)
+from .ddphase import DD_LOG_TABLE, dd_log, phase_dd, reduce_2pi, theta_dd, two_prod, two_sum
+from .discovery import good_gram_index, iter_zeros_in_interval, scan_segment, zeros_in_interval
+from .gram import gram_brackets, gram_points
+from .multieval import ZGrid, clear_grid_cache, multi_eval, nufft_type1
+from .parallel import ShardPool, default_workers, merge_refine_stats
+from .reference import ErrorHistogram, ingest_reference, iter_column_chunks, open_reference, validate_chunks
+from .riemann_siegel import main_sum_length, riemann_siegel_eval, rs_remainder, theta_stirling
+from .service import ZeroQueryCoalescer, coalesce_indices
+from .sink import RESULT_DTYPE, NpySink, read_sink, result_rows
+from .stream import ITER_CHUNK, iter_zeros
+
+__all__ = [
+    "BENCH_ALPHA",
+    "BENCH_MIN_CHANGE",
+    "BENCH_REPEATS",
+    "BENCH_VERSION",
+    "BENCH_WARMUP",
+    "CACHE_VERSION",
+    "CPU_KERNEL_ENABLED",
+    "CUPY_AVAILABLE",
+    "CertificationSampler",
+    "DD_LOG_TABLE",
+    "EVALUATORS",
+    "GRAM_METHODS",
+    "ErrorHistogram",
+    "ITER_CHUNK",
+    "MPMATH_AVAILABLE",
+    "NUMBA_AVAILABLE",
+    "NpySink",
+    "PRECISIONS",
+    "RESULT_DTYPE",
+    "STAGES",
+    "ShardPool",
+    "ThroughputMonitor",
+    "Z",
+    "ZGrid",
+    "ZeroCache",
+    "ZeroQueryCoalescer",
+    "affine_prefix_scan",
+    "autotune",
+    "batched_chaos_refinement",
+    "batched_macro",
+    "batched_micro",
+    "certify_workers",
+    "chaos_refinement_float32",
+    "chaos_wave_eval",
+    "chaos_z_float32",
+    "clear_grid_cache",
+    "coalesce_indices",
+    "compare_results",
+    "dd_log",
+    "default_autotune_path",
+    "default_isolation",
+    "default_workers",
+    "get_array_module",
+    "get_evaluator",
+    "good_gram_index",
+    "gram_brackets",
+    "gram_points",
+    "host_key",
+    "host_metadata",
+    "ingest_reference",
+    "inverse_N",
+    "is_cupy",
+    "isolate_zeros",
+    "iter_column_chunks",
+    "iter_zeros",
+    "iter_zeros_in_interval",
+    "kernel_key",
+    "lambert_w0",
+    "load_results",
+    "load_tuning",
+    "main_sum_length",
+    "mann_whitney_p",
+    "measure_throughput",
+    "merge_histogram",
+    "merge_refine_stats",
+    "multi_eval",
+    "nufft_type1",
+    "open_reference",
+    "phase_dd",
+    "predict_zero_three_step",
+    "predict_zero_three_step_batched",
+    "predict_zeros",
+    "predict_zeros_chained",
+    "read_sink",
+    "reduce_2pi",
+    "refine_isolated",
+    "result_rows",
+    "riemann_n_formula",
+    "riemann_n_formula_derivative",
+    "riemann_siegel_eval",
+    "riemann_siegel_theta",
+    "riemann_siegel_theta_derivative",
+    "rs_remainder",
+    "run_suite",
+    "save_results",
+    "save_tuning",
+    "scan_segment",
+    "set_chaos_block_bytes",
+    "stage_metrics",
+    "summarize",
+    "theta",
+    "theta_dd",
+    "theta_stirling",
+    "time_case",
+    "to_numpy",
+    "two_prod",
+    "two_sum",
+    "validate_chunks",
+    "zeros_in_interval",
+]
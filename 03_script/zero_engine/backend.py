@@ -0,0 +1,176 @@
+"""
+Array backend selection for the zero engine.
+
+CuPy (GPU) is used when installed and requested; otherwise NumPy (CPU).
+Also holds the fused CUDA kernel for the chaos wave and its derivative, and its
+optional multithreaded CPU twin compiled with Numba. The twin is used when Numba
+runs more than one thread (on one core the blocked NumPy evaluator is about 2x
+faster); ZERO_ENGINE_CPU_KERNEL=0 forces the plain NumPy path and =1 the kernel.
+"""
+
+import multiprocessing
+import os
+
+import numpy as np
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+    cp = None
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    numba = None
+
+# Fused CPU kernel enabled (Numba installed with more than one thread, or forced by the environment).
+_CPU_KERNEL_ENV = os.environ.get("ZERO_ENGINE_CPU_KERNEL", "")
+CPU_KERNEL_ENABLED = (
+    NUMBA_AVAILABLE
+    and _CPU_KERNEL_ENV != "0"
+    and (_CPU_KERNEL_ENV == "1" or numba.config.NUMBA_NUM_THREADS > 1)
+)
+
+
+def pool_context():
+    """
+    multiprocessing context of every worker pool ("spawn").
+
+    A process forked after the threaded Numba kernel has run in the parent can
+    leave the interpreter hung at exit, so pools start fresh interpreters.
+    """
+    return multiprocessing.get_context("spawn")
+
+
+def get_array_module(use_gpu=True):
+    """Return CuPy or NumPy depending on availability and flag."""
+    if use_gpu and CUPY_AVAILABLE:
+        return cp
+    return np
+
+
+def is_cupy(xp):
+    """True if xp is the CuPy module."""
+    return xp.__name__ == "cupy"
+
+
+def to_numpy(a):
+    """Copy a CuPy array to host; NumPy arrays and scalars pass through."""
+    if CUPY_AVAILABLE and isinstance(a, cp.ndarray):
+        return cp.asnumpy(a)
+    return np.asarray(a)
+
+
+_CHAOS_KERNEL_CACHE = {}
+
+
+def _get_chaos_tables_cupy(n_cutoff, dtype):
+    """Precompute log(n) and 1/sqrt(n) for chaos kernel (CuPy only)."""
+    n_vec = cp.arange(1, n_cutoff + 1, dtype=dtype)
+    log_n = cp.log(n_vec)
+    inv_sqrt_n = 1.0 / cp.sqrt(n_vec)
+    return log_n, inv_sqrt_n
+
+
+def get_chaos_kernel_and_tables(n_cutoff, dtype):
+    """
+    Return (raw_kernel, log_n, inv_sqrt_n) for given n_cutoff and dtype.
+    Kernel computes both chaos wave value and derivative in one launch:
+      out_f[i]  = 2 * sum cos(theta - t*log(n))/sqrt(n)
+      out_fp[i] = 2 * sum -sin(arg)*(d_theta - log(n))/sqrt(n)
+    """
+    if not CUPY_AVAILABLE:
+        return None, None, None
+    dev = int(cp.cuda.runtime.getDevice())
+    key = (dev, int(n_cutoff), str(np.dtype(dtype)))
+    cached = _CHAOS_KERNEL_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    # Note: we pass log_n and inv_sqrt_n arrays to avoid recomputing log/sqrt in-kernel.
+    code = r"""
+    extern "C" __global__
+    void chaos_eval(const double* t, const double* log_n, const double* inv_sqrt_n,
+                    const int n_cutoff, double* out_f, double* out_fp, const int n) {
+        int i = (int)(blockDim.x * blockIdx.x + threadIdx.x);
+        if (i >= n) return;
+        double ti = t[i];
+        // theta(t) = (t/2) * log(t/(2*pi)) - (t/2) - pi/8
+        // dtheta/dt = 0.5 * log(t/(2*pi))
+        const double two_pi = 6.283185307179586476925286766559;
+        double log_term = log(ti / two_pi);
+        double theta = 0.5 * ti * log_term - 0.5 * ti - 0.39269908169872415480783042290993786; // pi/8
+        double d_theta = 0.5 * log_term;
+
+        double acc_f = 0.0;
+        double acc_fp = 0.0;
+        #pragma unroll
+        for (int j = 0; j < n_cutoff; ++j) {
+            double ln = log_n[j];
+            double invs = inv_sqrt_n[j];
+            double arg = theta - ti * ln;
+            double c = cos(arg);
+            double s = sin(arg);
+            acc_f += c * invs;
+            acc_fp += (-s) * (d_theta - ln) * invs;
+        }
+        out_f[i] = 2.0 * acc_f;
+        out_fp[i] = 2.0 * acc_fp;
+    }
+    """
+    kernel = cp.RawKernel(code, "chaos_eval", options=("--std=c++14",), backend="nvrtc")
+    log_n, inv_sqrt_n = _get_chaos_tables_cupy(n_cutoff=n_cutoff, dtype=np.float64)
+    out = (kernel, log_n, inv_sqrt_n)
+    _CHAOS_KERNEL_CACHE[key] = out
+    return out
+
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(parallel=True, cache=True)
+    def _chaos_eval_cpu(t, log_n, inv_sqrt_n, out_f, out_fp):
+        """CPU twin of the chaos_eval CUDA kernel: one fused loop per element, threads over t."""
+        two_pi = 6.283185307179586
+        for i in numba.prange(t.shape[0]):
+            ti = t[i]
+            log_term = np.log(ti / two_pi)
+            theta = 0.5 * ti * log_term - 0.5 * ti - 0.39269908169872414  # pi/8
+            d_theta = 0.5 * log_term
+            acc_f = 0.0
+            acc_fp = 0.0
+            for j in range(log_n.shape[0]):
+                ln = log_n[j]
+                invs = inv_sqrt_n[j]
+                arg = theta - ti * ln
+                acc_f += np.cos(arg) * invs
+                acc_fp += -np.sin(arg) * (d_theta - ln) * invs
+            out_f[i] = 2.0 * acc_f
+            out_fp[i] = 2.0 * acc_fp
+
+else:
+    _chaos_eval_cpu = None
+
+
+_CPU_TABLES = {}
+
+
+def get_chaos_cpu_kernel_and_tables(n_cutoff):
+    """
+    Return (kernel, log_n, inv_sqrt_n) for the fused CPU chaos kernel, or
+    (None, None, None) when the kernel is not enabled (CPU_KERNEL_ENABLED).
+    kernel(t, log_n, inv_sqrt_n, out_f, out_fp) fills out_f / out_fp in place
+    without any (N, n_cutoff) temporaries; it is compiled on first use.
+    """
+    if not CPU_KERNEL_ENABLED:
+        return None, None, None
+    tables = _CPU_TABLES.get(int(n_cutoff))
+    if tables is None:
+        n_vec = np.arange(1, n_cutoff + 1, dtype=np.float64)
+        tables = (np.log(n_vec), 1.0 / np.sqrt(n_vec))
+        _CPU_TABLES[int(n_cutoff)] = tables
+    return _chaos_eval_cpu, tables[0], tables[1]
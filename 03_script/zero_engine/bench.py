@@ -0,0 +1,196 @@
+"""
+Reproducible benchmark harness (used by 14_benchmark_comparison.py and the figures).
+
+Every case is a callable timed with time.perf_counter after `warmup` untimed
+calls, over `repeats` trials; a trial times enough calls to last at least
+BENCH_MIN_TRIAL_SEC, and the sample is the time per unit of work (ms per zero,
+or per evaluated point for the primitives). Results are a JSON document with
+the raw samples, summary statistics and host metadata (CPU, cores, Python /
+NumPy versions, optional backends, git commit), so two runs can be compared
+later on.
+
+compare_results flags a case as a regression when its samples are slower with a
+two-sided Mann-Whitney U test below `alpha` (normal approximation, ties
+corrected) and the median moved by more than `min_change`; the rank test does
+not assume normally distributed timings, and the threshold keeps tiny but
+significant shifts from being reported.
+"""
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from .backend import CPU_KERNEL_ENABLED, CUPY_AVAILABLE, NUMBA_AVAILABLE
+from .parallel import default_workers
+
+BENCH_VERSION = 1
+BENCH_WARMUP = 2
+BENCH_REPEATS = 15
+# Minimum seconds per timed trial (fast cases repeat their call inside one trial).
+BENCH_MIN_TRIAL_SEC = 0.02
+# compare_results: significance level and smallest relative median change reported.
+BENCH_ALPHA = 0.01
+BENCH_MIN_CHANGE = 0.05
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def host_metadata():
+    """Machine and software description stored with every result file."""
+    meta = {
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpus": default_workers(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "numba": NUMBA_AVAILABLE,
+        "cpu_kernel": CPU_KERNEL_ENABLED,
+        "cupy": CUPY_AVAILABLE,
+        "git_commit": _git_commit(),
+    }
+    try:
+        import mpmath
+        meta["mpmath"] = mpmath.__version__
+    except ImportError:
+        meta["mpmath"] = None
+    return meta
+
+
+def time_case(fn, units=1, warmup=BENCH_WARMUP, repeats=BENCH_REPEATS, min_trial_sec=BENCH_MIN_TRIAL_SEC):
+    """
+    Samples (ms per unit) of fn() over `repeats` trials after `warmup` calls.
+
+    units: work done by one call (zeros or points); each trial repeats the call
+    until it has run for at least min_trial_sec.
+    """
+    for _ in range(int(warmup)):
+        fn()
+    samples = []
+    for _ in range(int(repeats)):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_trial_sec:
+                break
+        samples.append(elapsed * 1000.0 / (calls * units))
+    return samples
+
+
+def summarize(samples):
+    """Median, mean, sample std, min, max and the interquartile range of timing samples."""
+    a = np.asarray(samples, dtype=float)
+    q1, median, q3 = np.percentile(a, [25, 50, 75])
+    return {
+        "n": int(a.size),
+        "median": float(median),
+        "mean": float(a.mean()),
+        "std": float(a.std(ddof=1)) if a.size > 1 else 0.0,
+        "min": float(a.min()),
+        "max": float(a.max()),
+        "iqr": float(q3 - q1),
+    }
+
+
+def run_suite(cases, warmup=BENCH_WARMUP, repeats=BENCH_REPEATS, min_trial_sec=BENCH_MIN_TRIAL_SEC, config=None, log=None):
+    """
+    Time every case and return the result document.
+
+    cases: iterable of (name, fn, units, unit, params); unit is a label such as
+    "ms/zero", params a JSON-able dict describing the case (e.g. {"n": 1000}).
+    log: optional callable receiving one line per finished case.
+    """
+    results = {}
+    for name, fn, units, unit, params in cases:
+        samples = time_case(fn, units, warmup, repeats, min_trial_sec)
+        results[name] = dict(summarize(samples), unit=unit, params=params, samples=samples)
+        if log is not None:
+            s = results[name]
+            log(f"  {name:<40} {s['median']:>12.6f} {unit}  (IQR {s['iqr']:.6f}, n={s['n']})")
+    return {
+        "version": BENCH_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H%M%SZ", time.gmtime()),
+        "host": host_metadata(),
+        "config": dict(config or {}, warmup=int(warmup), repeats=int(repeats), min_trial_sec=float(min_trial_sec)),
+        "cases": results,
+    }
+
+
+def save_results(doc, path):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=1)
+    os.replace(tmp, path)
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    if doc.get("version") != BENCH_VERSION:
+        raise ValueError(f"Unsupported benchmark file version in {path}: {doc.get('version')}")
+    return doc
+
+
+def mann_whitney_p(a, b):
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation with tie correction)."""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n1, n2 = a.size, b.size
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    values = np.concatenate([a, b])
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(values.size)
+    ranks[order] = np.arange(1, values.size + 1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    # average ranks over ties
+    sums = np.bincount(inverse, weights=ranks)
+    ranks = (sums / counts)[inverse]
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    var = n1 * n2 / 12.0 * ((n + 1) - (counts ** 3 - counts).sum() / (n * (n - 1)))
+    if var <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2.0) - 0.5) / math.sqrt(var)
+    return float(math.erfc(max(z, 0.0) / math.sqrt(2.0)))
+
+
+def compare_results(base, new, alpha=BENCH_ALPHA, min_change=BENCH_MIN_CHANGE):
+    """
+    Per-case comparison of two result documents (cases present in both).
+
+    Returns a list of {"case", "unit", "base", "new", "change", "p", "status"}, where
+    change is the relative change of the median (positive = slower) and status is
+    "regression", "improvement" or "same".
+    """
+    rows = []
+    for name, b in base["cases"].items():
+        c = new["cases"].get(name)
+        if c is None:
+            continue
+        change = c["median"] / b["median"] - 1.0 if b["median"] > 0 else 0.0
+        p = mann_whitney_p(b["samples"], c["samples"])
+        status = "same"
+        if p < alpha and abs(change) > min_change:
+            status = "regression" if change > 0 else "improvement"
+        rows.append({"case": name, "unit": b["unit"], "base": b["median"], "new": c["median"], "change": change, "p": p, "status": status})
+    return rows
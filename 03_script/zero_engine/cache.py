@@ -0,0 +1,155 @@
+"""
+Persistent on-disk cache of predicted zeros, with an in-memory LRU of chunks.
+
+Predictions of predict_zeros are stored in chunk files of CACHE_CHUNK indices:
+chunk k holds n in [k * CACHE_CHUNK, (k + 1) * CACHE_CHUNK) as one float64
+.npy array, NaN where the zero has not been computed yet. The directory of a
+chunk encodes everything the values depend on: stiffness, n_cutoff, method,
+isolation, precision and CACHE_VERSION (bump it whenever the predictor's
+numerics change, so stale files are never served).
+
+The batched micro step takes the previous array element as the previous zero,
+so a cached value is defined as predict_zeros over a contiguous index range.
+ZeroCache.predict(n_array) looks every index up and computes only the missing
+subranges (runs of consecutive indices, gaps up to CACHE_GAP merged so that
+scattered queries do not turn into many tiny batches), writes the touched
+chunks back (temporary file + os.replace) and gathers the answer. Values
+agree with one predict_zeros call over the whole range to the macro solver
+tolerance (~1e-11; the first index of a run gets no neighbour correction).
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from .backend import to_numpy
+from .core import EVALUATORS, PRECISIONS, default_isolation, predict_zeros
+
+# Algorithm version of cached values (part of the cache key).
+CACHE_VERSION = 1
+# Zero indices per chunk file.
+CACHE_CHUNK = 1 << 16
+# Chunks kept in memory (least recently used are dropped first).
+CACHE_LRU_CHUNKS = 16
+# Missing indices closer than this are computed as one contiguous run.
+CACHE_GAP = 64
+
+
+class ZeroCache:
+    """
+    Cache in front of predict_zeros for one parameter set.
+
+    directory: cache root (one subdirectory per parameter set is created).
+    stats: {"hits", "misses", "computed"} in zeros (computed includes merged gaps),
+    {"chunk_loads", "chunk_writes"} in files.
+    """
+
+    def __init__(
+        self,
+        directory,
+        stiffness=0.95,
+        n_cutoff=20,
+        method="chaos",
+        isolation=None,
+        precision="float64",
+        chunk_size=CACHE_CHUNK,
+        lru_chunks=CACHE_LRU_CHUNKS,
+    ):
+        if method not in EVALUATORS:
+            raise ValueError(f"Unknown Z evaluator: {method!r} (expected one of {sorted(EVALUATORS)})")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision!r} (expected one of {PRECISIONS})")
+        self.stiffness = float(stiffness)
+        self.n_cutoff = int(n_cutoff)
+        self.method = method
+        isolation = isolation or default_isolation(method, precision)
+        self.isolation = isolation
+        self.precision = precision
+        self.chunk_size = int(chunk_size)
+        self.lru_chunks = int(lru_chunks)
+        key = (
+            f"v{CACHE_VERSION}_s{self.stiffness!r}_c{self.n_cutoff}_{method}_{isolation}_{precision}"
+            f"_k{self.chunk_size}"
+        )
+        self.directory = os.path.join(str(directory), key)
+        os.makedirs(self.directory, exist_ok=True)
+        self.stats = {"hits": 0, "misses": 0, "computed": 0, "chunk_loads": 0, "chunk_writes": 0}
+        self._lru = OrderedDict()
+
+    def _path(self, k):
+        return os.path.join(self.directory, f"chunk_{k:08d}.npy")
+
+    def _chunk(self, k):
+        """Values of chunk k (from the LRU, the chunk file, or a new all-NaN array)."""
+        values = self._lru.get(k)
+        if values is not None:
+            self._lru.move_to_end(k)
+            return values
+        path = self._path(k)
+        if os.path.exists(path):
+            values = np.load(path)
+            self.stats["chunk_loads"] += 1
+        else:
+            values = np.full(self.chunk_size, np.nan)
+        self._lru[k] = values
+        while len(self._lru) > self.lru_chunks:
+            self._lru.popitem(last=False)
+        return values
+
+    def _save(self, k, values):
+        path = self._path(k)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, values)
+        os.replace(tmp, path)
+        self.stats["chunk_writes"] += 1
+
+    def predict(self, n_array):
+        """Predicted zeros for the indices n_array (NumPy array, same shape)."""
+        n_in = np.asarray(to_numpy(n_array))
+        n = n_in.astype(np.int64).ravel()
+        out = np.empty(n.size)
+        chunk_ids = n // self.chunk_size
+        offsets = n - chunk_ids * self.chunk_size
+        for k in np.unique(chunk_ids).tolist():
+            sel = chunk_ids == k
+            out[sel] = self._chunk(k)[offsets[sel]]
+        missing = np.isnan(out)
+        n_missing = int(np.count_nonzero(missing))
+        self.stats["hits"] += n.size - n_missing
+        self.stats["misses"] += n_missing
+        if n_missing:
+            todo = np.unique(n[missing])
+            breaks = np.flatnonzero(np.diff(todo) > CACHE_GAP) + 1
+            dirty = {}
+            for run in np.split(todo, breaks):
+                run_n = np.arange(run[0], run[-1] + 1)
+                fresh = np.asarray(
+                    predict_zeros(
+                        run_n.astype(float),
+                        stiffness=self.stiffness,
+                        n_cutoff=self.n_cutoff,
+                        xp=np,
+                        method=self.method,
+                        isolation=self.isolation,
+                        precision=self.precision,
+                    ),
+                    dtype=float,
+                )
+                self.stats["computed"] += run_n.size
+                run_chunks = run_n // self.chunk_size
+                for k in np.unique(run_chunks).tolist():
+                    sel = run_chunks == k
+                    values = dirty[k] if k in dirty else self._chunk(k)
+                    values[run_n[sel] - k * self.chunk_size] = fresh[sel]
+                    dirty[k] = values
+            for k, values in dirty.items():
+                self._save(k, values)
+                sel = missing & (chunk_ids == k)
+                out[sel] = values[offsets[sel]]
+        return out.reshape(n_in.shape)
+
+    def clear_memory(self):
+        """Drop the in-memory chunks (files are kept)."""
+        self._lru.clear()
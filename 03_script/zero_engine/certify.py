@@ -0,0 +1,144 @@
+"""
+Background certification of predicted zeros with mpmath (ground-truth accuracy).
+
+CertificationSampler.offer(rows) is called with every harvested batch of a
+sweep (structured rows with "n" and "prediction", see sink.result_rows). The
+batch is split into `strata` contiguous height strata and one random zero is
+drawn from each; mpmath.zetazero certifies it in a separate low-priority
+process pool, off the hot path. The CPU budget is bounded by the pool size
+(a fraction of the cores) and by dropping offers while CERT_PENDING_PER_WORKER
+tasks per worker are already queued, so the sample rate adapts to how fast
+mpmath keeps up. poll() folds finished certifications into absolute/relative
+error histograms for the live log line and counts the ones that raised. The
+pool is spawned (backend.pool_context): it starts lazily on the first offer,
+after the parent has run the predictor.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .backend import pool_context
+from .parallel import default_workers
+from .reference import ErrorHistogram
+
+try:
+    import mpmath
+    MPMATH_AVAILABLE = True
+except ImportError:
+    mpmath = None
+    MPMATH_AVAILABLE = False
+
+# Queued certifications per worker before new offers are dropped.
+CERT_PENDING_PER_WORKER = 2
+# Nice increment of the certification workers.
+CERT_NICE = 10
+
+
+def _worker_init(dps):
+    try:
+        os.nice(CERT_NICE)
+    except (AttributeError, OSError):
+        pass
+    mpmath.mp.dps = dps
+
+
+def _certify(n):
+    return float(mpmath.zetazero(int(n)).imag)
+
+
+def certify_workers(fraction):
+    """Worker processes for a fraction of the cores (at least one)."""
+    return max(1, int(round(float(fraction) * default_workers())))
+
+
+class CertificationSampler:
+    """
+    Stratified background sampler certifying predicted zeros with mpmath.
+
+    workers: certification processes; strata: zeros drawn per offered batch;
+    dps: mpmath working precision. Use as a context manager or call close().
+    """
+
+    def __init__(self, workers=1, strata=1, dps=15, seed=None):
+        if not MPMATH_AVAILABLE:
+            raise RuntimeError("mpmath is required for certification (pip install mpmath)")
+        self.workers = int(workers)
+        self.strata = max(1, int(strata))
+        self.max_pending = CERT_PENDING_PER_WORKER * self.workers
+        self._rng = np.random.default_rng(seed)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=pool_context(), initializer=_worker_init, initargs=(int(dps),)
+        )
+        self._pending = []
+        self.abs_err = ErrorHistogram()
+        self.rel_err = ErrorHistogram()
+        self.submitted = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_error = None
+
+    def offer(self, rows):
+        """Draw one zero per height stratum of a harvested batch and queue it (unless the pool is busy)."""
+        size = len(rows)
+        if size == 0:
+            return
+        self.poll()
+        bounds = np.linspace(0, size, min(self.strata, size) + 1).astype(int)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                continue
+            i = int(self._rng.integers(lo, hi))
+            n = int(rows["n"][i])
+            self._pending.append((n, float(rows["prediction"][i]), self._executor.submit(_certify, n)))
+            self.submitted += 1
+
+    def poll(self):
+        """Fold finished certifications into the error histograms; returns how many were added (failures are counted in failed)."""
+        # One done() pass: a future finishing between two passes would be in neither list
+        done, pending = [], []
+        for p in self._pending:
+            (done if p[2].done() else pending).append(p)
+        if not done:
+            return 0
+        self._pending = pending
+        ok = []
+        for p in done:
+            exc = p[2].exception()
+            if exc is None:
+                ok.append(p)
+            else:
+                self.failed += 1
+                self.last_error = f"n={p[0]}: {type(exc).__name__}: {exc}"
+        pred = np.array([p[1] for p in ok])
+        true = np.array([p[2].result() for p in ok])
+        if pred.size:
+            err = np.abs(pred - true)
+            self.abs_err.add(err)
+            self.rel_err.add(err / true)
+        return pred.size
+
+    def metrics(self):
+        """Certified count, pending/dropped/failed offers and the absolute/relative error summaries."""
+        self.poll()
+        return {
+            "certified": self.abs_err.count,
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "last_error": self.last_error,
+            "abs": self.abs_err.summary() if self.abs_err.count else None,
+            "rel": self.rel_err.summary() if self.rel_err.count else None,
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
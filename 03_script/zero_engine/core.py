@@ -0,0 +1,1025 @@
+"""
+Vectorized three-step zero predictor.
+
+All functions take arrays (NumPy or CuPy) and return arrays of the same shape:
+  theta(t)      Riemann-Siegel theta function (leading terms)
+  Z(t)          Riemann-Siegel Z-function ("chaos wave" or full Riemann-Siegel)
+  inverse_N(n)  t such that the smooth zero count N(t) equals n
+  predict_zeros(n)  three-step prediction (macro -> micro -> chaos refinement)
+  isolate_zeros(n)  Gram-block sign-change brackets of the zeros (see gram.py)
+
+The batched_* functions are the building blocks used by the GPU scalability
+test; predict_zero_three_step is the sequential scalar predictor used by the
+13/14 scripts (it keeps the true previous-zero dependency).
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from .backend import (
+    get_array_module,
+    get_chaos_cpu_kernel_and_tables,
+    get_chaos_kernel_and_tables,
+    is_cupy,
+    to_numpy,
+)
+from .ddphase import dd_log_table, phase_dd, theta_dd
+from .gram import gram_brackets
+from .multieval import multi_eval
+from .riemann_siegel import riemann_siegel_eval
+
+TWO_PI = float(np.pi * 2.0)
+# Bracketed refinement treats steps below this many ulps of t as converged.
+ROOT_NOISE_ULPS = 64
+# predict_zeros_chained: zeros per Gram isolation chunk, smallest speculation window.
+CHAIN_CHUNK = 65536
+CHAIN_MIN_WINDOW = 16
+# Working-set size of one block of the NumPy chaos evaluator (about one L2 cache).
+CHAOS_BLOCK_BYTES = 1 << 18
+# Below this many points the chaos evaluator uses the direct (N, n_cutoff) form.
+CHAOS_DIRECT_MAX = 64
+# precision="mixed": float32 Newton stage iterations and step tolerance (before float64 polish).
+F32_MAX_ITER = 6
+F32_TOL = 1e-5
+# chaos_z_float32 re-evaluates points with |Z| below this in float64 (float32 error is ~1e-5 at most).
+F32_Z_GUARD = 1e-4
+# Stages timed by predict_zero_three_step_batched (stats["stage_sec"], see stage_metrics).
+STAGES = ("macro", "micro", "isolation", "refine_f32", "refine")
+
+
+def _infer_xp(a, xp=None):
+    """Return xp if given, else the array module that owns a."""
+    if xp is not None:
+        return xp
+    if type(a).__module__.startswith("cupy"):
+        return get_array_module(use_gpu=True)
+    return np
+
+
+def _as_batch(a, xp):
+    """Return (1-D float array, original shape) for an array or scalar input."""
+    arr = xp.asarray(a, dtype=float)
+    return arr.reshape(-1), arr.shape
+
+
+def _restore(out, shape):
+    """Reshape a 1-D result back to the caller's shape (0-d -> scalar)."""
+    out = out.reshape(shape)
+    return out[()] if out.ndim == 0 else out
+
+
+def riemann_n_formula(t, n, xp):
+    """Riemann-von Mangoldt formula inverse: f(t,n) = 0 at n-th zero.
+    Vectorized over arrays t and n (same shape)."""
+    two_pi = xp.pi * 2.0
+    val = (t / two_pi) * xp.log(t / two_pi) - (t / two_pi) + 0.875
+    return val - n
+
+
+def riemann_n_formula_derivative(t, xp):
+    """Derivative of riemann_n_formula w.r.t. t (n constant).
+    d/dt [ (t/(2*pi))*log(t/(2*pi)) - t/(2*pi) ] = (1/(2*pi))*log(t/(2*pi))."""
+    two_pi = xp.pi * 2.0
+    return (1.0 / two_pi) * xp.log(t / two_pi)
+
+
+def riemann_siegel_theta(t, xp):
+    """Riemann-Siegel theta function. Vectorized over t."""
+    two_pi = xp.pi * 2.0
+    return (t / 2.0) * xp.log(t / two_pi) - (t / 2.0) - (xp.pi / 8.0)
+
+
+def riemann_siegel_theta_derivative(t, xp):
+    """Derivative of Riemann-Siegel theta w.r.t. t."""
+    two_pi = xp.pi * 2.0
+    return 0.5 * xp.log(t / two_pi)
+
+
+def chaos_wave_eval(t, n_cutoff, xp):
+    """
+    Return (f, fp) for chaos wave at t, where:
+      f  = chaos_wave_function(t)
+      fp = d/dt chaos_wave_function(t)
+    Uses a single custom CUDA kernel for CuPy to reduce temporaries and improve GPU utilization,
+    and its Numba-compiled CPU twin on NumPy when Numba is installed.
+    """
+    t = xp.asarray(t, dtype=float)
+    if t.ndim == 0:
+        t = t[None]
+
+    if is_cupy(xp):
+        kernel, log_n, inv_sqrt_n = get_chaos_kernel_and_tables(n_cutoff=n_cutoff, dtype=np.float64)
+        out_f = xp.empty_like(t, dtype=xp.float64)
+        out_fp = xp.empty_like(t, dtype=xp.float64)
+        n = int(t.size)
+        threads = 256
+        blocks = (n + threads - 1) // threads
+        kernel((blocks,), (threads,), (t, log_n, inv_sqrt_n, int(n_cutoff), out_f, out_fp, n))
+        return out_f, out_fp
+
+    kernel, log_n, inv_sqrt_n = get_chaos_cpu_kernel_and_tables(n_cutoff)
+    if kernel is not None:
+        t = np.ascontiguousarray(t, dtype=np.float64)
+        out_f = np.empty_like(t)
+        out_fp = np.empty_like(t)
+        kernel(t.reshape(-1), log_n, inv_sqrt_n, out_f.reshape(-1), out_fp.reshape(-1))
+        return out_f, out_fp
+
+    if t.size < CHAOS_DIRECT_MAX:
+        return _chaos_wave_eval_direct(t, n_cutoff)
+    return _chaos_wave_eval_blocked(t, n_cutoff)
+
+
+def set_chaos_block_bytes(nbytes):
+    """Set the working-set size of one block of the NumPy chaos evaluator (see tuning.autotune); returns the old value."""
+    global CHAOS_BLOCK_BYTES
+    old, CHAOS_BLOCK_BYTES = CHAOS_BLOCK_BYTES, int(nbytes)
+    return old
+
+
+def _chaos_wave_eval_direct(t, n_cutoff):
+    """NumPy chaos wave (f, fp) with one (N, n_cutoff) pass (lowest call overhead for tiny batches)."""
+    theta = riemann_siegel_theta(t, np)
+    d_theta = riemann_siegel_theta_derivative(t, np)
+    n_vec = np.arange(1, n_cutoff + 1, dtype=float)
+    log_n = np.log(n_vec)
+    arg = theta[:, None] - t[:, None] * log_n[None, :]
+    inv_sqrt = 1.0 / np.sqrt(n_vec)[None, :]
+    f = 2.0 * (np.cos(arg) * inv_sqrt).sum(axis=1)
+    fp = 2.0 * ((-np.sin(arg)) * (d_theta[:, None] - log_n[None, :]) * inv_sqrt).sum(axis=1)
+    return f, fp
+
+
+_CHAOS_PLANS = {}
+
+
+def _chaos_plan(n_cutoff):
+    """
+    Multiplicative evaluation plan for n = 1..n_cutoff (cached per n_cutoff).
+
+    Rows are ordered [1, primes, composites by level]; returns (neg_log_p,
+    levels, weights): -log p for the prime rows, a list of (r0, r1, a, b) with
+    rows r0:r1 equal to rows a times rows b (each level only uses earlier rows),
+    and the (2, n_cutoff) row weights [n^-1/2, n^-1/2 log n].
+    """
+    plan = _CHAOS_PLANS.get(n_cutoff)
+    if plan is not None:
+        return plan
+    spf = list(range(n_cutoff + 1))
+    for p in range(2, int(n_cutoff ** 0.5) + 1):
+        if spf[p] == p:
+            for m in range(p * p, n_cutoff + 1, p):
+                spf[m] = min(spf[m], p)
+    primes = [n for n in range(2, n_cutoff + 1) if spf[n] == n]
+    depth = {}
+    by_level = {}
+    for n in range(4, n_cutoff + 1):
+        if spf[n] != n:
+            depth[n] = depth.get(n // spf[n], 0) + 1
+            by_level.setdefault(depth[n], []).append(n)
+    order = [1] + primes + [n for _, ns in sorted(by_level.items()) for n in ns]
+    row = {n: i for i, n in enumerate(order)}
+    levels = []
+    for _, ns in sorted(by_level.items()):
+        r0 = row[ns[0]]
+        levels.append((r0, r0 + len(ns), np.array([row[spf[n]] for n in ns]), np.array([row[n // spf[n]] for n in ns])))
+    n_vec = np.array(order, dtype=float)
+    inv_sqrt = 1.0 / np.sqrt(n_vec)
+    weights = np.stack([inv_sqrt, inv_sqrt * np.log(n_vec)])
+    plan = (-np.log(np.array(primes, dtype=float)), levels, weights)
+    _CHAOS_PLANS[n_cutoff] = plan
+    return plan
+
+
+def _chaos_wave_eval_blocked(t, n_cutoff):
+    """
+    NumPy chaos wave (f, fp) in L2-sized blocks with reused buffers.
+
+    n^(-it) is completely multiplicative, so only prime n need cos/sin; the
+    other rows are products of earlier ones. With E_n = n^(-it), S0 = sum
+    E_n / sqrt(n), S1 = sum E_n log(n) / sqrt(n) and rot = exp(i theta):
+      f  = 2 Re(rot S0),  fp = -2 Im(rot (theta' S0 - S1)).
+    """
+    shape = np.shape(t)
+    t_flat = np.ascontiguousarray(t, dtype=float).reshape(-1)
+    neg_log_p, levels, weights = _chaos_plan(int(n_cutoff))
+    n_primes = neg_log_p.size
+    m = min(max(64, CHAOS_BLOCK_BYTES // (16 * int(n_cutoff))), t_flat.size)
+    E = np.empty((int(n_cutoff), m), dtype=complex)
+    E[0] = 1.0
+    arg = np.empty((n_primes, m))
+    f = np.empty_like(t_flat)
+    fp = np.empty_like(t_flat)
+    for a in range(0, t_flat.size, m):
+        tb = t_flat[a:a + m]
+        k = tb.size
+        Eb = E[:, :k]
+        argb = arg[:, :k]
+        np.multiply(neg_log_p[:, None], tb[None, :], out=argb)
+        np.cos(argb, out=Eb[1:1 + n_primes].real)
+        np.sin(argb, out=Eb[1:1 + n_primes].imag)
+        for r0, r1, pa, pb in levels:
+            np.multiply(Eb[pa], Eb[pb], out=Eb[r0:r1])
+        S0, S1 = weights @ Eb
+        theta = riemann_siegel_theta(tb, np)
+        rot = np.cos(theta) + 1j * np.sin(theta)
+        f[a:a + k] = 2.0 * (rot * S0).real
+        fp[a:a + k] = -2.0 * (rot * (riemann_siegel_theta_derivative(tb, np) * S0 - S1)).imag
+    return f.reshape(shape), fp.reshape(shape)
+
+
+_DD_PLANS = {}
+
+
+def _chaos_dd_plan(n_cutoff, xp):
+    """_chaos_plan with double-double log p and the index arrays on xp (cached per n_cutoff and backend)."""
+    key = (int(n_cutoff), xp.__name__)
+    plan = _DD_PLANS.get(key)
+    if plan is None:
+        neg_log_p, levels, weights = _chaos_plan(int(n_cutoff))
+        log_hi, log_lo = dd_log_table(np.rint(np.exp(-neg_log_p)).astype(int).tolist())
+        levels = [(r0, r1, xp.asarray(a), xp.asarray(b)) for r0, r1, a, b in levels]
+        plan = (xp.asarray(log_hi), xp.asarray(log_lo), levels, xp.asarray(weights))
+        _DD_PLANS[key] = plan
+    return plan
+
+
+def _chaos_wave_eval_dd(t, n_cutoff, xp):
+    """
+    Chaos wave (f, fp) with double-double phases (method "chaos_dd", see ddphase).
+
+    Same sum as chaos_wave_eval, but theta(t) and t log p are computed in
+    double-double and reduced mod 2 pi, so cos/sin stay exact for the float64
+    t at heights where the float64 phases are noise (t above ~1e10). Composite
+    rows come from products of the prime rows, as in _chaos_wave_eval_blocked;
+    works on NumPy and CuPy.
+    """
+    t_flat, shape = _as_batch(t, xp)
+    log_hi, log_lo, levels, weights = _chaos_dd_plan(n_cutoff, xp)
+    n_primes = log_hi.size
+    m = max(64, CHAOS_BLOCK_BYTES // (16 * int(n_cutoff)))
+    f = xp.empty_like(t_flat)
+    fp = xp.empty_like(t_flat)
+    for a in range(0, t_flat.size, m):
+        tb = t_flat[a:a + m]
+        arg = phase_dd(tb, log_hi, log_lo, xp)
+        E = xp.empty((int(n_cutoff), tb.size), dtype=complex)
+        E[0] = 1.0
+        E[1:1 + n_primes] = xp.cos(arg) - 1j * xp.sin(arg)
+        for r0, r1, pa, pb in levels:
+            E[r0:r1] = E[pa] * E[pb]
+        S0, S1 = weights @ E
+        th = theta_dd(tb, xp)
+        rot = xp.cos(th) + 1j * xp.sin(th)
+        f[a:a + tb.size] = 2.0 * (rot * S0).real
+        fp[a:a + tb.size] = -2.0 * (rot * (riemann_siegel_theta_derivative(tb, xp) * S0 - S1)).imag
+    return f.reshape(shape), fp.reshape(shape)
+
+
+def _riemann_siegel_wave_eval(t, n_cutoff, xp):
+    """Full Riemann-Siegel (Z, Z'); n_cutoff is ignored (N = floor(sqrt(t/2pi)) per element)."""
+    return riemann_siegel_eval(t, xp, with_derivative=True)
+
+
+def _odlyzko_schonhage_wave_eval(t, n_cutoff, xp):
+    """Riemann-Siegel (Z, Z') served from cached NUFFT grids on dense windows; n_cutoff is ignored."""
+    return multi_eval(t, xp, with_derivative=True)
+
+
+# Arithmetic of predict_zero_three_step_batched (see its docstring).
+PRECISIONS = ("float64", "mixed")
+
+
+# Evaluators accurate enough for faithful Gram sign scans (default isolation "gram").
+GRAM_METHODS = ("riemann_siegel", "odlyzko_schonhage")
+
+
+def default_isolation(method="chaos", precision="float64"):
+    """
+    Isolation of the batched predictor when none is given.
+
+    "gram" for the full Riemann-Siegel evaluators (GRAM_METHODS), whose scans
+    bracket every zero while the window clamps about a quarter of them at
+    n = 1e5, and for precision="mixed" (its float32 stages run on Gram
+    brackets); "window" for the truncated chaos wave, where the scan costs
+    about as much as the Newton pass and leaves many zeros unbracketed.
+    """
+    return "gram" if precision == "mixed" or method in GRAM_METHODS else "window"
+
+# Z(t) evaluators usable by the refinement step: name -> fn(t, n_cutoff, xp) -> (f, fp)
+EVALUATORS = {
+    "chaos": chaos_wave_eval,
+    "chaos_dd": _chaos_wave_eval_dd,
+    "riemann_siegel": _riemann_siegel_wave_eval,
+    "odlyzko_schonhage": _odlyzko_schonhage_wave_eval,
+}
+
+
+def get_evaluator(method):
+    """Return the (f, fp) evaluator registered under method."""
+    try:
+        return EVALUATORS[method]
+    except KeyError:
+        raise ValueError(f"Unknown Z evaluator {method!r}; choose from {sorted(EVALUATORS)}") from None
+
+
+def lambert_w0(x, xp, max_iter=8, tol=1e-15):
+    """Principal branch W0(x) for x > 0, vectorized.
+
+    Solves w + log(w) = log(x) (the log form avoids overflowing exp(w)) with
+    Halley steps from an asymptotic seed; converged elements are masked out.
+    """
+    x = xp.asarray(x, dtype=float)
+    log_x = xp.log(x)
+    # Seed: log(1+x) below e, asymptotic L1 - L2 + L2/L1 above
+    L1 = xp.log(xp.maximum(x, np.e))
+    L2 = xp.log(L1)
+    w = xp.where(x < np.e, xp.log1p(x), L1 - L2 + L2 / L1)
+    idx = xp.arange(w.size)
+    for _ in range(max_iter):
+        wi = w[idx]
+        g = wi + xp.log(wi) - log_x[idx]
+        gp = 1.0 + 1.0 / wi
+        gpp = -1.0 / (wi * wi)
+        step = g / gp / (1.0 - 0.5 * g * gpp / (gp * gp))
+        w[idx] = wi - step
+        idx = idx[xp.abs(step) > tol * wi]
+        if idx.size == 0:
+            break
+    return w
+
+
+def _macro_halley_step(t, nf, xp):
+    """Halley step for riemann_n_formula(t, n) = 0 (returns the step to subtract)."""
+    f = riemann_n_formula(t, nf, xp)
+    fp = riemann_n_formula_derivative(t, xp)
+    fpp = 1.0 / (TWO_PI * t)
+    # Avoid division by zero near t = 2*pi where fp = 0
+    return f / (fp + 1e-14) / (1.0 - 0.5 * f * fpp / (fp * fp + 1e-28))
+
+
+def batched_macro(n_array, xp, max_iter=20, tol=1e-12, precision="float64"):
+    """Batched macroscopic prediction: solve riemann_n_formula(t, n) = 0 for all n.
+    Returns array of t_macro same shape as n_array.
+
+    Seeds from the closed form t = 2*pi*(n - 7/8) / W0((n - 7/8)/e), which is exact
+    up to the accuracy of W0, then polishes with Halley steps. Each element stops as
+    soon as its relative step drops below tol, so the typical cost is one array pass.
+    precision="mixed" runs the seed and Halley steps in float32 and finishes with one
+    float64 Halley step (cubic convergence takes 6e-8 relative error below 1e-15).
+    """
+    dtype = xp.float32 if precision == "mixed" else float
+    nf = xp.asarray(n_array, dtype=dtype)
+    m = xp.maximum(nf - 0.875, 1e-12)
+    t = (TWO_PI * m / lambert_w0(m / np.e, xp)).astype(dtype)
+    step_tol = max(tol, 4 * float(np.finfo(dtype).eps))
+    idx = xp.arange(t.size)
+    for _ in range(max_iter):
+        ti = t[idx]
+        step = _macro_halley_step(ti, nf[idx], xp)
+        t[idx] = ti - step
+        idx = idx[xp.abs(step) > step_tol * xp.maximum(xp.abs(ti), 1.0)]
+        if idx.size == 0:
+            break
+    if precision == "mixed":
+        t = t.astype(float)
+        t = t - _macro_halley_step(t, xp.asarray(n_array, dtype=float), xp)
+    return t
+
+
+def batched_micro(t_macro, n_array, stiffness, xp, precision="float64"):
+    """Batched microscopic correction using theoretical previous zero.
+    Uses t_macro[n-1] as approximation for previous_zero to keep parallelism."""
+    nf = xp.asarray(n_array, dtype=float)
+    # Theoretical location for n-1 (for correction)
+    n_prev = xp.maximum(nf - 1, 1)
+    t_prev_theory = batched_macro(n_prev, xp, max_iter=15, tol=1e-10, precision=precision)
+    # Previous prediction: use t_macro of previous index (shift)
+    t_prev_pred = xp.roll(t_macro, 1)
+    # First index in batch has no previous zero -> use t_prev_theory so correction = 0
+    t_prev_pred = xp.where(xp.arange(nf.size, dtype=xp.int32) > 0, t_prev_pred, t_prev_theory)
+    # For n=1 no correction
+    t_prev_pred = xp.where(nf > 1, t_prev_pred, t_prev_theory)
+    displacement = t_prev_pred - t_prev_theory
+    correction = displacement * stiffness
+    return t_macro + correction
+
+
+def batched_chaos_refinement(
+    t_micro,
+    n_cutoff,
+    xp,
+    search_window=0.5,
+    max_iter=15,
+    tol=1e-10,
+    return_stats=False,
+    method="chaos",
+    bracket=None,
+    start=None,
+):
+    """Batched Newton refinement: find root of chaos_wave_function near t_micro.
+    method selects the Z evaluator ("chaos": fixed n_cutoff main sum,
+    "riemann_siegel": full Riemann-Siegel with remainder terms).
+
+    bracket: optional (lo, hi, sign_lo, ok) from gram_brackets. Bracketed
+    elements (ok) start at the bracket midpoint and take safeguarded Newton steps
+    that bisect whenever the step leaves [lo, hi]; the bracket shrinks with the
+    sign of every evaluation, so they never leave the interval holding their zero. The remaining elements
+    are clamped to t_micro +/- search_window as before.
+    start: optional starting points inside the brackets / windows (e.g. from
+    the float32 stage of precision="mixed"), used instead of the defaults.
+
+    Active-set compaction: each iteration evaluates only the elements whose last
+    step was >= tol, so a few slow elements no longer keep the whole batch busy.
+    Elements pinned at the search_window clamp cannot move again and are
+    retired as well. With return_stats=True returns (t, stats) where stats holds
+    per-element "iterations", their "histogram" (host array, index = iteration
+    count), the number of "clamped" elements and of "unconverged" elements
+    (still moving at max_iter).
+    """
+    t_micro = xp.asarray(t_micro, dtype=float)
+    lo = t_micro - search_window
+    hi = t_micro + search_window
+    sign_lo = xp.zeros_like(t_micro)
+    if bracket is not None:
+        b_lo, b_hi, b_sign, ok = bracket
+        lo = xp.where(ok, b_lo, lo)
+        hi = xp.where(ok, b_hi, hi)
+        sign_lo = xp.where(ok, b_sign, sign_lo)
+    # Bracketed elements start from the bracket midpoint, so their result depends
+    # on the bracket alone (not on t_micro, which carries the previous-zero chain).
+    t = xp.where(sign_lo == 0, t_micro, 0.5 * (lo + hi))
+    if start is not None:
+        t = xp.clip(xp.asarray(start, dtype=float), lo, hi)
+    evaluate = get_evaluator(method)
+    iters = xp.full(t.shape, max_iter, dtype=xp.int32)
+    idx = xp.arange(t.size)
+    clamped = 0
+    for k in range(1, max_iter + 1):
+        ti = t[idx]
+        f, fp = evaluate(ti, n_cutoff, xp)
+        s = sign_lo[idx]
+        bracketed = s != 0
+        li = xp.where(bracketed & (f * s > 0), ti, lo[idx])
+        hi_i = xp.where(bracketed & (f * s < 0), ti, hi[idx])
+        lo[idx] = li
+        hi[idx] = hi_i
+        # Bracketed: true Newton step; window mode keeps the |Z'| step
+        newton = ti - f / xp.where(fp == 0, 1e-14, fp)
+        bisect = 0.5 * (li + hi_i)
+        t_safe = xp.where((newton >= li) & (newton <= hi_i), newton, bisect)
+        step = f / (xp.abs(fp) + 1e-14)
+        # Clamp to window around original t_micro
+        t_clip = xp.clip(ti - step, li, hi_i)
+        t_new = xp.where(bracketed, t_safe, t_clip)
+        t[idx] = t_new
+        # An element held in place by the clamp is a fixed point: retire it too
+        stuck = ~bracketed & (t_new == ti)
+        # Bracketed steps stop at the float64 noise floor of Z near t as well
+        moved = xp.where(bracketed, xp.abs(t_new - ti), xp.abs(step))
+        b_tol = xp.maximum(tol, ROOT_NOISE_ULPS * np.finfo(float).eps * xp.abs(ti))
+        done = xp.where(bracketed, (moved < b_tol) | (hi_i - li < b_tol), moved < tol) | stuck
+        iters[idx[done]] = k
+        if return_stats:
+            clamped += int(xp.count_nonzero(stuck & (xp.abs(step) >= tol)))
+        idx = idx[~done]
+        if idx.size == 0:
+            break
+    if return_stats:
+        hist = to_numpy(xp.bincount(iters, minlength=max_iter + 1))
+        return t, {"iterations": iters, "histogram": hist, "clamped": clamped, "unconverged": int(idx.size)}
+    return t
+
+
+def chaos_z_float32(t, n_cutoff, xp, guard=F32_Z_GUARD):
+    """
+    Chaos-wave Z(t) with float32 cosines of float64-reduced phases.
+
+    Phases are taken in turns, theta/(2 pi) - t log(n)/(2 pi), and reduced to
+    [0, 1) in float64 before the float32 cosine, so the float32 argument keeps
+    its full precision at any height. Points with |Z| < guard are re-evaluated
+    in float64, so the signs match chaos_wave_eval exactly (Gram scans).
+    """
+    t = xp.asarray(t, dtype=float).reshape(-1)
+    n_vec = xp.arange(1, n_cutoff + 1, dtype=float)
+    turns = xp.log(n_vec) / TWO_PI
+    w = (1.0 / xp.sqrt(n_vec)).astype(xp.float32)
+    z = xp.empty_like(t)
+    block = max(64, CHAOS_BLOCK_BYTES // (8 * int(n_cutoff)))
+    for a in range(0, t.size, block):
+        tb = t[a:a + block]
+        u = (riemann_siegel_theta(tb, xp) / TWO_PI)[:, None] - tb[:, None] * turns[None, :]
+        u -= xp.floor(u)
+        z[a:a + block] = 2.0 * (xp.cos(xp.float32(TWO_PI) * u.astype(xp.float32)) @ w)
+    near = xp.flatnonzero(xp.abs(z) < guard)
+    if near.size:
+        z[near] = chaos_wave_eval(t[near], n_cutoff, xp)[0]
+    return z
+
+
+def chaos_refinement_float32(t_micro, n_cutoff, xp, bracket, max_iter=F32_MAX_ITER):
+    """
+    Float32 Newton stage on the chaos wave with reduced phases (precision="mixed").
+
+    Each Gram-bracketed element is anchored at its bracket midpoint t0 and only
+    the offset dt is iterated in float32:
+      arg_n(t0 + dt) = phi_n + (theta'(t0) - log n) dt + dt^2 / (4 t0),
+    where phi_n = theta(t0) - t0 log n is reduced mod 2 pi once in float64, so
+    the float32 arguments stay O(1) instead of O(t log n). Steps are safeguarded
+    as in batched_chaos_refinement. Returns float64 starting points (accurate
+    to about 1e-6) for batched_chaos_refinement(start=...); unbracketed
+    elements keep t_micro, since the window fallback's root depends on its start.
+    """
+    f32 = xp.float32
+    t_micro = xp.asarray(t_micro, dtype=float)
+    b_lo, b_hi, b_sign, ok = bracket
+    start = t_micro.copy()
+    sel = xp.flatnonzero(ok)
+    if sel.size == 0:
+        return start
+    lo = b_lo[sel]
+    hi = b_hi[sel]
+    sign_lo = b_sign[sel].astype(f32)
+    t0 = 0.5 * (lo + hi)
+    n_vec = xp.arange(1, n_cutoff + 1, dtype=float)
+    log_n = xp.log(n_vec)
+    phi = xp.mod(riemann_siegel_theta(t0, xp)[:, None] - t0[:, None] * log_n[None, :], TWO_PI).astype(f32)
+    slope = (riemann_siegel_theta_derivative(t0, xp)[:, None] - log_n[None, :]).astype(f32)
+    curv = (0.25 / t0).astype(f32)
+    w = (1.0 / xp.sqrt(n_vec)).astype(f32)
+    d_lo = (lo - t0).astype(f32)
+    d_hi = (hi - t0).astype(f32)
+    dt = xp.zeros(t0.shape, dtype=f32)
+    idx = xp.arange(t0.size)
+    for _ in range(max_iter):
+        di = dt[idx]
+        ci = curv[idx]
+        si = slope[idx]
+        arg = phi[idx] + si * di[:, None] + (ci * di * di)[:, None]
+        f = 2.0 * (xp.cos(arg) @ w)
+        fp = -2.0 * ((xp.sin(arg) * (si + (2.0 * ci * di)[:, None])) @ w)
+        s = sign_lo[idx]
+        li = xp.where(f * s > 0, di, d_lo[idx])
+        hi_i = xp.where(f * s < 0, di, d_hi[idx])
+        d_lo[idx] = li
+        d_hi[idx] = hi_i
+        newton = di - f / xp.where(fp == 0, f32(1e-7), fp)
+        d_new = xp.where((newton >= li) & (newton <= hi_i), newton, 0.5 * (li + hi_i))
+        dt[idx] = d_new
+        idx = idx[xp.abs(d_new - di) > F32_TOL]
+        if idx.size == 0:
+            break
+    start[sel] = t0 + dt.astype(float)
+    return start
+
+
+def merge_histogram(acc, hist):
+    """Add integer histogram hist into acc (either may be None or shorter); returns the sum."""
+    if acc is None:
+        return np.asarray(hist).copy()
+    size = max(len(acc), len(hist))
+    out = np.zeros(size, dtype=np.int64)
+    out[:len(acc)] += acc
+    out[:len(hist)] += hist
+    return out
+
+
+class _StageClock:
+    """
+    Per-stage wall time and allocation of one predictor call, added into a stats dict.
+
+    NumPy: perf_counter laps, and while tracemalloc is tracing the peak bytes each
+    stage allocates above its starting level. CuPy: CUDA events recorded on the
+    current stream (read once the call's stats have synchronized anyway) and the
+    growth of the device memory pool.
+    """
+
+    def __init__(self, stats, xp):
+        self.stats = stats
+        self.xp = xp
+        self.gpu = is_cupy(xp)
+        self.traced = self.gpu or tracemalloc.is_tracing()
+        self.laps = []
+        self._mark = self._now()
+        self._base = self._bytes()
+
+    def _now(self):
+        if self.gpu:
+            event = self.xp.cuda.Event()
+            event.record()
+            return event
+        return time.perf_counter()
+
+    def _bytes(self):
+        if self.gpu:
+            return self.xp.get_default_memory_pool().used_bytes()
+        if self.traced:
+            tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    def lap(self, stage):
+        now = self._now()
+        if self.gpu:
+            used = self._bytes()
+            nbytes = max(0, used - self._base)
+        elif self.traced:
+            nbytes = max(0, tracemalloc.get_traced_memory()[1] - self._base)
+            used = self._bytes()
+        else:
+            nbytes = used = 0
+        self.laps.append((stage, self._mark, now, nbytes))
+        self._mark = now
+        self._base = used
+
+    def close(self, zeros):
+        sec = self.stats.setdefault("stage_sec", {})
+        allocated = self.stats.setdefault("stage_bytes", {})
+        for stage, start, end, nbytes in self.laps:
+            if self.gpu:
+                end.synchronize()
+                dt = self.xp.cuda.get_elapsed_time(start, end) / 1000.0
+            else:
+                dt = end - start
+            sec[stage] = sec.get(stage, 0.0) + dt
+            if self.traced:
+                allocated[stage] = allocated.get(stage, 0) + int(nbytes)
+        self.stats["stage_zeros"] = self.stats.get("stage_zeros", 0) + int(zeros)
+        if self.traced:
+            self.stats["traced_zeros"] = self.stats.get("traced_zeros", 0) + int(zeros)
+
+
+def stage_metrics(stats):
+    """
+    Per-zero view of predictor stats: {"us_per_zero": {stage: ...}, "bytes_per_zero": {stage: ...},
+    "newton_mean", "newton_clamped", "newton_unconverged", "unbracketed"}.
+
+    stats: a dict filled by predict_zero_three_step_batched (or merged from several,
+    see merge_refine_stats). Stages outside STAGES (e.g. "host" from the caller) are kept.
+    bytes_per_zero is empty unless allocations were traced.
+    """
+    zeros = stats.get("stage_zeros", 0)
+    traced = stats.get("traced_zeros", 0)
+    hist = np.asarray(stats.get("newton_hist", []), dtype=float)
+    return {
+        "us_per_zero": {k: v / zeros * 1e6 for k, v in stats.get("stage_sec", {}).items()} if zeros else {},
+        "bytes_per_zero": {k: v / traced for k, v in stats.get("stage_bytes", {}).items()} if traced else {},
+        "newton_mean": float((hist * np.arange(hist.size)).sum() / hist.sum()) if hist.sum() else 0.0,
+        "newton_clamped": int(stats.get("newton_clamped", 0)),
+        "newton_unconverged": int(stats.get("newton_unconverged", 0)),
+        "unbracketed": int(stats.get("unbracketed", 0)),
+    }
+
+
+def isolate_zeros(n_array, n_cutoff=20, xp=None, method="chaos", precision="float64"):
+    """Gram-block sign-change brackets (lo, hi, sign_lo, ok) of the zeros with indices n_array.
+    precision="mixed" scans the chaos wave with chaos_z_float32 (same signs);
+    method="chaos_dd" also places the Gram points with the double-double theta."""
+    if xp is None:
+        xp = get_array_module(use_gpu=True)
+    if precision == "mixed" and method == "chaos":
+        return gram_brackets(n_array, lambda t: chaos_z_float32(t, n_cutoff, xp), xp)
+    return gram_brackets(n_array, lambda t: Z(t, n_cutoff, xp, method), xp, dd=method == "chaos_dd")
+
+
+def predict_zero_three_step_batched(
+    n_array,
+    stiffness=0.95,
+    n_cutoff=20,
+    xp=None,
+    stats=None,
+    method="chaos",
+    isolation=None,
+    chained=False,
+    previous_zero=None,
+    precision="float64",
+):
+    """
+    Three-step prediction for a batch of zero indices (GPU-optimized).
+    Uses theoretical previous zero for microscopic step to allow full batching.
+    stats: optional dict; the chaos-refinement iteration histogram is accumulated
+    into stats["newton_hist"], with clamp-pinned and unconverged element counts in
+    stats["newton_clamped"] and stats["newton_unconverged"], and zeros Gram
+    isolation could not bracket in stats["unbracketed"]. Seconds per stage (STAGES;
+    "micro" includes its own macro pass for n - 1) go to stats["stage_sec"] and the
+    batch size to stats["stage_zeros"]; while tracemalloc is tracing (and always on
+    CuPy) bytes per stage go to stats["stage_bytes"] and stats["traced_zeros"]
+    (see _StageClock, stage_metrics).
+    method: Z evaluator for the refinement step (see EVALUATORS).
+    isolation: "window" uses only the fixed search window around the
+    micro prediction; "gram" brackets each zero by Gram-block sign scanning
+    before refinement (unbracketed zeros fall back to the window). With the
+    20-term chaos wave the scan costs about as much as the Newton pass it
+    replaces and leaves many zeros unbracketed at larger heights. None (default)
+    picks default_isolation(method, precision).
+    chained: use the true previous-zero recurrence of predict_zero_three_step
+    (predict_zeros_chained, seeded with previous_zero) instead of the theoretical
+    previous zero; stats then gets "no_sign_change" and "chain_rounds" instead
+    of the Newton histogram.
+    precision: "float64" (default) or "mixed": macro/micro run in float32 with
+    one float64 Halley step, and the Gram sign scans (chaos_z_float32) and the
+    first Newton iterations (chaos_refinement_float32) run in float32; float64
+    refinement then polishes the roots, so the histogram counts the polish
+    iterations. "mixed" needs method="chaos" and isolation="gram": window-mode
+    roots depend on their starting point, so float32 steps there would move
+    zeros instead of saving time (chained runs ignore precision).
+    """
+    if xp is None:
+        xp = get_array_module(use_gpu=True)
+    if isolation is None:
+        isolation = default_isolation(method, precision)
+    if isolation not in ("gram", "window"):
+        raise ValueError(f"Unknown isolation {isolation!r}; choose 'gram' or 'window'")
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}; choose one of {', '.join(PRECISIONS)}")
+    if chained:
+        return predict_zeros_chained(
+            n_array,
+            previous_zero=previous_zero,
+            stiffness=stiffness,
+            n_cutoff=n_cutoff,
+            xp=xp,
+            method=method,
+            isolation=isolation,
+            stats=stats,
+        )
+    if precision == "mixed" and (method != "chaos" or isolation != "gram"):
+        raise ValueError(
+            f"precision='mixed' needs method='chaos' and isolation='gram' (got {method!r}, {isolation!r})"
+        )
+    n_array = xp.asarray(n_array, dtype=float)
+    if stats is None:
+        t_macro = batched_macro(n_array, xp, precision=precision)
+        t_micro = batched_micro(t_macro, n_array, stiffness, xp, precision=precision)
+        bracket = isolate_zeros(n_array, n_cutoff, xp, method, precision) if isolation == "gram" else None
+        start = None
+        if precision == "mixed":
+            start = chaos_refinement_float32(t_micro, n_cutoff, xp, bracket)
+        return batched_chaos_refinement(t_micro, n_cutoff, xp, method=method, bracket=bracket, start=start)
+    clock = _StageClock(stats, xp)
+    t_macro = batched_macro(n_array, xp, precision=precision)
+    clock.lap("macro")
+    t_micro = batched_micro(t_macro, n_array, stiffness, xp, precision=precision)
+    clock.lap("micro")
+    bracket = isolate_zeros(n_array, n_cutoff, xp, method, precision) if isolation == "gram" else None
+    clock.lap("isolation")
+    start = None
+    if precision == "mixed":
+        start = chaos_refinement_float32(t_micro, n_cutoff, xp, bracket)
+        clock.lap("refine_f32")
+    t_final, refine = batched_chaos_refinement(
+        t_micro, n_cutoff, xp, return_stats=True, method=method, bracket=bracket, start=start
+    )
+    clock.lap("refine")
+    clock.close(n_array.size)
+    stats["newton_hist"] = merge_histogram(stats.get("newton_hist"), refine["histogram"])
+    stats["newton_clamped"] = stats.get("newton_clamped", 0) + refine["clamped"]
+    stats["newton_unconverged"] = stats.get("newton_unconverged", 0) + refine["unconverged"]
+    if bracket is not None:
+        stats["unbracketed"] = stats.get("unbracketed", 0) + int(xp.count_nonzero(~bracket[3]))
+    return t_final
+
+
+def refine_isolated(t_micro, n_cutoff, xp, method="chaos", search_window=0.5, bracket=None, max_iter=30):
+    """
+    Step 3 with the sequential predictor's semantics, for a batch.
+
+    Each element is solved on its Gram bracket when bracket[3] (ok) is set,
+    otherwise on [t_micro - search_window, t_micro + search_window] if Z changes
+    sign there; elements with neither keep t_micro. Returns (t, has_root).
+    Bracketed solves start at the bracket midpoint, so an element whose Gram
+    bracket is known does not depend on t_micro at all.
+    """
+    t_micro = xp.asarray(t_micro, dtype=float)
+    lo = t_micro - search_window
+    hi = t_micro + search_window
+    gram_ok = xp.zeros(t_micro.shape, dtype=bool)
+    sign_lo = xp.zeros_like(t_micro)
+    if bracket is not None:
+        b_lo, b_hi, b_sign, gram_ok = bracket
+        lo = xp.where(gram_ok, b_lo, lo)
+        hi = xp.where(gram_ok, b_hi, hi)
+        sign_lo = xp.where(gram_ok, b_sign, sign_lo)
+    t = t_micro.copy()
+    has_root = gram_ok.copy()
+    win = xp.flatnonzero(~gram_ok)
+    if win.size:
+        f_lo = Z(lo[win], n_cutoff, xp, method)
+        f_hi = Z(hi[win], n_cutoff, xp, method)
+        # An end point that is an exact root is the answer (as in brentq)
+        t[win] = xp.where(f_lo == 0, lo[win], xp.where(f_hi == 0, hi[win], t[win]))
+        has_root[win] = (f_lo * f_hi) <= 0
+        sign_lo[win] = xp.where((f_lo * f_hi) < 0, xp.sign(f_lo), 0.0)
+    solve = xp.flatnonzero(sign_lo != 0)
+    if solve.size:
+        t[solve] = batched_chaos_refinement(
+            t_micro[solve],
+            n_cutoff,
+            xp,
+            max_iter=max_iter,
+            method=method,
+            bracket=(lo[solve], hi[solve], sign_lo[solve], xp.ones(solve.size, dtype=bool)),
+        )
+    return t, has_root
+
+
+def affine_prefix_scan(a, b, x0, xp):
+    """
+    x[i] = a[i] * x[i-1] + b[i] with x[-1] = x0, for all i, in log2(len) array passes.
+
+    Hillis-Steele scan over the affine maps (a, b); composing (a2, b2) after
+    (a1, b1) gives (a2 * a1, a2 * b1 + b2).
+    """
+    a = xp.asarray(a, dtype=float).copy()
+    b = xp.asarray(b, dtype=float).copy()
+    d = 1
+    while d < a.size:
+        b[d:] = a[d:] * b[:-d] + b[d:]
+        a[d:] = a[d:] * a[:-d]
+        d *= 2
+    return a * x0 + b
+
+
+def predict_zeros_chained(
+    n_array,
+    previous_zero=None,
+    stiffness=0.95,
+    n_cutoff=20,
+    xp=None,
+    method="chaos",
+    isolation="gram",
+    search_window=0.5,
+    chunk=CHAIN_CHUNK,
+    atol=1e-9,
+    stats=None,
+):
+    """
+    Batched equivalent of calling predict_zero_three_step in a loop over n_array,
+    each call receiving the previous result as previous_zero (the first call
+    receives previous_zero).
+
+    Speculate and repair over a window of the not-yet-final zeros: every element
+    is solved from the current guess of its predecessor, where
+      - Gram-bracketed elements and elements with a sign change in their window
+        are constants of the recurrence (x_i = root_i);
+      - elements without a root keep t_micro, an affine function of the
+        predecessor, x_i = k x_{i-1} + (t_macro_i - k t_theory(n_i - 1)),
+        resolved exactly by affine_prefix_scan.
+    The leading run of elements whose predecessor guess was right (within atol),
+    or that do not depend on it (Gram-bracketed), is final; the rest is retried
+    from the repaired guesses. The window doubles while whole windows commit and
+    shrinks to twice the committed run otherwise. With Gram isolation and an
+    accurate Z one pass suffices; --isolation window chains, whose root choice
+    depends on the predecessor, commit a few zeros per pass.
+    chunk bounds the Gram isolation batch. stats: optional dict, gets
+    "unbracketed", "no_sign_change" and "chain_rounds" added.
+    """
+    if xp is None:
+        xp = get_array_module(use_gpu=True)
+    if isolation not in ("gram", "window"):
+        raise ValueError(f"Unknown isolation {isolation!r}; choose 'gram' or 'window'")
+    n_all = xp.asarray(n_array, dtype=float).reshape(-1)
+    out = xp.empty_like(n_all)
+    prev = previous_zero
+    window = chunk
+    for c0 in range(0, n_all.size, chunk):
+        n = n_all[c0:c0 + chunk]
+        size = int(n.size)
+        t_macro = batched_macro(n, xp)
+        t_theory_prev = batched_macro(xp.maximum(n - 1, 1), xp)
+        if isolation == "gram":
+            bracket = isolate_zeros(n, n_cutoff, xp, method)
+            fixed = bracket[3]
+        else:
+            bracket = None
+            fixed = xp.zeros(size, dtype=bool)
+        # Affine form of the micro step; no correction for n == 1 or without a previous zero
+        has_prev = n > 1
+        if prev is None:
+            has_prev[0] = False
+        a_lin = xp.where(has_prev, stiffness, 0.0)
+        b_lin = xp.where(has_prev, t_macro - stiffness * t_theory_prev, t_macro)
+
+        x = t_macro.copy()
+        has_root = xp.zeros(size, dtype=bool)
+        rounds = 0
+        p = 0
+        while p < size:
+            rounds += 1
+            e = min(size, p + window)
+            x_start = (0.0 if prev is None else float(prev)) if p == 0 else x[p - 1]
+            guess = xp.concatenate([xp.asarray([x_start], dtype=float), x[p:e - 1]])
+            br = None if bracket is None else tuple(v[p:e] for v in bracket)
+            root, w_root = refine_isolated(a_lin[p:e] * guess + b_lin[p:e], n_cutoff, xp, method, search_window, br)
+            x_new = affine_prefix_scan(xp.where(w_root, 0.0, a_lin[p:e]), xp.where(w_root, root, b_lin[p:e]), x_start, xp)
+            pred_new = xp.concatenate([xp.asarray([x_start], dtype=float), x_new[:-1]])
+            valid = fixed[p:e] | (xp.abs(guess - pred_new) <= atol)
+            bad = xp.flatnonzero(~valid)
+            k = (e - p) if bad.size == 0 else int(bad[0])
+            x[p:e] = x_new
+            has_root[p:e] = w_root
+            window = min(chunk, 2 * window) if k == e - p else max(CHAIN_MIN_WINDOW, 2 * k)
+            p += k
+        if stats is not None:
+            if bracket is not None:
+                stats["unbracketed"] = stats.get("unbracketed", 0) + int(xp.count_nonzero(~bracket[3]))
+            stats["no_sign_change"] = stats.get("no_sign_change", 0) + int(xp.count_nonzero(~has_root))
+            stats["chain_rounds"] = stats.get("chain_rounds", 0) + rounds
+        out[c0:c0 + size] = x
+        prev = x[-1]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Public array-in / array-out API
+# ---------------------------------------------------------------------------
+
+def theta(t, xp=None):
+    """Riemann-Siegel theta(t); same shape as t."""
+    xp = _infer_xp(t, xp)
+    tb, shape = _as_batch(t, xp)
+    return _restore(riemann_siegel_theta(tb, xp), shape)
+
+
+def Z(t, n_cutoff=20, xp=None, method="chaos"):
+    """Z(t); same shape as t.
+
+    method "chaos": 2 * sum_{n<=n_cutoff} cos(theta(t) - t log n) / sqrt(n).
+    method "chaos_dd": the same sum with double-double phases (large heights).
+    method "riemann_siegel": full Riemann-Siegel formula (n_cutoff ignored).
+    method "odlyzko_schonhage": Riemann-Siegel via grid interpolation on dense windows.
+    """
+    xp = _infer_xp(t, xp)
+    tb, shape = _as_batch(t, xp)
+    if method == "riemann_siegel":
+        return _restore(riemann_siegel_eval(tb, xp, with_derivative=False), shape)
+    if method == "odlyzko_schonhage":
+        return _restore(multi_eval(tb, xp, with_derivative=False), shape)
+    if method != "chaos":
+        f, _ = get_evaluator(method)(tb, n_cutoff, xp)
+        return _restore(f, shape)
+    f, _ = chaos_wave_eval(tb, n_cutoff, xp)
+    return _restore(f, shape)
+
+
+def inverse_N(n, xp=None):
+    """Height t with smooth zero count N(t) = n (inverse Riemann-von Mangoldt); same shape as n."""
+    xp = _infer_xp(n, xp)
+    nb, shape = _as_batch(n, xp)
+    return _restore(batched_macro(nb, xp), shape)
+
+
+def predict_zeros(n_array, stiffness=0.95, n_cutoff=20, xp=None, method="chaos", isolation=None, precision="float64"):
+    """Three-step prediction of the zeros with indices n_array; same shape as n_array."""
+    xp = _infer_xp(n_array, xp)
+    nb, shape = _as_batch(n_array, xp)
+    t = predict_zero_three_step_batched(
+        nb, stiffness=stiffness, n_cutoff=n_cutoff, xp=xp, method=method, isolation=isolation, precision=precision
+    )
+    return _restore(t, shape)
+
+
+def predict_zero_three_step(
+    n, previous_zero=None, stiffness=0.95, n_cutoff=20, search_window=0.5, method="chaos", isolation="gram", stats=None
+):
+    """
+    Sequential (scalar) three-step prediction of the n-th zero.
+
+    Args:
+        n: Zero index (1-indexed)
+        previous_zero: Previous zero value (for spectral rigidity correction)
+        stiffness: Spectral rigidity stiffness factor
+        n_cutoff: Number of terms in the chaos wave main sum
+        search_window: Half-width of the fallback bracket around the micro prediction
+        method: Z evaluator ("chaos", "riemann_siegel" or "odlyzko_schonhage")
+        isolation: "gram" solves on the Gram-block sign-change bracket of zero n,
+            falling back to the search window if it cannot be bracketed;
+            "window" uses only the search window
+        stats: optional dict; stats["unbracketed"] counts Gram isolation
+            failures and stats["no_sign_change"] predictions returned without a root
+
+    Returns:
+        float: predicted zero height
+    """
+    # Step 1 (and the n-1 theory point for step 2) in one batched solve
+    t_macro, t_prev_theory = batched_macro(np.array([n, max(n - 1, 1)], dtype=float), np)
+
+    # Step 2: Microscopic correction (if previous zero available)
+    if previous_zero is not None and n > 1:
+        t_micro = t_macro + (previous_zero - t_prev_theory) * stiffness
+    else:
+        t_micro = t_macro
+
+    # Step 3: Chaos engine refinement on the Gram bracket (or the fixed window),
+    # shared with predict_zeros_chained so both give the same answers
+    bracket = None
+    if isolation == "gram":
+        bracket = isolate_zeros(np.array([n], dtype=float), n_cutoff, np, method)
+        if stats is not None and not bracket[3][0]:
+            stats["unbracketed"] = stats.get("unbracketed", 0) + 1
+    t_final, has_root = refine_isolated(np.array([t_micro]), n_cutoff, np, method, search_window, bracket)
+    if stats is not None and not has_root[0]:
+        stats["no_sign_change"] = stats.get("no_sign_change", 0) + 1
+    return float(t_final[0])
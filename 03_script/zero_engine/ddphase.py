@@ -0,0 +1,167 @@
+"""
+Double-double phases for the chaos wave at large heights (method "chaos_dd").
+
+In float64, theta(t) ~ (t/2) log t and t log n carry an absolute error of about
+1e-16 of their size: 1e-5 rad at t = 1e10 and a full radian past t = 1e15, so
+cos/sin of the raw phases turn into noise long before t itself runs out of
+digits. Here a float64 t is taken as exact and the phases are computed in
+double-double arithmetic (pairs hi + lo built from error-free transformations:
+two_sum, and two_prod via Dekker splitting, so no FMA is needed) and reduced
+mod 2 pi before the float64 cos/sin. Everything is elementwise on NumPy or
+CuPy arrays.
+
+  log t          e ln 2 + log c_j + 2 atanh((m - c_j) / (m + c_j)) for
+                 t = m 2^e, c_j = 1 + j / DD_LOG_TABLE, with the table and the
+                 constants from decimal (stdlib) to ~40 digits
+  theta(t)       (t/2) log(t / 2pi) - t/2 - pi/8 (the chaos wave's theta)
+  t log p        two_prod(t, log p hi) + t log p lo
+
+The reduced phases are accurate to a few ulps of 2 pi, so Z is evaluated
+faithfully at the float64 point t; the zeros themselves remain limited by the
+spacing of float64 numbers near t (1.5e-5 at 1e11, 0.03 at 2e14).
+"""
+
+import decimal
+
+import numpy as np
+
+# log(m) table resolution: c_j = 1 + j / DD_LOG_TABLE on [1, 2].
+DD_LOG_TABLE = 4096
+# Dekker splitter 2^27 + 1.
+_SPLITTER = 134217729.0
+_DEC = decimal.Context(prec=45)
+_PI = decimal.Decimal("3.14159265358979323846264338327950288419716939937510582097494")
+
+
+def _dd_const(d):
+    """Decimal -> (hi, lo) float pair."""
+    hi = float(d)
+    return hi, float(_DEC.subtract(d, decimal.Decimal(hi)))
+
+
+TWO_PI_DD = _dd_const(_DEC.multiply(_PI, 2))
+PI_8_DD = _dd_const(_DEC.divide(_PI, 8))
+LN2_DD = _dd_const(_DEC.ln(decimal.Decimal(2)))
+LOG_TWO_PI_DD = _dd_const(_DEC.ln(_DEC.multiply(_PI, 2)))
+
+
+def dd_log_table(values):
+    """(hi, lo) host arrays of the natural log of positive numbers (given exactly as ints/floats/Decimals)."""
+    pairs = [_dd_const(_DEC.ln(decimal.Decimal(v))) for v in values]
+    return np.array([p[0] for p in pairs]), np.array([p[1] for p in pairs])
+
+
+_TABLES = {}
+
+
+def _log_c_table(xp):
+    key = xp.__name__
+    table = _TABLES.get(key)
+    if table is None:
+        c = [decimal.Decimal(DD_LOG_TABLE + j) / DD_LOG_TABLE for j in range(DD_LOG_TABLE + 1)]
+        hi, lo = dd_log_table(c)
+        table = (xp.asarray(hi), xp.asarray(lo))
+        _TABLES[key] = table
+    return table
+
+
+def two_sum(a, b):
+    """s + e == a + b exactly (Knuth)."""
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def quick_two_sum(a, b):
+    """s + e == a + b exactly, for |a| >= |b|."""
+    s = a + b
+    return s, b - (s - a)
+
+
+def _split(a):
+    t = _SPLITTER * a
+    hi = t - (t - a)
+    return hi, a - hi
+
+
+def two_prod(a, b):
+    """p + e == a * b exactly (Dekker; |a|, |b| well below 1e300)."""
+    p = a * b
+    ah, al = _split(a)
+    bh, bl = _split(b)
+    return p, ((ah * bh - p) + ah * bl + al * bh) + al * bl
+
+
+def dd_add(ah, al, bh, bl):
+    """(ah + al) + (bh + bl) in double-double."""
+    s, e = two_sum(ah, bh)
+    t, f = two_sum(al, bl)
+    s, e = quick_two_sum(s, e + t)
+    return quick_two_sum(s, e + f)
+
+
+def dd_mul_d(ah, al, b):
+    """(ah + al) * b in double-double."""
+    p, e = two_prod(ah, b)
+    return quick_two_sum(p, e + al * b)
+
+
+def dd_div_dd(a, bh, bl):
+    """a / (bh + bl) for a float a, in double-double."""
+    q1 = a / bh
+    p, e = dd_mul_d(bh, bl, q1)
+    rh, rl = dd_add(a, 0.0, -p, -e)
+    q2 = rh / bh
+    return quick_two_sum(q1, q2)
+
+
+def dd_log(x, xp):
+    """(hi, lo) of log x for positive float64 x (elementwise)."""
+    x = xp.asarray(x, dtype=float)
+    m, e = xp.frexp(x)  # x = m 2^e, m in [0.5, 1)
+    m = m * 2.0
+    e = (e - 1).astype(float)
+    j = xp.rint((m - 1.0) * DD_LOG_TABLE)
+    c = 1.0 + j / DD_LOG_TABLE
+    num = m - c  # exact: m and c share the exponent and are within 1 / DD_LOG_TABLE
+    dh, dl = two_sum(m, c)
+    sh, sl = dd_div_dd(num, dh, dl)
+    # 2 atanh(s) = 2 s (1 + s^2/3 + s^4/5 + ...), |s| < 1 / (4 DD_LOG_TABLE): the tail is tiny
+    s2 = sh * sh
+    q = s2 * (1.0 / 3.0 + s2 * (1.0 / 5.0 + s2 * (1.0 / 7.0)))
+    ph, pl = two_prod(sh, q)
+    ah, al = dd_add(sh, sl, ph, pl + sl * q)
+    log_hi, log_lo = _log_c_table(xp)
+    ji = j.astype(xp.int64)
+    eh, el = dd_mul_d(LN2_DD[0], LN2_DD[1], e)
+    rh, rl = dd_add(eh, el, log_hi[ji], log_lo[ji])
+    return dd_add(rh, rl, 2.0 * ah, 2.0 * al)
+
+
+def reduce_2pi(hi, lo, xp):
+    """(hi + lo) mod 2 pi as a float in [-pi, pi] (for |hi| < 2^52 * 2 pi)."""
+    k = xp.rint(hi / TWO_PI_DD[0])
+    kh, kl = dd_mul_d(TWO_PI_DD[0], TWO_PI_DD[1], k)
+    rh, rl = dd_add(hi, lo, -kh, -kl)
+    return rh + rl
+
+
+def theta_dd(t, xp):
+    """Reduced theta(t) mod 2 pi of the chaos wave's theta, (t/2) log(t/2pi) - t/2 - pi/8."""
+    t = xp.asarray(t, dtype=float)
+    lh, ll = dd_log(t, xp)
+    lh, ll = dd_add(lh, ll, -LOG_TWO_PI_DD[0], -LOG_TWO_PI_DD[1])
+    half = 0.5 * t
+    ph, pl = dd_mul_d(lh, ll, half)
+    ph, pl = dd_add(ph, pl, -half, 0.0)
+    ph, pl = dd_add(ph, pl, -PI_8_DD[0], -PI_8_DD[1])
+    return reduce_2pi(ph, pl, xp)
+
+
+def phase_dd(t, log_hi, log_lo, xp):
+    """(t * log) mod 2 pi for t of shape (k,) and a double-double log table of shape (r,): shape (r, k)."""
+    t = xp.asarray(t, dtype=float)[None, :]
+    ph, pl = two_prod(t, log_hi[:, None])
+    pl = pl + t * log_lo[:, None]
+    ph, pl = quick_two_sum(ph, pl)
+    return reduce_2pi(ph, pl, xp)
@@ -0,0 +1,163 @@
+"""
+Height-interval discovery: every zero of Z in [t1, t2], labelled with its index.
+
+The scan runs over segments [g_a, g_b] between good Gram points (g_j is good
+when (-1)^j Z(g_j) > 0). Each segment is sampled on the grid theta(t) =
+pi * (a + k / oversample), i.e. Gram points at fractional index, so the step
+follows the local mean zero spacing 2 pi / log(t / 2 pi) at every height. Sign
+changes are found in one vectorized pass. By Rosser's rule every Gram block
+[g_c, g_d] (good end points) holds d - c zeros; blocks with fewer sign changes
+(close pairs inside one grid step) are rescanned at doubled density, up to
+MAX_OVERSAMPLE. All brackets of a segment are then refined in one batched
+bracketed Newton pass (batched_chaos_refinement).
+
+Labels come from the zero count at the good Gram point that opens the segment:
+N(g_a) = theta(g_a) / pi + 1 = a + 1, so the zeros found in the segment are
+numbered a + 2, a + 3, ... (the numbering of gram_brackets / predict_zeros).
+
+The default evaluator is the full Riemann-Siegel formula: the fixed 20-term
+chaos wave is not a faithful Z at large heights (its sign changes violate
+Rosser's rule), which the "missing" counter makes visible.
+"""
+
+import numpy as np
+
+from .backend import to_numpy
+from .core import Z, batched_chaos_refinement
+from .gram import gram_points
+from .riemann_siegel import theta_stirling
+
+# Grid points per mean zero spacing in the first scan.
+SCAN_OVERSAMPLE = 8
+# Densest rescan of a Gram block that is missing sign changes.
+MAX_OVERSAMPLE = 256
+# Gram intervals per streamed segment (about as many zeros).
+SEGMENT_GRAM = 1 << 16
+# Gram points searched below/above a target for a good one.
+GOOD_SEARCH = 64
+
+
+def _good(j, zfunc, xp):
+    """(-1)^j Z(g_j) > 0 for an integer array j."""
+    return (1.0 - 2.0 * xp.mod(j, 2)) * zfunc(gram_points(j, xp)) > 0
+
+
+def good_gram_index(t, zfunc, xp, direction=-1):
+    """Index j of the nearest good Gram point g_j <= t (direction -1) or >= t (+1)."""
+    j0 = int(np.floor(float(to_numpy(theta_stirling(xp.asarray([float(t)]), xp))[0]) / np.pi))
+    return _nearest_good(j0 + 1 if direction > 0 else j0, zfunc, xp, direction)
+
+
+def _nearest_good(j0, zfunc, xp, direction):
+    """Nearest good Gram index at or below (direction -1) / above (+1) j0."""
+    for shift in range(0, 16 * GOOD_SEARCH, GOOD_SEARCH):
+        if direction < 0:
+            j = xp.arange(j0 - shift, j0 - shift - GOOD_SEARCH, -1)
+        else:
+            j = xp.arange(j0 + shift, j0 + shift + GOOD_SEARCH)
+        j = j[j >= -1]
+        if j.size == 0:
+            break
+        good = to_numpy(_good(j, zfunc, xp))
+        if good.any():
+            return int(to_numpy(j)[np.argmax(good)])
+    return max(j0, -1)
+
+
+def _sign_changes(a, b, oversample, zfunc, xp):
+    """Grid over Gram intervals a..b at oversample points each: (t, z, change) with change[i] for (t[i], t[i+1])."""
+    k = a + xp.arange((b - a) * oversample + 1) / oversample
+    t = gram_points(k, xp)
+    z = zfunc(t)
+    return t, z, (z[:-1] * z[1:]) < 0
+
+
+def scan_segment(a, b, zfunc, xp, oversample=SCAN_OVERSAMPLE, max_oversample=MAX_OVERSAMPLE, stats=None):
+    """
+    Sign-change brackets (lo, hi, sign_lo) of the zeros in [g_a, g_b] (a, b good Gram indices).
+
+    stats: optional dict; "rescanned_blocks" counts Gram blocks scanned again at
+    higher density and "missing" the zeros still not separated at max_oversample.
+    """
+    t, z, change = _sign_changes(a, b, oversample, zfunc, xp)
+    keep = change.copy()
+    # Rosser check per Gram block: good Gram points are every oversample-th grid point
+    zg = z[::oversample]
+    j = a + xp.arange(b - a + 1)
+    good = to_numpy((1.0 - 2.0 * xp.mod(j, 2)) * zg > 0)
+    good[0] = good[-1] = True
+    per_interval = to_numpy(change.reshape(b - a, oversample).sum(axis=1))
+    starts = np.flatnonzero(good[:-1])
+    ends = np.append(starts[1:], b - a)
+    found = np.add.reduceat(per_interval, starts)
+    extra = [[], [], []]
+    for c, d, n_found in zip(starts.tolist(), ends.tolist(), found.tolist()):
+        if n_found >= d - c:
+            continue
+        if stats is not None:
+            stats["rescanned_blocks"] = stats.get("rescanned_blocks", 0) + 1
+        dense = oversample
+        tb = None
+        while n_found < d - c and dense < max_oversample:
+            dense *= 2
+            tb, zb, cb = _sign_changes(a + c, a + d, dense, zfunc, xp)
+            n_found = int(to_numpy(xp.count_nonzero(cb)))
+        if tb is not None and n_found > int(per_interval[c:d].sum()):
+            keep[c * oversample:d * oversample] = False
+            pos = xp.flatnonzero(cb)
+            extra[0].append(tb[pos])
+            extra[1].append(tb[pos + 1])
+            extra[2].append(xp.sign(zb[pos]))
+        if n_found < d - c and stats is not None:
+            stats["missing"] = stats.get("missing", 0) + (d - c) - n_found
+    pos = xp.flatnonzero(keep)
+    lo = xp.concatenate([t[pos]] + extra[0])
+    hi = xp.concatenate([t[pos + 1]] + extra[1])
+    sign_lo = xp.concatenate([xp.sign(z[pos])] + extra[2])
+    order = xp.argsort(lo)
+    return lo[order], hi[order], sign_lo[order]
+
+
+def iter_zeros_in_interval(
+    t1,
+    t2,
+    n_cutoff=20,
+    xp=np,
+    method="riemann_siegel",
+    oversample=SCAN_OVERSAMPLE,
+    segment=SEGMENT_GRAM,
+    stats=None,
+):
+    """
+    Stream the zeros with t1 <= t <= t2 as (n, t) array pairs, one per segment.
+
+    Segments hold about `segment` zeros each, so memory stays bounded for long
+    intervals. stats: optional dict with "segments", "zeros", "rescanned_blocks"
+    and "missing" (zeros a Gram block should hold but no sign change was found
+    for; labels after such a block may be off by that count).
+    """
+    zfunc = lambda t: Z(t, n_cutoff, xp, method)  # noqa: E731
+    a = good_gram_index(t1, zfunc, xp, -1)
+    b_end = good_gram_index(t2, zfunc, xp, +1)
+    while a < b_end:
+        b = b_end if b_end - a <= segment else _nearest_good(a + segment, zfunc, xp, -1)
+        if b <= a:
+            b = b_end
+        lo, hi, sign_lo = scan_segment(a, b, zfunc, xp, oversample, stats=stats)
+        ok = xp.ones(lo.shape, dtype=bool)
+        t = batched_chaos_refinement(0.5 * (lo + hi), n_cutoff, xp, method=method, bracket=(lo, hi, sign_lo, ok))
+        n = a + 2 + xp.arange(t.size)
+        inside = (t >= t1) & (t <= t2)
+        if stats is not None:
+            stats["segments"] = stats.get("segments", 0) + 1
+            stats["zeros"] = stats.get("zeros", 0) + int(to_numpy(xp.count_nonzero(inside)))
+        yield n[inside], t[inside]
+        a = b
+
+
+def zeros_in_interval(t1, t2, n_cutoff=20, xp=np, method="riemann_siegel", oversample=SCAN_OVERSAMPLE, stats=None):
+    """All zeros with t1 <= t <= t2 as (n, t) arrays (see iter_zeros_in_interval)."""
+    parts = list(iter_zeros_in_interval(t1, t2, n_cutoff, xp, method, oversample, stats=stats))
+    if not parts:
+        return xp.zeros(0, dtype=xp.int64), xp.zeros(0)
+    return xp.concatenate([p[0] for p in parts]), xp.concatenate([p[1] for p in parts])
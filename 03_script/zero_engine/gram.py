@@ -0,0 +1,162 @@
+"""
+Gram points and Gram-block zero isolation.
+
+Gram point g_k solves theta(g_k) = k*pi. Under Gram's law the n-th zero lies in
+(g_{n-2}, g_{n-1}) and (-1)^k Z(g_k) > 0 ("good" Gram point) at both ends, which
+guarantees a sign change. Where the law fails, the interval is widened to the
+enclosing Gram block [g_a, g_b] (good end points, bad interior); by Rosser's rule
+the block holds b - a zeros, numbered a + 2 .. b + 1, and the block is scanned on
+a progressively finer grid until that many sign changes are found, or until a
+finer grid finds no new one (an approximate Z such as the 20-term chaos wave
+need not have the zeros Rosser's rule promises). Zeros that cannot be
+bracketed this way are reported instead of being clamped silently.
+"""
+
+import numpy as np
+
+from .backend import to_numpy
+from .ddphase import theta_dd
+from .riemann_siegel import TWO_PI, theta_stirling, theta_stirling_derivative
+
+# Largest Gram block (in Gram intervals) searched around a failing interval.
+MAX_BLOCK = 16
+# Samples per Gram interval in the first block scan, doubled up to MAX_SAMPLES.
+BLOCK_SAMPLES = 4
+MAX_SAMPLES = 64
+
+
+def gram_points(k, xp, max_iter=20, tol=1e-13, dd=False):
+    """
+    Gram points g_k (theta(g_k) = k*pi) for an integer array k >= -1.
+
+    Seeded from theta(t) ~ (t/2) log(t/(2 pi e)) - pi/8, i.e.
+    t = 2 pi (k + 1/8) / W0((k + 1/8)/e) with the asymptotic W0 estimate,
+    then polished with Newton on theta_stirling. dd=True adds Newton steps on
+    the double-double theta mod 2 pi (ddphase.theta_dd), whose float64 value is
+    off by ~1e-16 theta: that matters from t ~ 1e12 on.
+    """
+    kf = xp.asarray(k, dtype=float)
+    m = xp.maximum(kf + 0.125, 0.125)
+    x = m / np.e
+    L1 = xp.log(xp.maximum(x, np.e))
+    L2 = xp.log(L1)
+    w = xp.where(x < np.e, xp.log1p(x), L1 - L2 + L2 / L1)
+    t = xp.maximum(TWO_PI * m / w, 9.0)
+    idx = xp.arange(t.size)
+    for _ in range(max_iter):
+        ti = t[idx]
+        step = (theta_stirling(ti, xp) - np.pi * kf[idx]) / theta_stirling_derivative(ti, xp)
+        t[idx] = ti - step
+        idx = idx[xp.abs(step) > tol * ti]
+        if idx.size == 0:
+            break
+    if dd:
+        parity = np.pi * xp.mod(kf, 2.0)
+        for _ in range(2):
+            r = xp.remainder(theta_dd(t, xp) - parity + np.pi, TWO_PI) - np.pi
+            t = t - r / theta_stirling_derivative(t, xp)
+    return t
+
+
+def _gram_sign(j, xp):
+    """(-1)^j for an integer array j."""
+    return 1.0 - 2.0 * xp.mod(j, 2)
+
+
+def _is_good(j, zfunc, xp, dd=False):
+    """(-1)^j Z(g_j) > 0 for each Gram index j."""
+    return _gram_sign(j, xp) * zfunc(gram_points(j, xp, dd=dd)) > 0
+
+
+def _scan_block(a, width, block, r, zfunc, xp, samples, dd=False):
+    """
+    Sign-change brackets of the r-th zero inside Gram blocks [g_a, g_a+width].
+
+    a holds distinct block starts, all of the same width; block maps each
+    queried zero to its row of a and r is its 0-based rank inside the block.
+    Each block is sampled once with `samples` points per Gram interval. Returns
+    (lo, hi, sign_lo, counts) per queried zero, counts being the number of sign
+    changes found in its block.
+    """
+    j = a[:, None] + xp.arange(width + 1)[None, :]
+    g = gram_points(j.ravel(), xp, dd=dd).reshape(j.shape)
+    frac = xp.arange(samples) / samples
+    pts = g[:, :-1, None] + (g[:, 1:, None] - g[:, :-1, None]) * frac[None, None, :]
+    pts = xp.concatenate([pts.reshape(pts.shape[0], -1), g[:, -1:]], axis=1)
+    z = zfunc(pts.ravel()).reshape(pts.shape)
+    change = (z[:, :-1] * z[:, 1:]) < 0
+    # Position of the (r+1)-th sign change for each queried zero
+    rank = xp.cumsum(change, axis=1)[block]
+    pos = xp.argmax(rank > r[:, None], axis=1)
+    lo = pts[block, pos]
+    hi = pts[block, pos + 1]
+    return lo, hi, xp.sign(z[block, pos]), rank[:, -1]
+
+
+def gram_brackets(n_array, zfunc, xp, max_block=MAX_BLOCK, samples=BLOCK_SAMPLES, max_samples=MAX_SAMPLES, dd=False):
+    """
+    Sign-change bracket [lo, hi] of the n-th zero for each n >= 1.
+
+    zfunc(t) returns Z on a 1-D array. Returns (lo, hi, sign_lo, ok): sign_lo is
+    the sign of Z(lo) and ok marks bracketed zeros (lo/hi are NaN elsewhere).
+    dd: place the Gram points with the double-double theta (see gram_points).
+    """
+    n = xp.asarray(n_array, dtype=float).astype(xp.int64)
+    k = n - 2
+    # Z at each distinct Gram point of the intervals (g_k, g_k+1) once
+    js = xp.unique(xp.concatenate([k, k + 1]))
+    g = gram_points(js, xp, dd=dd)
+    good_js = _gram_sign(js, xp) * zfunc(g) > 0
+    pos_k = xp.searchsorted(js, k)
+    pos_k1 = xp.searchsorted(js, k + 1)
+    lo = g[pos_k]
+    hi = g[pos_k1]
+    sign_lo = _gram_sign(k, xp)
+    ok = good_js[pos_k] & good_js[pos_k1]
+
+    bad = xp.flatnonzero(~ok)
+    if bad.size == 0:
+        return lo, hi, sign_lo, ok
+    lo[bad] = xp.nan
+    hi[bad] = xp.nan
+    # Grow each failing interval to the enclosing Gram block
+    a = k[bad].copy()
+    b = k[bad] + 1
+    left_good = good_js[pos_k[bad]]
+    right_good = good_js[pos_k1[bad]]
+    for _ in range(max_block):
+        grow_left = ~left_good & (a > -1) & (b - a < max_block)
+        grow_right = ~right_good & (b - a < max_block)
+        if not bool(xp.any(grow_left | grow_right)):
+            break
+        a = xp.where(grow_left, a - 1, a)
+        b = xp.where(grow_right, b + 1, b)
+        if bool(xp.any(grow_left)):
+            left_good[grow_left] = _is_good(a[grow_left], zfunc, xp, dd)
+        if bool(xp.any(grow_right)):
+            right_good[grow_right] = _is_good(b[grow_right], zfunc, xp, dd)
+    in_block = left_good & right_good
+    rows = xp.flatnonzero(in_block)
+    # Sign changes found so far per row: a row whose count does not grow when the
+    # sampling doubles is left unbracketed (the evaluator does not have the zeros
+    # Rosser's rule asks for, e.g. the 20-term chaos wave at larger heights)
+    prev = xp.full(rows.shape, -1, dtype=xp.int64)
+    while rows.size and samples <= max_samples:
+        width = b[rows] - a[rows]
+        counts = xp.zeros(rows.shape, dtype=xp.int64)
+        for w in to_numpy(xp.unique(width)).tolist():
+            sel = xp.flatnonzero(width == w)
+            starts, block = xp.unique(a[rows[sel]], return_inverse=True)
+            # Zero n is number n - (a + 2) = k - a (0-based) inside its block
+            r = k[bad[rows[sel]]] - a[rows[sel]]
+            blo, bhi, bsign, counts[sel] = _scan_block(starts, int(w), block.ravel(), r, zfunc, xp, samples, dd)
+            found = counts[sel] >= w
+            hit = bad[rows[sel[found]]]
+            lo[hit] = blo[found]
+            hi[hit] = bhi[found]
+            sign_lo[hit] = bsign[found]
+            ok[hit] = True
+        retry = (counts < width) & (counts > prev)
+        rows, prev = rows[retry], counts[retry]
+        samples *= 2
+    return lo, hi, sign_lo, ok
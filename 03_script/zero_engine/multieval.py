@@ -0,0 +1,255 @@
+"""
+Odlyzko-Schonhage style multi-evaluation of Z(t) in a height window.
+
+The Riemann-Siegel main sum F(t) = sum_{n<=N} n^(-1/2) exp(-i t log n) is
+band-limited (frequencies in [-log N, 0]). ZGrid evaluates it once on an
+equispaced grid covering [t_lo, t_hi] with a type-1 non-uniform FFT
+(Gaussian gridding, Greengard & Lee 2004), then serves arbitrary points by
+Gaussian-windowed sinc interpolation:
+
+    Z(t) = 2 Re(exp(i theta(t)) F(t)) + R(t)
+
+Grid cost is O(N + M log M) for M grid points, each query is O(1) (a fixed
+2K+1 point stencil), so the amortized cost per zero in a dense window no longer
+grows like sqrt(t). N is taken at the bottom of the window; the few extra terms
+N_lo < n <= N(t) are added directly per query.
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from .backend import to_numpy
+from .riemann_siegel import (
+    TWO_PI,
+    riemann_siegel_eval,
+    rs_remainder,
+    theta_stirling,
+    theta_stirling_derivative,
+)
+
+# Interpolation half-width K (stencil of 2K+1 grid points) and grid oversampling.
+INTERP_HALF_WIDTH = 40
+OVERSAMPLE = 2.0
+# NUFFT spreading half-width (grid points) and oversampling ratio.
+SPREAD_WIDTH = 12
+NUFFT_RATIO = 2
+# Evaluator policy: build a grid only when it has at most this many points per query
+# point, and keep at most GRID_CACHE_SIZE grids alive.
+MAX_GRID_PER_POINT = 64
+GRID_CACHE_SIZE = 8
+
+
+def nufft_type1(x, c, n_modes, xp=np, spread_width=SPREAD_WIDTH, ratio=NUFFT_RATIO):
+    """
+    f[k] = sum_n c[n] exp(-i (k - n_modes//2) x[n]) for k = 0..n_modes-1, x in [0, 2pi).
+
+    Gaussian gridding: spread c onto an oversampled periodic grid, FFT, deconvolve.
+    """
+    n_grid = int(ratio * n_modes)
+    n_grid += n_grid % 2
+    tau = (np.pi * spread_width) / (n_modes * n_modes * ratio * (ratio - 0.5))
+    h = TWO_PI / n_grid
+    # Nearest grid index and neighbor offsets
+    base = xp.floor(x / h).astype(xp.int64)
+    offsets = xp.arange(-spread_width + 1, spread_width + 1, dtype=xp.int64)
+    idx = base[:, None] + offsets[None, :]
+    dist = x[:, None] - idx * h
+    weights = xp.exp(-(dist * dist) / (4.0 * tau))
+    idx = idx % n_grid
+    wc = weights * c[:, None]
+    grid = xp.bincount(idx.ravel(), weights=wc.real.ravel(), minlength=n_grid) + 1j * xp.bincount(
+        idx.ravel(), weights=wc.imag.ravel(), minlength=n_grid
+    )
+    spec = xp.fft.fft(grid) / n_grid
+    k = xp.arange(n_modes) - n_modes // 2
+    f = spec[k % n_grid]
+    return np.sqrt(np.pi / tau) * xp.exp(k * k * tau) * f
+
+
+def _sinc_gauss(u, sigma, xp):
+    """Gaussian-windowed sinc kernel sinc(u) exp(-u^2 / (2 sigma^2)) and its derivative in u."""
+    g = xp.exp(-(u * u) / (2.0 * sigma * sigma))
+    pu = np.pi * u
+    small = xp.abs(u) < 1e-8
+    safe_u = xp.where(small, 1.0, u)
+    s = xp.where(small, 1.0, xp.sin(pu) / (np.pi * safe_u))
+    ds = xp.where(small, 0.0, (xp.cos(pu) - s) / safe_u)
+    k = s * g
+    dk = ds * g - s * g * u / (sigma * sigma)
+    return k, dk
+
+
+class ZGrid:
+    """
+    Z(t) on [t_lo, t_hi] via one NUFFT grid and band-limited interpolation.
+
+    eval(t) returns (Z, Z') for any t in the window; dense scans can use
+    z_on_grid() to get Z at every interior grid point.
+    """
+
+    def __init__(self, t_lo, t_hi, xp=np, interp_half_width=INTERP_HALF_WIDTH, oversample=OVERSAMPLE):
+        self.xp = xp
+        self.t_lo = float(t_lo)
+        self.t_hi = float(t_hi)
+        self.n_main = max(1, int(math.floor(math.sqrt(self.t_lo / TWO_PI))))
+        # F has frequencies in [-log N, 0]; G(t) = F(t) exp(i c t) is centered in [-beta, beta].
+        self.center = 0.5 * math.log(self.n_main)
+        beta = max(self.center, 0.5)
+        self.delta = np.pi / (oversample * beta)
+        self.half_width = int(interp_half_width)
+        self.sigma = math.sqrt(self.half_width / (np.pi * (1.0 - 1.0 / oversample)))
+        self.t0 = self.t_lo - (self.half_width + 1) * self.delta
+        self.size = int(math.ceil((self.t_hi - self.t0) / self.delta)) + self.half_width + 2
+        self.grid_t = self.t0 + self.delta * xp.arange(self.size, dtype=float)
+        self.G = self._build()
+
+    def _build(self):
+        """G(t_j) for all grid points via a type-1 NUFFT over n <= n_main."""
+        xp = self.xp
+        n = xp.arange(1, self.n_main + 1, dtype=float)
+        log_n = xp.log(n)
+        half = self.size // 2
+        # F(t0 + j delta) = sum_n b_n exp(-i j delta log n), b_n = n^-1/2 exp(-i t0 log n)
+        b = xp.exp(-1j * (self.t0 * log_n)) / xp.sqrt(n)
+        x = xp.mod(self.delta * log_n, TWO_PI)
+        # nufft_type1 uses modes k = j - half, so fold exp(-i half x) into the weights.
+        F = nufft_type1(x, b * xp.exp(-1j * half * x), self.size, xp)
+        return F * xp.exp(1j * self.center * self.grid_t)
+
+    def covers(self, t_min, t_max):
+        """True if [t_min, t_max] lies inside the window."""
+        return self.t_lo <= t_min and t_max <= self.t_hi
+
+    def _main_sum(self, t):
+        """F(t) and F'(t) at arbitrary points by windowed-sinc interpolation of G."""
+        xp = self.xp
+        pos = (t - self.t0) / self.delta
+        j0 = xp.rint(pos).astype(xp.int64)
+        offs = xp.arange(-self.half_width, self.half_width + 1, dtype=xp.int64)
+        idx = j0[:, None] + offs[None, :]
+        u = pos[:, None] - idx
+        k, dk = _sinc_gauss(u, self.sigma, xp)
+        g_vals = self.G[idx]
+        G = (g_vals * k).sum(axis=1)
+        dG = (g_vals * dk).sum(axis=1) / self.delta
+        rot = xp.exp(-1j * self.center * t)
+        F = G * rot
+        dF = (dG - 1j * self.center * G) * rot
+        return F, dF
+
+    def eval(self, t, with_derivative=True):
+        """(Z, Z') at points t inside [t_lo, t_hi] (Z only if with_derivative is False)."""
+        xp = self.xp
+        t = xp.asarray(t, dtype=float).reshape(-1)
+        F, dF = self._main_sum(t)
+        # Terms n_main < n <= N(t) not covered by the grid sum
+        n_t = xp.maximum(xp.floor(xp.sqrt(t / TWO_PI)), 1.0)
+        n_extra = int(xp.max(n_t)) - self.n_main if t.size else 0
+        if n_extra > 0:
+            n = xp.arange(self.n_main + 1, self.n_main + n_extra + 1, dtype=float)
+            log_n = xp.log(n)
+            w = (n[None, :] <= n_t[:, None]) / xp.sqrt(n)[None, :]
+            e = xp.exp(-1j * t[:, None] * log_n[None, :]) * w
+            F = F + e.sum(axis=1)
+            dF = dF + (-1j * log_n[None, :] * e).sum(axis=1)
+        theta = theta_stirling(t, xp)
+        rot = xp.exp(1j * theta)
+        z = 2.0 * (rot * F).real
+        if not with_derivative:
+            return z + rs_remainder(t, xp)
+        d_theta = theta_stirling_derivative(t, xp)
+        dz = 2.0 * (rot * (1j * d_theta * F + dF)).real
+        rem, drem = rs_remainder(t, xp, with_derivative=True)
+        return z + rem, dz + drem
+
+    def z_on_grid(self):
+        """Z at the interior grid points (dense scan): returns (t, Z)."""
+        sel = (self.grid_t >= self.t_lo) & (self.grid_t <= self.t_hi)
+        t = self.grid_t[sel]
+        return t, self.eval(t, with_derivative=False)
+
+
+_GRID_CACHE = OrderedDict()
+
+
+def grid_size_estimate(t_lo, t_hi, oversample=OVERSAMPLE):
+    """Approximate ZGrid point count for [t_lo, t_hi] (about oversample x the zero count)."""
+    log_n = max(0.5 * math.log(max(t_lo, TWO_PI) / TWO_PI), 1.0)
+    return (t_hi - t_lo) * oversample * log_n / (2.0 * np.pi) + 2 * INTERP_HALF_WIDTH
+
+
+def _window_splits(t_sorted, max_rel_span=0.01, max_gap=50.0):
+    """Split sorted heights into (start, stop) windows of bounded relative span and no gap > max_gap."""
+    size = int(t_sorted.size)
+    big_gaps = np.flatnonzero(np.diff(t_sorted) > max_gap) + 1
+    splits = []
+    start = 0
+    while start < size:
+        stop = int(np.searchsorted(t_sorted, t_sorted[start] * (1.0 + max_rel_span), side="right"))
+        k = int(np.searchsorted(big_gaps, start, side="right"))
+        if k < big_gaps.size:
+            stop = min(stop, int(big_gaps[k]))
+        splits.append((start, max(stop, start + 1)))
+        start = splits[-1][1]
+    return splits
+
+
+def _find_grid(t_lo, t_hi, xp):
+    """Cached grid covering [t_lo, t_hi] (marked most recently used), or None."""
+    for key, grid in _GRID_CACHE.items():
+        if grid.xp is xp and grid.covers(t_lo, t_hi):
+            _GRID_CACHE.move_to_end(key)
+            return grid
+    return None
+
+
+def get_grid(t_lo, t_hi, xp=np):
+    """Return a cached ZGrid covering [t_lo, t_hi], building one if needed."""
+    grid = _find_grid(t_lo, t_hi, xp)
+    if grid is not None:
+        return grid
+    grid = ZGrid(t_lo, t_hi, xp=xp)
+    _GRID_CACHE[(grid.t_lo, grid.t_hi, xp.__name__)] = grid
+    while len(_GRID_CACHE) > GRID_CACHE_SIZE:
+        _GRID_CACHE.popitem(last=False)
+    return grid
+
+
+def clear_grid_cache():
+    """Drop all cached grids."""
+    _GRID_CACHE.clear()
+
+
+def multi_eval(t, xp=np, margin=1.0, with_derivative=True):
+    """
+    (Z, Z') for a batch via Odlyzko-Schonhage grids where the batch is dense.
+
+    The sorted batch is cut into windows (bounded span, no large gaps); a window
+    gets a grid (padded by margin for Newton moves) if the grid has at most
+    MAX_GRID_PER_POINT points per query point, otherwise it is evaluated with
+    the direct Riemann-Siegel sum. Returns Z alone when with_derivative is False.
+    """
+    t = xp.asarray(t, dtype=float).reshape(-1)
+    order = xp.argsort(t)
+    t_host = to_numpy(t[order])
+    f = xp.empty_like(t)
+    fp = xp.empty_like(t) if with_derivative else None
+    for a, b in _window_splits(t_host):
+        sel = order[a:b]
+        lo, hi = float(t_host[a]), float(t_host[b - 1])
+        grid = _find_grid(lo, hi, xp)
+        if grid is None and grid_size_estimate(lo - margin, hi + margin) <= MAX_GRID_PER_POINT * (b - a):
+            grid = get_grid(max(lo - margin, 1.0), hi + margin, xp)
+        if grid is not None:
+            out = grid.eval(t[sel], with_derivative=with_derivative)
+        else:
+            out = riemann_siegel_eval(t[sel], xp, with_derivative=with_derivative)
+        if with_derivative:
+            f[sel], fp[sel] = out
+        else:
+            f[sel] = out
+    if not with_derivative:
+        return f
+    return f, fp
@@ -0,0 +1,194 @@
+"""
+CPU multi-process sharding of the batched predictor (NumPy backend).
+
+The index list is cut into contiguous shards of whole batches (a few shards per
+worker, so that the more expensive high-index shards do not end up on one
+worker). Workers write predictions, theoretical locations and per-batch times
+straight into shared-memory arrays and return only their refinement counters;
+the caller computes error statistics from the shared arrays with the same
+per-batch formulas as the single-process loop, so the merged summary is exact.
+
+With the chained micro step each shard starts without a previous zero; after
+the workers finish, every shard head is re-chained from the previous shard's
+last zero until it rejoins the stored values (the recurrence is deterministic,
+so once one element agrees all later ones do).
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import core
+from .backend import pool_context
+from .core import batched_macro, default_isolation, merge_histogram, predict_zero_three_step_batched, predict_zeros_chained
+
+# Shards per worker (dynamic load balancing across the pool).
+SHARDS_PER_WORKER = 4
+# First re-chain length when repairing a shard boundary (doubles until it rejoins).
+REPAIR_SPAN = 64
+
+
+def default_workers():
+    """Number of usable CPU cores."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def merge_refine_stats(acc, stats):
+    """
+    Merge one worker's refinement counters into acc (histograms add bin-wise, per-stage dicts key-wise).
+
+    Per-stage seconds of concurrent workers add up to CPU time, not wall time.
+    """
+    for key, value in stats.items():
+        if key == "newton_hist":
+            acc[key] = merge_histogram(acc.get(key), value)
+        elif isinstance(value, dict):
+            sub = acc.setdefault(key, {})
+            for stage, v in value.items():
+                sub[stage] = sub.get(stage, 0) + v
+        else:
+            acc[key] = acc.get(key, 0) + value
+    return acc
+
+
+def _shard_worker(task):
+    """Run the batches of one shard and write results into the shared arrays."""
+    (names, size, n_batches, n_values, b0, b1, batch_size, n_cutoff, method, isolation, chained, precision, block_bytes,
+     previous_zero) = task
+    core.set_chaos_block_bytes(block_bytes)
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        pred = np.ndarray((size,), dtype=np.float64, buffer=blocks[0].buf)
+        theory = np.ndarray((size,), dtype=np.float64, buffer=blocks[1].buf)
+        elapsed = np.ndarray((n_batches,), dtype=np.float64, buffer=blocks[2].buf)
+        stats = {}
+        chain_prev = previous_zero
+        offset = b0 * batch_size
+        for b in range(b0, b1):
+            i0 = b * batch_size - offset
+            i1 = min(i0 + batch_size, len(n_values))
+            start = time.perf_counter()
+            n_arr = np.asarray(n_values[i0:i1], dtype=float)
+            p = predict_zero_three_step_batched(
+                n_arr,
+                stiffness=0.95,
+                n_cutoff=n_cutoff,
+                xp=np,
+                stats=stats,
+                method=method,
+                isolation=isolation,
+                chained=chained,
+                previous_zero=chain_prev,
+                precision=precision,
+            )
+            t = batched_macro(n_arr, np, max_iter=15, tol=1e-10)
+            elapsed[b] = time.perf_counter() - start
+            pred[offset + i0:offset + i1] = p
+            theory[offset + i0:offset + i1] = t
+            if chained:
+                chain_prev = float(p[-1])
+        return stats
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _repair_shard_heads(n_values, pred, starts, n_cutoff, method, isolation, atol=1e-9):
+    """Re-chain each shard head from the previous shard's last zero until it rejoins pred."""
+    n_all = np.asarray(n_values, dtype=float)
+    for i in starts:
+        span = REPAIR_SPAN
+        while 0 < i < n_all.size:
+            j = min(n_all.size, i + span)
+            fresh = predict_zeros_chained(
+                n_all[i:j], previous_zero=float(pred[i - 1]), n_cutoff=n_cutoff, xp=np, method=method, isolation=isolation
+            )
+            same = np.flatnonzero(np.abs(fresh - pred[i:j]) <= atol)
+            if same.size:
+                pred[i:i + same[0]] = fresh[:same[0]]
+                break
+            pred[i:j] = fresh
+            i = j
+            span *= 2
+
+
+class ShardPool:
+    """
+    Persistent process pool for run_shards (reused across duration-mode runs).
+
+    Use as a context manager or call close(); workers are spawned once (see
+    backend.pool_context).
+    """
+
+    def __init__(self, workers=None):
+        self.workers = int(workers or default_workers())
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context())
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run_shards(
+        self, n_values, batch_size, n_cutoff=20, method="chaos", isolation=None, chained=False, precision="float64",
+        previous_zero=None,
+    ):
+        """
+        Predict all n_values in batches of batch_size across the pool.
+
+        Returns (predictions, t_theory, batch_elapsed, stats, wall_sec): host
+        arrays in n_values order, per-batch compute seconds, merged refinement
+        counters, and the wall-clock time of the whole sharded run. Workers use
+        the caller's current core.CHAOS_BLOCK_BYTES (see tuning.autotune).
+        isolation=None picks core.default_isolation(method, precision).
+        previous_zero: with chained=True, the zero before n_values[0] (seeds the first shard).
+        """
+        isolation = isolation or default_isolation(method, precision)
+        size = len(n_values)
+        n_batches = (size + batch_size - 1) // batch_size
+        n_shards = max(1, min(n_batches, self.workers * SHARDS_PER_WORKER))
+        bounds = np.linspace(0, n_batches, n_shards + 1).astype(int)
+        blocks = [
+            shared_memory.SharedMemory(create=True, size=max(8, size * 8)),
+            shared_memory.SharedMemory(create=True, size=max(8, size * 8)),
+            shared_memory.SharedMemory(create=True, size=max(8, n_batches * 8)),
+        ]
+        names = [block.name for block in blocks]
+        try:
+            wall_start = time.perf_counter()
+            tasks = []
+            for b0, b1 in zip(bounds[:-1], bounds[1:]):
+                if b1 <= b0:
+                    continue
+                i0 = b0 * batch_size
+                i1 = min(b1 * batch_size, size)
+                tasks.append(
+                    (names, size, n_batches, np.asarray(n_values[i0:i1]), int(b0), int(b1), batch_size,
+                     n_cutoff, method, isolation, chained, precision, core.CHAOS_BLOCK_BYTES,
+                     previous_zero if b0 == 0 else None)
+                )
+            stats = {}
+            for shard_stats in self._executor.map(_shard_worker, tasks):
+                merge_refine_stats(stats, shard_stats)
+            pred = np.ndarray((size,), dtype=np.float64, buffer=blocks[0].buf).copy()
+            theory = np.ndarray((size,), dtype=np.float64, buffer=blocks[1].buf).copy()
+            elapsed = np.ndarray((n_batches,), dtype=np.float64, buffer=blocks[2].buf).copy()
+            if chained:
+                starts = sorted({int(b0) * batch_size for b0 in bounds[1:-1] if b0 > 0})
+                _repair_shard_heads(n_values, pred, starts, n_cutoff, method, isolation)
+            wall = time.perf_counter() - wall_start
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        return pred, theory, elapsed, stats, wall
@@ -0,0 +1,184 @@
+"""
+Validation against reference zero tables (one zero height per line).
+
+ingest_reference parses a text table once into a binary cache: the file is cut
+into byte ranges at line boundaries, worker processes count the values in each
+range, and then parse their range straight into one preallocated memory-mapped
+.npy column at its row offset. A small JSON file records the source size and
+mtime, so later runs reuse the cache without touching the text.
+
+validate_chunks joins predictions with the reference on the zero index, one
+chunk at a time (the reference is a memmap, predictions arrive as (n, t)
+chunks, e.g. from an NpySink), and accumulates absolute and relative errors in
+fixed log-spaced histograms. Quantiles over hundreds of millions of zeros come
+from those histograms (resolution REF_BINS_PER_DECADE per decade), so neither
+side is ever loaded into RAM.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .backend import pool_context
+from .parallel import default_workers
+
+REF_FILE = "t.npy"
+REF_META = "reference.json"
+# Byte range parsed by one task.
+REF_PARSE_BYTES = 64 << 20
+# Rows per validation chunk.
+REF_CHUNK = 1 << 20
+# Error histogram range (decades) and resolution.
+REF_MIN_DECADE = -18
+REF_MAX_DECADE = 4
+REF_BINS_PER_DECADE = 20
+# Quantiles reported by ErrorHistogram.summary.
+REF_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+def _line_ranges(path, size, parse_bytes):
+    """Byte ranges of about parse_bytes that start and end on line boundaries."""
+    bounds = [0]
+    with open(path, "rb") as f:
+        pos = parse_bytes
+        while pos < size:
+            f.seek(pos)
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            bounds.append(pos)
+            pos += parse_bytes
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _read_range(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def _count_task(task):
+    path, start, end = task
+    return len(_read_range(path, start, end).split())
+
+
+def _parse_task(task):
+    path, start, end, out_path, row = task
+    values = np.array(_read_range(path, start, end).split()).astype(np.float64)
+    out = np.load(out_path, mmap_mode="r+")
+    out[row:row + values.size] = values
+    out.flush()
+    return values.size
+
+
+def ingest_reference(text_path, cache_dir, first_index=1, workers=None, parse_bytes=REF_PARSE_BYTES):
+    """
+    Parse a one-zero-per-line table into cache_dir (once) and return open_reference(cache_dir).
+
+    first_index: zero index of the first line. The cache is rebuilt when the
+    source size, mtime or first_index changed.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    st = os.stat(text_path)
+    source = {"path": os.path.abspath(text_path), "size": st.st_size, "mtime": st.st_mtime, "first_index": int(first_index)}
+    meta_path = os.path.join(cache_dir, REF_META)
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("source") == source:
+            return open_reference(cache_dir)
+    ranges = _line_ranges(text_path, st.st_size, parse_bytes)
+    out_path = os.path.join(cache_dir, REF_FILE)
+    with ProcessPoolExecutor(max_workers=int(workers or default_workers()), mp_context=pool_context()) as pool:
+        counts = list(pool.map(_count_task, [(text_path, a, b) for a, b in ranges]))
+        rows = np.concatenate(([0], np.cumsum(counts))).astype(int)
+        np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float64, shape=(int(rows[-1]),)).flush()
+        tasks = [(text_path, a, b, out_path, int(r)) for (a, b), r in zip(ranges, rows[:-1])]
+        list(pool.map(_parse_task, tasks))
+    tmp = meta_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"source": source, "rows": int(rows[-1])}, f)
+    os.replace(tmp, meta_path)
+    return open_reference(cache_dir)
+
+
+def open_reference(cache_dir):
+    """(first_index, heights memmap) of an ingested reference table."""
+    with open(os.path.join(cache_dir, REF_META), encoding="utf-8") as f:
+        meta = json.load(f)
+    return int(meta["source"]["first_index"]), np.load(os.path.join(cache_dir, REF_FILE), mmap_mode="r")
+
+
+class ErrorHistogram:
+    """Streaming log-spaced histogram of non-negative errors with exact count, mean and max."""
+
+    def __init__(self):
+        self.edges = np.logspace(REF_MIN_DECADE, REF_MAX_DECADE, (REF_MAX_DECADE - REF_MIN_DECADE) * REF_BINS_PER_DECADE + 1)
+        # counts[0]: below the first edge (including exact zeros); counts[-1]: above the last
+        self.counts = np.zeros(self.edges.size + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, err):
+        err = np.asarray(err, dtype=float)
+        if err.size == 0:
+            return
+        self.counts += np.bincount(np.searchsorted(self.edges, err, side="right"), minlength=self.counts.size)
+        self.count += err.size
+        self.total += float(err.sum())
+        self.max = max(self.max, float(err.max()))
+
+    def quantile(self, q):
+        """Upper bin edge holding the q-quantile (within one bin, 10^(1/REF_BINS_PER_DECADE))."""
+        if self.count == 0:
+            return float("nan")
+        i = int(np.searchsorted(np.cumsum(self.counts), q * self.count, side="left"))
+        if i == 0:
+            return float(self.edges[0])
+        return min(float(self.edges[min(i, self.edges.size - 1)]), self.max)
+
+    def summary(self):
+        out = {f"p{q * 100:g}": self.quantile(q) for q in REF_QUANTILES}
+        out.update({"mean": self.total / self.count if self.count else float("nan"), "max": self.max})
+        return out
+
+
+def validate_chunks(chunks, reference, stats=None):
+    """
+    Streaming join of prediction chunks [(n, t), ...] with reference = (first_index, heights).
+
+    Returns {"matched", "unmatched", "abs": ErrorHistogram, "rel": ErrorHistogram}; stats,
+    if given, is updated in place and returned (to continue over several sources).
+    """
+    first_index, ref = reference
+    if stats is None:
+        stats = {"matched": 0, "unmatched": 0, "abs": ErrorHistogram(), "rel": ErrorHistogram()}
+    for n, t in chunks:
+        n = np.asarray(n, dtype=np.int64)
+        t = np.asarray(t, dtype=float)
+        pos = n - first_index
+        inside = (pos >= 0) & (pos < ref.shape[0])
+        stats["unmatched"] += int(n.size - np.count_nonzero(inside))
+        if not inside.any():
+            continue
+        pos = pos[inside]
+        if pos.size > 1 and np.all(pos[1:] == pos[:-1] + 1):
+            t_ref = np.asarray(ref[pos[0]:pos[-1] + 1])
+        else:
+            t_ref = np.asarray(ref[pos])
+        err = np.abs(t[inside] - t_ref)
+        stats["abs"].add(err)
+        stats["rel"].add(err / t_ref)
+        stats["matched"] += int(pos.size)
+    return stats
+
+
+def iter_column_chunks(n, t, chunk=REF_CHUNK):
+    """(n, t) chunks of two equally long (memory-mapped) columns."""
+    for i in range(0, len(n), chunk):
+        yield n[i:i + chunk], t[i:i + chunk]
@@ -0,0 +1,158 @@
+"""
+Request coalescing for small, scattered zero queries (asyncio).
+
+ZeroQueryCoalescer.query(n, count) registers a request and waits. The first
+request of a batch opens a window of window_sec; everything that arrives before
+it closes (or until max_batch zeros are pending) is answered by one
+predict_zero_three_step_batched call, run in a worker thread so the event loop
+keeps accepting requests. Batches are computed one at a time, so requests that
+arrive during a computation form the next batch.
+
+The batched micro step uses the previous array element as the previous zero.
+The union of the requested indices is therefore laid out as contiguous runs,
+with each run preceded by one helper index (start - 1) whose result is thrown
+away; every query gets the value of a contiguous predict_zeros call (to the
+macro solver tolerance), whatever it was batched with.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+from .core import predict_zero_three_step_batched
+
+# Seconds the first request of a batch waits for others.
+COALESCE_WINDOW_SEC = 0.002
+# Pending zeros that close a batch early.
+COALESCE_MAX_BATCH = 1 << 16
+# Requests kept for the latency percentiles.
+LATENCY_WINDOW = 10_000
+
+
+def coalesce_indices(requests):
+    """
+    Batch layout for requests [(start, count), ...].
+
+    Returns (batch, union): batch is the float index array to predict (each run
+    of consecutive requested indices preceded by its helper start - 1, when
+    start > 1), union the sorted requested indices, at batch positions
+    np.searchsorted(batch, union).
+    """
+    union = np.unique(np.concatenate([np.arange(s, s + c, dtype=np.int64) for s, c in requests]))
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(union) > 1) + 1))
+    helpers = union[starts] - 1
+    batch = np.union1d(union, helpers[helpers >= 1])
+    return batch.astype(float), union
+
+
+class ZeroQueryCoalescer:
+    """
+    Coalesce concurrent zero queries into vectorized predictor calls.
+
+    Predictor keywords (stiffness, n_cutoff, method, isolation, precision) are
+    fixed per instance. metrics() reports request latency percentiles and how
+    full the batches were.
+    """
+
+    def __init__(
+        self,
+        window_sec=COALESCE_WINDOW_SEC,
+        max_batch=COALESCE_MAX_BATCH,
+        stiffness=0.95,
+        n_cutoff=20,
+        method="chaos",
+        isolation=None,
+        precision="float64",
+        xp=np,
+    ):
+        self.window_sec = float(window_sec)
+        self.max_batch = int(max_batch)
+        self.predict_kwargs = {
+            "stiffness": stiffness,
+            "n_cutoff": n_cutoff,
+            "xp": xp,
+            "method": method,
+            "isolation": isolation,
+            "precision": precision,
+        }
+        self._pending = []
+        self._pending_zeros = 0
+        self._timer = None
+        self._lock = None
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counts = {"requests": 0, "batches": 0, "zeros": 0, "computed": 0, "compute_sec": 0.0}
+
+    async def query(self, n, count=1):
+        """Predicted zeros n .. n + count - 1 (NumPy array of length count)."""
+        n, count = int(n), int(count)
+        if n < 1 or count < 1:
+            raise ValueError(f"Invalid query: n={n}, count={count} (need n >= 1, count >= 1)")
+        loop = asyncio.get_running_loop()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        future = loop.create_future()
+        self._pending.append((n, count, future, time.perf_counter()))
+        self._pending_zeros += count
+        if self._pending_zeros >= self.max_batch:
+            self._close_window(loop)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_sec, self._close_window, loop)
+        return await future
+
+    def _close_window(self, loop):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        requests, self._pending, self._pending_zeros = self._pending, [], 0
+        loop.create_task(self._run_batch(requests))
+
+    async def _run_batch(self, requests):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            try:
+                batch, union = coalesce_indices([(s, c) for s, c, _, _ in requests])
+                start = time.perf_counter()
+                t = await loop.run_in_executor(None, self._predict, batch)
+                self._counts["compute_sec"] += time.perf_counter() - start
+                values = t[np.searchsorted(batch, union.astype(float))]
+            except Exception as exc:
+                for _, _, future, _ in requests:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+            done = time.perf_counter()
+            for s, c, future, enqueued in requests:
+                i = int(np.searchsorted(union, s))
+                if not future.done():
+                    future.set_result(values[i:i + c].copy())
+                self._latencies.append(done - enqueued)
+            self._counts["requests"] += len(requests)
+            self._counts["batches"] += 1
+            self._counts["zeros"] += int(union.size)
+            self._counts["computed"] += int(batch.size)
+
+    def _predict(self, batch):
+        return np.asarray(predict_zero_three_step_batched(batch, **self.predict_kwargs), dtype=float)
+
+    def metrics(self):
+        """Latency p50/p99 (ms, last LATENCY_WINDOW requests) and batch-fill counters."""
+        c = self._counts
+        lat = np.asarray(self._latencies) * 1000
+        batches = max(1, c["batches"])
+        return {
+            "requests": c["requests"],
+            "batches": c["batches"],
+            "zeros": c["zeros"],
+            "computed": c["computed"],
+            "requests_per_batch": c["requests"] / batches,
+            "zeros_per_batch": c["zeros"] / batches,
+            "batch_fill": c["zeros"] / (batches * self.max_batch),
+            "helper_fraction": (c["computed"] - c["zeros"]) / max(1, c["computed"]),
+            "compute_sec": c["compute_sec"],
+            "latency_p50_ms": float(np.percentile(lat, 50)) if lat.size else None,
+            "latency_p99_ms": float(np.percentile(lat, 99)) if lat.size else None,
+        }
@@ -0,0 +1,191 @@
+"""
+Streaming columnar output: one growable memory-mapped .npy file per column.
+
+NpySink appends whole batches straight into preallocated np.memmap columns and
+grows the files in chunks, so large runs never build per-zero Python objects.
+Every .npy header has a fixed 128-byte length, which lets a column grow by
+rewriting its shape in place and extending the file. After each append the
+committed row count is published in meta.json (written atomically); read_sink
+returns zero-copy memory-mapped views limited to that count, so analysis code
+can follow a run while it is still going. close() trims the files, after which
+each column is a plain .npy file for np.load.
+"""
+
+import json
+import os
+
+import numpy as np
+
+# Rows added to every column each time the files grow.
+SINK_CHUNK_ROWS = 1 << 20
+META_FILE = "meta.json"
+HEADER_BYTES = 128
+# Per-zero result columns of the scalability scripts (13, 16).
+RESULT_COLUMNS = (
+    ("n", "<i8"),
+    ("prediction", "<f8"),
+    ("time_ms", "<f8"),
+    ("estimated_error", "<f8"),
+)
+# Structured dtype of those columns (results API of 13 and 16).
+RESULT_DTYPE = np.dtype(list(RESULT_COLUMNS))
+
+_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def result_rows(n, prediction, t_theory, time_ms):
+    """
+    One batch of per-zero results as a RESULT_DTYPE structured array.
+
+    estimated_error = |prediction - t_theory| / (|t_theory| + 1e-14), computed
+    in one vectorized expression; time_ms may be a scalar (per-batch average).
+    """
+    prediction = np.asarray(prediction, dtype=float)
+    t_theory = np.asarray(t_theory, dtype=float)
+    rows = np.empty(prediction.size, dtype=RESULT_DTYPE)
+    rows["n"] = n
+    rows["prediction"] = prediction
+    rows["time_ms"] = time_ms
+    rows["estimated_error"] = np.abs(prediction - t_theory) / (np.abs(t_theory) + 1e-14)
+    return rows
+
+
+def _npy_header(dtype, rows):
+    """NPY 1.0 header for a 1-D array of rows elements, padded to HEADER_BYTES."""
+    text = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (np.dtype(dtype).str, rows)
+    body_len = HEADER_BYTES - len(_MAGIC) - 2
+    text = text.ljust(body_len - 1) + "\n"
+    return _MAGIC + body_len.to_bytes(2, "little") + text.encode("latin1")
+
+
+def _write_json_atomic(path, data):
+    """Write JSON to path through a temporary file and os.replace."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class NpySink:
+    """
+    Append-only columnar sink of memory-mapped .npy files in directory.
+
+    columns: sequence of (name, dtype). append(**arrays) writes one batch (all
+    columns the same length); column(name) is a zero-copy view of the rows
+    written so far. Use as a context manager or call close().
+
+    rows: reopen an existing sink and keep its first rows rows (e.g. the count
+    saved in a checkpoint); anything written after that is overwritten.
+    """
+
+    def __init__(self, directory, columns=RESULT_COLUMNS, chunk_rows=SINK_CHUNK_ROWS, rows=None):
+        self.directory = str(directory)
+        self.columns = tuple((name, np.dtype(dtype)) for name, dtype in columns)
+        self.chunk_rows = int(chunk_rows)
+        self.rows = 0
+        self.capacity = 0
+        self._maps = {}
+        os.makedirs(self.directory, exist_ok=True)
+        if rows is None:
+            for name, dtype in self.columns:
+                with open(self._path(name), "wb") as f:
+                    f.write(_npy_header(dtype, 0))
+            self._grow(self.chunk_rows)
+        else:
+            for name, dtype in self.columns:
+                stored = (os.path.getsize(self._path(name)) - HEADER_BYTES) // dtype.itemsize
+                if stored < rows:
+                    raise ValueError(f"Sink column {name} has {stored} rows, {rows} requested")
+            self.rows = int(rows)
+            self._grow(self.rows + self.chunk_rows)
+        self._publish(complete=False)
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def _grow(self, capacity):
+        """Extend every column file to capacity rows and remap it."""
+        for name, dtype in self.columns:
+            path = self._path(name)
+            old = self._maps.pop(name, None)
+            if old is not None:
+                old.flush()
+                del old
+            with open(path, "r+b") as f:
+                f.write(_npy_header(dtype, capacity))
+                f.truncate(HEADER_BYTES + capacity * dtype.itemsize)
+            self._maps[name] = np.memmap(path, dtype=dtype, mode="r+", offset=HEADER_BYTES, shape=(capacity,))
+        self.capacity = capacity
+
+    def _publish(self, complete):
+        meta = {
+            "rows": int(self.rows),
+            "capacity": int(self.capacity),
+            "columns": {name: dtype.str for name, dtype in self.columns},
+            "complete": bool(complete),
+        }
+        _write_json_atomic(os.path.join(self.directory, META_FILE), meta)
+
+    def append(self, **arrays):
+        """Write one batch; arrays maps every column name to a 1-D array-like of equal length."""
+        size = len(next(iter(arrays.values())))
+        if size == 0:
+            return
+        end = self.rows + size
+        if end > self.capacity:
+            chunks = -(-(end - self.capacity) // self.chunk_rows)
+            self._grow(self.capacity + chunks * self.chunk_rows)
+        for name, _ in self.columns:
+            self._maps[name][self.rows:end] = arrays[name]
+        self.rows = end
+        self._publish(complete=False)
+
+    def append_rows(self, rows):
+        """Write one batch given as a structured array with the sink's column names."""
+        self.append(**{name: rows[name] for name, _ in self.columns})
+
+    def column(self, name):
+        """Zero-copy view of the rows written so far."""
+        return self._maps[name][:self.rows]
+
+    def flush(self):
+        """Write the mapped columns to disk (e.g. before a checkpoint records sink.rows)."""
+        for column in self._maps.values():
+            column.flush()
+
+    def close(self):
+        """Flush, trim the files to the written rows and mark the sink complete."""
+        if not self._maps:
+            return
+        self.flush()
+        self._maps.clear()
+        for name, dtype in self.columns:
+            with open(self._path(name), "r+b") as f:
+                f.write(_npy_header(dtype, self.rows))
+                f.truncate(HEADER_BYTES + self.rows * dtype.itemsize)
+        self.capacity = self.rows
+        self._publish(complete=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_sink(directory):
+    """
+    Zero-copy read-only views {name: array} of the committed rows of a sink.
+
+    Safe while the writer is running: only rows published in meta.json are
+    exposed. Call again to follow a growing run.
+    """
+    directory = str(directory)
+    with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+    rows = int(meta["rows"])
+    out = {}
+    for name, dtype in meta["columns"].items():
+        data = np.memmap(os.path.join(directory, f"{name}.npy"), dtype=np.dtype(dtype), mode="r", offset=HEADER_BYTES)
+        out[name] = data[:rows]
+    return out
@@ -0,0 +1,84 @@
+"""
+Bounded-memory streaming of predicted zeros by index.
+
+iter_zeros(start_n, stop_n) yields (n, t) NumPy chunks of `chunk` consecutive
+indices from predict_zero_three_step_batched, so at most two chunks are alive
+at a time whether a thousand or a billion zeros are consumed; with
+stop_n=None the stream never ends. While the caller works on one chunk, the
+next one is computed on a single background thread (NumPy releases the GIL in
+its array kernels, CuPy queues the work on the device), so analysis of chunk k
+overlaps prediction of chunk k + 1.
+
+Chunks are contiguous runs of indices: the batched micro step treats the
+previous element of a batch as the previous zero. Only the micro guess of a
+chunk head differs from one large batch (its correction is zero instead of
+the tiny macro-vs-theory gap at n - 1), and refinement reaches the same zero.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .backend import to_numpy
+from .core import predict_zero_three_step_batched
+
+# Zeros per yielded chunk (CPU batch size of the same order as AUTOTUNE_BATCHES).
+ITER_CHUNK = 8192
+
+
+def _predict_chunk(n0, n1, step, xp, kwargs):
+    n = np.arange(n0, n1, step, dtype=np.int64)
+    t = predict_zero_three_step_batched(xp.asarray(n, dtype=float), xp=xp, **kwargs)
+    return n, to_numpy(t)
+
+
+def iter_zeros(
+    start_n,
+    stop_n=None,
+    chunk=ITER_CHUNK,
+    step=1,
+    stiffness=0.95,
+    n_cutoff=20,
+    xp=np,
+    method="chaos",
+    isolation=None,
+    precision="float64",
+    prefetch=True,
+    stats=None,
+):
+    """
+    Stream predicted zeros n = start_n, start_n + step, ... < stop_n as (n, t) chunks.
+
+    n is an int64 array and t a float64 NumPy array of at most `chunk` entries
+    (the last chunk may be shorter). stop_n=None streams without an upper
+    bound. prefetch computes the next chunk in a background thread while the
+    current one is consumed. stats: optional dict passed to the batched
+    predictor (unbracketed counts, Newton histogram, ...); with prefetch it is
+    updated from the worker thread, one chunk ahead of the consumer.
+    """
+    start_n, step, chunk = int(start_n), int(step), int(chunk)
+    if start_n < 1 or step < 1 or chunk < 1:
+        raise ValueError("start_n, step and chunk must be positive")
+    kwargs = dict(stiffness=stiffness, n_cutoff=n_cutoff, method=method, isolation=isolation, precision=precision, stats=stats)
+    span = chunk * step
+
+    def bounds(n0):
+        n1 = n0 + span
+        return n0, n1 if stop_n is None else min(n1, int(stop_n))
+
+    n0, n1 = bounds(start_n)
+    if not prefetch:
+        while n0 < n1:
+            yield _predict_chunk(n0, n1, step, xp, kwargs)
+            n0, n1 = bounds(n1)
+        return
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="iter_zeros")
+    try:
+        pending = executor.submit(_predict_chunk, n0, n1, step, xp, kwargs) if n0 < n1 else None
+        while pending is not None:
+            n0, n1 = bounds(n1)
+            current = pending.result()
+            pending = executor.submit(_predict_chunk, n0, n1, step, xp, kwargs) if n0 < n1 else None
+            yield current
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
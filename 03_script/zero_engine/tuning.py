@@ -0,0 +1,226 @@
+"""
+Throughput autotuning of the CPU batch size and chaos-evaluator block size.
+
+The best NumPy batch size and CHAOS_BLOCK_BYTES (the working set of one block
+of the blocked chaos evaluator) depend on the cache sizes and core count of the
+host, so fixed defaults leave throughput on the table. autotune() times the real
+predictor (predict_zero_three_step_batched on indices at the height of the run)
+over a small grid: first the block sizes at a middle batch size, then the batch
+sizes at the best block size (a coordinate search, a few seconds in total).
+When the fused Numba kernel is in use the block size has no effect and only the
+batch sizes are probed. With a ShardPool the candidates are timed through
+pool.run_shards, i.e. with the worker count of the run. The winner is stored in
+a JSON file keyed by host and by n_cutoff / method / precision / CPU kernel
+(Numba thread count) / workers, so later runs of the same configuration on the
+same machine reuse it without probing.
+
+ThroughputMonitor watches the zeros/sec of a long run: the first runs after
+tuning set a baseline, and once the smoothed rate drifts from it by more than
+AUTOTUNE_DRIFT (thermal throttling, other load, heights where the cost per zero
+changed) it asks the caller to probe again.
+"""
+
+import json
+import os
+import platform
+import time
+
+import numpy as np
+
+from . import core
+from .backend import CPU_KERNEL_ENABLED, numba
+from .core import default_isolation, predict_zero_three_step_batched
+from .parallel import default_workers
+
+AUTOTUNE_VERSION = 2
+# Candidate grid (batch sizes, chaos evaluator block bytes).
+AUTOTUNE_BATCHES = (512, 2048, 8192, 32768)
+AUTOTUNE_BLOCK_BYTES = (1 << 16, 1 << 17, 1 << 18, 1 << 19, 1 << 20)
+# Minimum timed seconds per candidate.
+AUTOTUNE_MIN_SEC = 0.2
+# Relative throughput drift that triggers a re-probe; runs that form the baseline;
+# smoothing of the monitored rate; minimum seconds between re-probes.
+AUTOTUNE_DRIFT = 0.25
+AUTOTUNE_BASELINE_RUNS = 3
+AUTOTUNE_EWMA = 0.3
+AUTOTUNE_REPROBE_SEC = 300.0
+
+
+def default_autotune_path():
+    """Tuning file: $ZERO_ENGINE_AUTOTUNE, else ~/.cache/zero_engine/autotune.json."""
+    path = os.environ.get("ZERO_ENGINE_AUTOTUNE")
+    if path:
+        return path
+    return os.path.join(os.path.expanduser("~"), ".cache", "zero_engine", "autotune.json")
+
+
+def host_key():
+    """Identifies the machine a tuning was measured on (name, CPU, usable cores)."""
+    return f"{platform.node()}|{platform.machine()}|{platform.processor() or '-'}|{default_workers()}cpu"
+
+
+def kernel_key():
+    """CPU chaos evaluator in use: "numba<threads>" for the fused kernel, else "numpy"."""
+    if CPU_KERNEL_ENABLED:
+        return f"numba{numba.get_num_threads()}"
+    return "numpy"
+
+
+def _config_key(n_cutoff, method, precision, workers):
+    return f"n_cutoff={int(n_cutoff)}|{method}|{precision}|{kernel_key()}|workers={int(workers)}"
+
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        return {"version": AUTOTUNE_VERSION, "hosts": {}}
+    if table.get("version") != AUTOTUNE_VERSION:
+        return {"version": AUTOTUNE_VERSION, "hosts": {}}
+    return table
+
+
+def load_tuning(n_cutoff=20, method="chaos", precision="float64", workers=1, path=None):
+    """Stored tuning for this host and configuration (workers: ShardPool size, 1 = serial), or None."""
+    table = _read(path or default_autotune_path())
+    return table["hosts"].get(host_key(), {}).get(_config_key(n_cutoff, method, precision, workers))
+
+
+def save_tuning(tuning, n_cutoff=20, method="chaos", precision="float64", workers=1, path=None):
+    """Store a tuning for this host and configuration (atomic rewrite of the JSON file)."""
+    path = path or default_autotune_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    table = _read(path)
+    table["hosts"].setdefault(host_key(), {})[_config_key(n_cutoff, method, precision, workers)] = tuning
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(table, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def measure_throughput(
+    batch_size, block_bytes, n_start=1000, step=1, n_cutoff=20, method="chaos", isolation=None,
+    precision="float64", min_sec=AUTOTUNE_MIN_SEC, pool=None,
+):
+    """
+    Zeros per second of predict_zero_three_step_batched at one (batch_size, block_bytes).
+
+    pool: a ShardPool; the batches (one per worker) then run through pool.run_shards
+    and the rate is measured on its wall time.
+    """
+    old = core.set_chaos_block_bytes(block_bytes)
+    try:
+        size = int(batch_size) * (1 if pool is None else pool.workers)
+        n = (int(n_start) + np.arange(size) * int(step)).astype(float)
+        kwargs = dict(n_cutoff=n_cutoff, method=method, isolation=isolation, precision=precision)
+        if pool is None:
+            def run(values):
+                predict_zero_three_step_batched(values, xp=np, **kwargs)
+        else:
+            def run(values):
+                pool.run_shards(values, int(batch_size), **kwargs)
+        run(n[:64])  # warm plans and grids (and the pool workers)
+        zeros = 0
+        start = time.perf_counter()
+        while True:
+            run(n)
+            zeros += n.size
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_sec:
+                return zeros / elapsed
+    finally:
+        core.set_chaos_block_bytes(old)
+
+
+def autotune(
+    n_start=1000, step=1, n_cutoff=20, method="chaos", isolation=None, precision="float64",
+    batches=AUTOTUNE_BATCHES, block_bytes=AUTOTUNE_BLOCK_BYTES, min_sec=AUTOTUNE_MIN_SEC,
+    path=None, force=False, log=None, pool=None,
+):
+    """
+    Throughput-maximizing {"batch_size", "block_bytes", "zeros_per_sec", ...} for this host.
+
+    Returns the stored tuning unless force=True (or none is stored); otherwise probes
+    the grid at indices n_start, n_start + step, ... and stores the result. The block
+    size is applied with core.set_chaos_block_bytes either way (ShardPool forwards it
+    to its workers); with the fused CPU kernel it is left at its current value and not
+    probed. pool: the ShardPool the run will use (probes run through it and the tuning
+    is stored per worker count). log: optional callable for one line per probed candidate.
+    """
+    workers = 1 if pool is None else pool.workers
+    isolation = isolation or default_isolation(method, precision)
+    if not force:
+        tuning = load_tuning(n_cutoff, method, precision, workers, path)
+        if tuning is not None:
+            core.set_chaos_block_bytes(tuning["block_bytes"])
+            return dict(tuning, source="stored")
+    probe = dict(n_start=n_start, step=step, n_cutoff=n_cutoff, method=method, isolation=isolation,
+                 precision=precision, min_sec=min_sec, pool=pool)
+    results = {}
+
+    def run(batch, block):
+        if (batch, block) not in results:
+            results[(batch, block)] = measure_throughput(batch, block, **probe)
+            if log is not None:
+                log(f"  autotune: batch={batch} block_bytes={block} -> {results[(batch, block)]:.0f} zeros/s")
+        return results[(batch, block)]
+
+    if CPU_KERNEL_ENABLED:
+        best_block = core.CHAOS_BLOCK_BYTES
+    else:
+        mid = sorted(batches)[len(batches) // 2]
+        best_block = max(block_bytes, key=lambda block: run(mid, block))
+    best_batch = max(batches, key=lambda batch: run(batch, best_block))
+    tuning = {
+        "batch_size": int(best_batch),
+        "block_bytes": int(best_block),
+        "zeros_per_sec": float(results[(best_batch, best_block)]),
+        "n_start": int(n_start),
+        "isolation": isolation,
+        "kernel": kernel_key(),
+        "workers": workers,
+        "probes": len(results),
+        "measured": time.strftime("%Y-%m-%dT%H%M%SZ", time.gmtime()),
+    }
+    save_tuning(tuning, n_cutoff, method, precision, workers, path)
+    core.set_chaos_block_bytes(best_block)
+    return dict(tuning, source="probed")
+
+
+class ThroughputMonitor:
+    """
+    Drift detector for the zeros/sec of a long run.
+
+    observe(zeros, seconds) after every run; it returns True when the smoothed
+    rate has drifted more than `drift` from the baseline of the first
+    baseline_runs runs and at least reprobe_sec have passed since the last
+    (re)tuning. Call reset() after re-probing.
+    """
+
+    def __init__(self, drift=AUTOTUNE_DRIFT, baseline_runs=AUTOTUNE_BASELINE_RUNS, reprobe_sec=AUTOTUNE_REPROBE_SEC):
+        self.drift = float(drift)
+        self.baseline_runs = int(baseline_runs)
+        self.reprobe_sec = float(reprobe_sec)
+        self.reprobes = 0
+        self.reset()
+
+    def reset(self):
+        self._rates = []
+        self.baseline = None
+        self.rate = None
+        self._since = time.perf_counter()
+
+    def observe(self, zeros, seconds):
+        if zeros <= 0 or seconds <= 0:
+            return False
+        rate = zeros / seconds
+        if self.baseline is None:
+            self._rates.append(rate)
+            if len(self._rates) >= self.baseline_runs:
+                self.baseline = self.rate = float(np.median(self._rates))
+            return False
+        self.rate += AUTOTUNE_EWMA * (rate - self.rate)
+        if time.perf_counter() - self._since < self.reprobe_sec:
+            return False
+        return abs(self.rate / self.baseline - 1.0) > self.drift